@@ -0,0 +1,78 @@
+"""
+Throughput of the batched PWM app (ex1_lab12.py) under concurrent load.
+
+Launches the Gradio app on a local port, then N simulated clients each
+submit --requests sequences through gradio_client and the script reports
+requests/s and latency percentiles for every client count.
+
+    python benchmarks/serve_throughput.py --clients 1 4 16 --length 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def random_dna(length, rng):
+    return "".join(rng.choice("ACGT") for _ in range(length))
+
+def run_clients(url, n_clients, n_requests, length, seed):
+    from gradio_client import Client
+
+    def client_loop(k):
+        client = Client(url, verbose=False)
+        latencies = []
+        for i in range(n_requests):
+            # a fresh sequence per (client count, client, request): /analyze is
+            # memoized, and a repeated sequence would only time a cache hit
+            seq = random_dna(length, random.Random(f"{seed}/{n_clients}/{k}/{i}"))
+            t = time.perf_counter()
+            client.predict(seq, 0, api_name="/analyze")
+            latencies.append(time.perf_counter() - t)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(n_clients) as pool:
+        latencies = sorted(l for ls in pool.map(client_loop, range(n_clients)) for l in ls)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "clients": n_clients,
+        "requests": len(latencies),
+        "req_per_s": len(latencies) / elapsed,
+        "p50_ms": 1000 * latencies[len(latencies) // 2],
+        "p95_ms": 1000 * latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=10, help="requests per client")
+    parser.add_argument("--length", type=int, default=2000, help="sequence length")
+    parser.add_argument("--port", type=int, default=7861)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import ex1_lab12
+
+    demo = ex1_lab12.build_demo()
+    demo.launch(server_name="127.0.0.1", server_port=args.port,
+                prevent_thread_lock=True, quiet=True)
+    url = f"http://127.0.0.1:{args.port}/"
+
+    try:
+        print(f"{'clients':>8} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for n in args.clients:
+            r = run_clients(url, n, args.requests, args.length, args.seed)
+            print(f"{r['clients']:8d} {r['requests']:9d} {r['req_per_s']:8.1f} "
+                  f"{r['p50_ms']:8.1f} {r['p95_ms']:8.1f}")
+    finally:
+        demo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Import-time budget check for the modules batch workers load.
+
+Every module is imported in a fresh interpreter with `-X importtime`;
+the best of --runs cumulative times is compared against
+startup_budget.json and the script exits non-zero when a module is over
+budget or pulls in one of the heavy GUI / plotting libraries.
+
+    python benchmarks/startup.py            # check
+    python benchmarks/startup.py --record   # re-record the budget
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+MODULES = [
+    "bioinfo.cli",
+    "bioinfo.codons",
+    "bioinfo.cpg",
+    "bioinfo.markov",
+    "bioinfo.motif_scan",
+    "bioinfo.pwm",
+    "bioinfo.style",
+    "bioinfo.prediction",
+    "Ex1_Lab4",
+    "Ex2_Lab4",
+    "ex1_lab12",
+    "ex2_lab12",
+    "ex2_L14",
+]
+
+# none of these may be imported just by importing one of MODULES
+HEAVY = ("matplotlib", "pandas", "gradio", "scipy")
+
+# recorded budget = measured time * HEADROOM, never below MIN_BUDGET_US,
+# to absorb machine noise
+HEADROOM = 2.0
+MIN_BUDGET_US = 10000
+
+
+def import_time(module):
+    """Returns (cumulative microseconds, set of imported top-level packages)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+
+    total = None
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        name = name.strip()
+        imported.add(name.split(".")[0])
+        if name == module:
+            total = int(cumulative)
+
+    return total, imported
+
+def measure(runs):
+    results = {}
+    for module in MODULES:
+        best, imported = None, set()
+        for _ in range(runs):
+            t, imported = import_time(module)
+            best = t if best is None else min(best, t)
+        results[module] = (best, imported)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = measure(args.runs)
+
+    if args.record:
+        budget = {
+            m: max(int(t * HEADROOM), MIN_BUDGET_US)
+            for m, (t, _) in results.items()
+        }
+        with open(BUDGET_FILE, "w") as f:
+            json.dump(budget, f, indent=4)
+            f.write("\n")
+        print(f"Recorded budget for {len(budget)} modules in {BUDGET_FILE}")
+        return 0
+
+    with open(BUDGET_FILE) as f:
+        budget = json.load(f)
+
+    failures = 0
+    for module, (t, imported) in results.items():
+        limit = budget.get(module)
+        heavy = sorted(set(HEAVY) & imported)
+        over = limit is not None and t > limit
+        status = "FAIL" if over or heavy else "ok"
+        failures += status == "FAIL"
+
+        line = f"{status:4}  {module:20} {t / 1000:8.1f} ms"
+        if limit is not None:
+            line += f"  (budget {limit / 1000:.1f} ms)"
+        if heavy:
+            line += f"  imports {', '.join(heavy)}"
+        print(line)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
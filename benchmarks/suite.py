@@ -0,0 +1,255 @@
+"""
+Throughput / peak-memory benchmarks for the hot paths, on seeded
+synthetic inputs (see synthetic.py).
+
+    python benchmarks/suite.py                      # compare with baseline.json
+    python benchmarks/suite.py --save-baseline      # record a new baseline
+    python benchmarks/suite.py --only scan_genome --sizes 1M 10M
+
+Every case is run once untimed (lazy imports, first-call caches), then
+timed without tracing: each sample loops the case until it lasts
+MIN_SAMPLE seconds, and samples are taken until there are --repeat of
+them and MIN_TOTAL seconds have passed; the best one gives the time per
+call. One more run under tracemalloc gives the peak allocation. A case
+regresses when its throughput drops, or its peak memory grows, by more
+than --threshold relative to the baseline; a slowdown also has to cost
+more than TIME_FLOOR seconds per call, so sub-millisecond cases cannot
+fail on timer noise. The script then exits non-zero.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synthetic
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = ["1k", "100k"]
+MIN_SAMPLE = 0.05  # seconds per timed sample
+MIN_TOTAL = 1.0    # seconds of samples per case, whatever --repeat
+TIME_FLOOR = 2e-3  # seconds per call a slowdown must exceed to count
+
+
+# Each case: name -> (unit, setup(size, seed) -> (fn, work_items)).
+# setup builds the inputs outside the timed region; fn() runs the hot path.
+
+def _codon_count(n, seed):
+    from bioinfo.codons import codon_count
+    rna = synthetic.random_rna(n, seed)
+    return lambda: codon_count(rna), n
+
+def _amino_acid_count(n, seed):
+    from bioinfo.codons import codon_count, amino_acid_count
+    codons = codon_count(synthetic.random_rna(n, seed))
+    return lambda: amino_acid_count(codons), sum(codons.values())
+
+def _rna_to_protein(n, seed):
+    from bioinfo.codons import rna_to_protein
+    rna = synthetic.coding_rna(n // 3, seed)
+    return lambda: rna_to_protein(rna), len(rna)
+
+def _read_fasta(n, seed):
+    import tempfile
+    from bioinfo.fasta import read_fasta
+    path = os.path.join(tempfile.mkdtemp(), "synthetic.fa")
+    synthetic.write_fasta(path, n, records=4, seed=seed)
+    return lambda: read_fasta(path), n
+
+def _analyze_sequence(n, seed):
+    from ex1_lab12 import CACHE, analyze_sequence
+    seq = synthetic.random_dna(n, seed)
+
+    def run():
+        CACHE.clear()  # time the computation, not a memo hit
+        return analyze_sequence(seq)
+    return run, n
+
+def _pwm_scan(n, seed):
+    from bioinfo.pwm import build_pwm, pwm_array, score_batch
+    W = pwm_array(build_pwm()[2])
+    seq = synthetic.random_dna(n, seed, n_fraction=0.01)
+    return lambda: score_batch([seq], W), n
+
+def _pwm_threshold(n, seed):
+    from bioinfo.pwm import build_pwm, pwm_array, score_cutoff, scan_threshold
+    W = pwm_array(build_pwm()[2])
+    cutoff = score_cutoff(W, 1e-4)
+    seq = synthetic.random_dna(n, seed, n_fraction=0.01)
+    return lambda: scan_threshold([seq], W, cutoff), n
+
+def _kmer_count(n, seed):
+    from bioinfo.kmers import count_kmers
+    seq = synthetic.random_dna(n, seed, n_fraction=0.01)
+    return lambda: count_kmers(seq, 21, canonical=True), n
+
+def _scan_genome(n, seed):
+    from bioinfo.motif_scan import scan_genome
+    seq = synthetic.random_dna(n, seed, n_fraction=0.01)
+    return lambda: scan_genome(seq), n
+
+def _score_sequence(n, seed):
+    from bioinfo.cpg import train_models, score_sequence
+    beta = train_models()[-1]
+    seq = synthetic.random_dna(n, seed)
+    return lambda: score_sequence(seq, beta), n
+
+def _sliding_window(n, seed):
+    from bioinfo.style import (
+        build_alphabet, count_transitions, normalize_matrix,
+        log_likelihood_matrix, sliding_window,
+    )
+    a = synthetic.random_text(5000, seed)
+    b = synthetic.random_text(5000, seed + 1)
+    alphabet = build_alphabet(a, b)
+    B = log_likelihood_matrix(
+        normalize_matrix(count_transitions(a, alphabet)),
+        normalize_matrix(count_transitions(b, alphabet)),
+    )
+    text = synthetic.random_text(n, seed + 2)
+    return lambda: sliding_window(text, B, alphabet, 350, 40), n
+
+def _build_model(n, seed):
+    from bioinfo.markov import build_model
+    words = synthetic.random_words(n, seed=seed)
+    return lambda: build_model(words), n
+
+def _weighted_choice(n, seed):
+    import random
+    from bioinfo.markov import compute_transition_matrix, weighted_choice
+    model = compute_transition_matrix(synthetic.random_dna(1000, seed))
+    random.seed(seed)
+
+    def run():
+        cur = "A"
+        for _ in range(n):
+            cur = weighted_choice(model[cur])
+    return run, n
+
+CASES = {
+    "codon_count": ("bases", _codon_count),
+    "amino_acid_count": ("codons", _amino_acid_count),
+    "rna_to_protein": ("bases", _rna_to_protein),
+    "read_fasta": ("bases", _read_fasta),
+    "analyze_sequence": ("bases", _analyze_sequence),
+    "pwm_scan": ("bases", _pwm_scan),
+    "pwm_threshold": ("bases", _pwm_threshold),
+    "kmer_count": ("bases", _kmer_count),
+    "scan_genome": ("bases", _scan_genome),
+    "score_sequence": ("bases", _score_sequence),
+    "sliding_window": ("chars", _sliding_window),
+    "build_model": ("tokens", _build_model),
+    "weighted_choice": ("draws", _weighted_choice),
+}
+
+
+def _sample(fn, number):
+    gc.collect()
+    t = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - t
+
+def run_case(name, size, seed, repeat):
+    unit, setup = CASES[name]
+    fn, work = setup(size, seed)
+    fn()  # warm-up: lazy imports and first-call setup are not timed
+
+    # calls per sample, so that one sample lasts at least MIN_SAMPLE
+    number = 1
+    while True:
+        t = _sample(fn, number)
+        if t >= MIN_SAMPLE:
+            break
+        number = max(2 * number, int(number * 1.2 * MIN_SAMPLE / max(t, 1e-9)))
+
+    samples, total = [t], t
+    while len(samples) < repeat or total < MIN_TOTAL:
+        samples.append(_sample(fn, number))
+        total += samples[-1]
+    best = min(samples) / number
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "unit": unit,
+        "items": work,
+        "seconds": best,
+        "throughput": work / best if best > 0 else float("inf"),
+        "peak_bytes": peak,
+    }
+
+def compare(results, baseline, threshold):
+    failures = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        slower = r["seconds"] - base["seconds"] > TIME_FLOOR
+        if slower and r["throughput"] < base["throughput"] * (1 - threshold):
+            failures.append(f"{key}: throughput {r['throughput']:.3g} < baseline {base['throughput']:.3g}")
+        if r["peak_bytes"] > base["peak_bytes"] * (1 + threshold) + 4096:
+            failures.append(f"{key}: peak memory {r['peak_bytes']} > baseline {base['peak_bytes']}")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), default=None)
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="allowed relative regression (0.3 = 30%%)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.only or CASES:
+        for size in args.sizes:
+            r = run_case(name, synthetic.parse_size(size), args.seed, args.repeat)
+            key = f"{name}[{size}]"
+            results[key] = r
+            print(f"{key:28} {r['throughput']:12.4g} {r['unit']}/s "
+                  f"{r['seconds'] * 1000:10.2f} ms  peak {r['peak_bytes'] / 2**20:8.2f} MiB")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        baseline["_machine"] = {"python": platform.python_version(), "platform": platform.platform()}
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+            f.write("\n")
+        print(f"Saved {len(results)} results to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline recorded; run with --save-baseline first")
+        return 0
+
+    with open(args.baseline) as f:
+        failures = compare(results, json.load(f), args.threshold)
+    for line in failures:
+        print("REGRESSION", line)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Seeded synthetic inputs for the benchmarks: DNA / RNA sequences, FASTA
+files (single or multi-record, written in bounded-memory chunks) and
+word corpora with a Zipf-like vocabulary.
+
+    python benchmarks/synthetic.py fasta out.fa --length 100M --records 4
+    python benchmarks/synthetic.py corpus out.txt --tokens 1M
+"""
+import argparse
+
+import numpy as np
+
+BASES = np.frombuffer(b"ACGT", dtype=np.uint8)
+CHUNK = 1 << 22  # bases generated per write when streaming FASTA
+LINE_WIDTH = 70
+
+_SUFFIXES = {"k": 10**3, "K": 10**3, "M": 10**6, "G": 10**9}
+
+
+def parse_size(text):
+    """'100M' -> 100_000_000."""
+    text = str(text)
+    if text[-1] in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[text[-1]])
+    return int(text)
+
+def random_dna(length, seed=0, n_fraction=0.0):
+    rng = np.random.default_rng(seed)
+    codes = BASES[rng.integers(0, 4, length)]
+    if n_fraction:
+        codes[rng.random(length) < n_fraction] = ord("N")
+    return codes.tobytes().decode("ascii")
+
+def random_rna(length, seed=0):
+    return random_dna(length, seed).replace("T", "U")
+
+def coding_rna(n_codons, seed=0):
+    """RNA without stop codons, so translation runs over the whole length."""
+    from bioinfo.codons import codon_table
+
+    sense = np.array([c for c, aa in sorted(codon_table.items()) if aa != "Stop"])
+    rng = np.random.default_rng(seed)
+    return "".join(sense[rng.integers(0, len(sense), n_codons)])
+
+def write_fasta(path, length, records=1, seed=0):
+    """Writes `records` random records totalling `length` bases."""
+    rng = np.random.default_rng(seed)
+    per_record = [length // records + (i < length % records) for i in range(records)]
+
+    with open(path, "w") as f:
+        for r, n in enumerate(per_record):
+            f.write(f">synthetic_{r} length={n} seed={seed}\n")
+            carry = b""
+            remaining = n
+            while remaining > 0 or carry:
+                size = min(CHUNK, remaining)
+                remaining -= size
+                block = carry + BASES[rng.integers(0, 4, size)].tobytes()
+                full = len(block) - len(block) % LINE_WIDTH if remaining else len(block)
+                for i in range(0, full, LINE_WIDTH):
+                    f.write(block[i:i + LINE_WIDTH].decode("ascii") + "\n")
+                carry = block[full:]
+
+def random_words(n_tokens, vocab=50000, seed=0, exponent=1.2):
+    """Zipf-distributed word tokens over a vocabulary of `vocab` words."""
+    rng = np.random.default_rng(seed)
+    ids = (rng.zipf(exponent, n_tokens) - 1) % vocab
+    return [f"w{i}" for i in ids]
+
+def random_text(n_chars, seed=0):
+    """Lower-case letter / space text shaped like clean_text output."""
+    rng = np.random.default_rng(seed)
+    alphabet = np.frombuffer(b"abcdefghijklmnopqrstuvwxyz     ", dtype=np.uint8)
+    return alphabet[rng.integers(0, len(alphabet), n_chars)].tobytes().decode("ascii")
+
+def write_corpus(path, n_tokens, vocab=50000, seed=0, per_line=20):
+    words = random_words(n_tokens, vocab, seed)
+    with open(path, "w") as f:
+        for i in range(0, len(words), per_line):
+            f.write(" ".join(words[i:i + per_line]) + ".\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="kind", required=True)
+
+    p = sub.add_parser("fasta")
+    p.add_argument("path")
+    p.add_argument("--length", default="1M")
+    p.add_argument("--records", type=int, default=1)
+    p.add_argument("--seed", type=int, default=0)
+
+    p = sub.add_parser("corpus")
+    p.add_argument("path")
+    p.add_argument("--tokens", default="1M")
+    p.add_argument("--vocab", type=int, default=50000)
+    p.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.kind == "fasta":
+        write_fasta(args.path, parse_size(args.length), args.records, args.seed)
+    else:
+        write_corpus(args.path, parse_size(args.tokens), args.vocab, args.seed)
+
+
+if __name__ == "__main__":
+    main()
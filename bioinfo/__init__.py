@@ -0,0 +1,7 @@
+"""
+Core analysis code shared by the lab GUIs.
+
+Nothing in this package imports tkinter, gradio, pandas or matplotlib,
+so it can be used from batch jobs and worker processes. Run
+`python -m bioinfo --help` for the command line entry points.
+"""
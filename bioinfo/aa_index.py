@@ -0,0 +1,150 @@
+"""
+On-disk amino-acid composition index for a genome collection.
+
+build_index() reads every genome once (with read-ahead), reduces it to
+its 20 amino-acid counts from amino_acid_count, and writes plain .npy
+files next to a names.json:
+
+    counts.npy   (n, 20) int64   amino-acid counts
+    freqs.npy    (n, 20) float32 unit-length composition vectors
+    order.npy    (n, 20) uint8   amino acids by decreasing count
+
+AminoAcidIndex opens them memory-mapped, so queries (genomes with a given
+top-k, most similar composition, food suggestions) touch only the pages
+they read and never re-parse a FASTA file. Ties in the ranking go to the
+alphabetically first amino acid.
+"""
+import json
+import os
+
+import numpy as np
+
+from .codons import amino_acid_count, codon_count, codon_table, dna_to_rna, suggest_foods
+
+AMINO_ACIDS = sorted(set(codon_table.values()) - {"Stop"})
+BLOCK = 1 << 16  # rows per block for similarity queries
+
+_POSITION = {aa: i for i, aa in enumerate(AMINO_ACIDS)}
+
+
+def composition(seq):
+    """20 amino-acid counts (AMINO_ACIDS order) of a DNA str / PackedSequence."""
+    counts = amino_acid_count(codon_count(dna_to_rna(seq)))
+    return np.array([counts.get(aa, 0) for aa in AMINO_ACIDS], dtype=np.int64)
+
+def _genomes(files, records):
+    from .fasta import read_fasta_records
+    from .packed import read_fasta_packed
+    from .pipeline import prefetch
+
+    if records:
+        for path in files:
+            for header, seq in read_fasta_records(path):
+                yield (header.split()[0] if header else os.path.basename(path)), seq
+    else:
+        for path, seq in prefetch(files, read_fasta_packed):
+            yield os.path.basename(path), seq
+
+def build_index(files, root, records=False):
+    """
+    Writes the index of the given FASTA files (one genome per file, or
+    per record with records=True) to the directory root.
+    """
+    names, rows = [], []
+    for name, seq in _genomes(files, records):
+        names.append(name)
+        rows.append(composition(seq))
+    return write_index(root, names, np.array(rows, dtype=np.int64).reshape(len(rows), len(AMINO_ACIDS)))
+
+def write_index(root, names, counts):
+    """Index of precomputed (n, 20) counts; returns the opened AminoAcidIndex."""
+    if len(set(names)) != len(names):
+        raise ValueError("Genome names must be unique")
+    os.makedirs(root, exist_ok=True)
+    counts = np.asarray(counts, dtype=np.int64)
+    norms = np.sqrt((counts.astype(np.float64) ** 2).sum(axis=1, keepdims=True))
+    freqs = (counts / np.where(norms > 0, norms, 1)).astype(np.float32)
+    order = np.argsort(-counts, axis=1, kind="stable").astype(np.uint8)
+
+    np.save(os.path.join(root, "counts.npy"), counts)
+    np.save(os.path.join(root, "freqs.npy"), freqs)
+    np.save(os.path.join(root, "order.npy"), order)
+    with open(os.path.join(root, "names.json"), "w", encoding="utf-8") as f:
+        json.dump({"amino_acids": AMINO_ACIDS, "names": list(names)}, f)
+    return AminoAcidIndex(root)
+
+
+class AminoAcidIndex:
+    """Memory-mapped composition index written by build_index."""
+
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, "names.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["amino_acids"] != AMINO_ACIDS:
+            raise ValueError(f"{root}: index was built with a different amino-acid order")
+        self.names = meta["names"]
+        self._rows = {name: i for i, name in enumerate(self.names)}
+        self.counts = np.load(os.path.join(root, "counts.npy"), mmap_mode="r")
+        self.freqs = np.load(os.path.join(root, "freqs.npy"), mmap_mode="r")
+        self.order = np.load(os.path.join(root, "order.npy"), mmap_mode="r")
+
+    def __len__(self):
+        return len(self.names)
+
+    def row(self, genome):
+        """Row number of a genome name (ints pass through)."""
+        if isinstance(genome, (int, np.integer)):
+            return int(genome)
+        try:
+            return self._rows[genome]
+        except KeyError:
+            raise KeyError(f"{genome!r} is not in the index") from None
+
+    def top(self, genome, k=3):
+        """[(amino acid, count), ...] of the k most used amino acids."""
+        i = self.row(genome)
+        return [(AMINO_ACIDS[j], int(self.counts[i, j])) for j in self.order[i, :k]]
+
+    def with_top(self, amino_acids, ordered=False):
+        """
+        Names of the genomes whose top-len(amino_acids) amino acids are
+        exactly these (in this order when ordered=True).
+        """
+        wanted = [_POSITION[aa] for aa in amino_acids]
+        k = len(wanted)
+        head = np.asarray(self.order[:, :k])
+        if ordered:
+            hit = (head == np.array(wanted, dtype=np.uint8)).all(axis=1)
+        else:
+            masks = np.bitwise_or.reduce(np.left_shift(1, head.astype(np.int64)), axis=1)
+            hit = masks == sum(1 << j for j in set(wanted))
+        return [self.names[i] for i in np.flatnonzero(hit)]
+
+    def similar(self, query, n=5, block=BLOCK):
+        """
+        [(name, cosine similarity), ...] of the n genomes whose composition
+        is closest to query (a genome in the index, or 20 counts). The
+        query genome itself is left out.
+        """
+        if isinstance(query, (str, int, np.integer)):
+            skip = self.row(query)
+            q = np.asarray(self.freqs[skip], dtype=np.float32)
+        else:
+            skip = None
+            q = np.asarray(query, dtype=np.float32)
+            q = q / (np.linalg.norm(q) or 1)
+
+        sims = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), block):
+            sims[start:start + block] = self.freqs[start:start + block] @ q
+        if skip is not None:
+            sims[skip] = -np.inf
+        n = min(n, len(self) - (skip is not None))
+        best = np.argpartition(-sims, n - 1)[:n] if n > 0 else np.zeros(0, int)
+        best = best[np.argsort(-sims[best], kind="stable")]
+        return [(self.names[i], float(sims[i])) for i in best]
+
+    def foods(self, genomes, k=3):
+        """{genome: {amino acid: [low-in foods]}} for the top-k of each genome."""
+        return {g: suggest_foods(aa for aa, _ in self.top(g, k)) for g in genomes}
@@ -0,0 +1,171 @@
+"""
+Disk store for rendered artifacts (plot PNGs) served by the web apps.
+
+File names are the digest of the render key (input content digest +
+parameters), so an identical request finds its file again, even after a
+restart, without re-rendering. Files are written once, atomically, from
+an in-memory buffer; reads refresh the mtime, and the store is trimmed
+oldest-first whenever it goes over its byte budget or a file is older
+than max_age. Disk use stays bounded however long the server runs.
+
+Every store owns one subdirectory (its name) of $BIOINFO_ARTIFACTS, so
+two apps never count or evict each other's files. The directory is only
+created by the first write, and temp files left by interrupted writes
+are removed by the next sweep.
+"""
+import io
+import os
+import tempfile
+import threading
+import time
+
+from .memo import fingerprint
+
+DEFAULT_ROOT = os.path.join(tempfile.gettempdir(), "bioinfo-artifacts")
+DEFAULT_MAX_BYTES = 512 << 20
+DEFAULT_MAX_AGE = 24 * 3600  # seconds
+SWEEP_INTERVAL = 600         # seconds between age checks while under budget
+TEMP_MAX_AGE = 3600          # a .tmp- file this old belongs to a dead write
+_TEMP_PREFIX = ".tmp-"
+
+
+class ArtifactStore:
+    """
+    Content-addressed files under <base>/<name> with size and age
+    eviction; base is $BIOINFO_ARTIFACTS or DEFAULT_ROOT. An explicit
+    root replaces <base>/<name> and must not be shared with another store.
+    """
+
+    def __init__(self, name, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE, root=None):
+        base = os.environ.get("BIOINFO_ARTIFACTS", DEFAULT_ROOT)
+        self.name = name
+        self.root = root or os.path.join(base, name)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.writes = 0
+        self.evictions = 0
+        self.nbytes = None  # counted when the directory is first used
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def _ensure(self):
+        # under the lock: create the directory and count what is already there
+        if self.nbytes is None:
+            os.makedirs(self.root, exist_ok=True)
+            self.nbytes = sum(size for _, _, size in self._listing())
+
+    def _listing(self, now=None):
+        """
+        (mtime, path, size) of every stored file. With `now`, temp files
+        of writes that died more than TEMP_MAX_AGE ago are deleted.
+        """
+        out = []
+        try:
+            it = os.scandir(self.root)
+        except FileNotFoundError:
+            return out
+        with it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+                if not entry.name.startswith("."):
+                    out.append((st.st_mtime, entry.path, st.st_size))
+                elif (now is not None and entry.name.startswith(_TEMP_PREFIX)
+                      and now - st.st_mtime > TEMP_MAX_AGE):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+        return out
+
+    def path(self, key, ext=".png"):
+        return os.path.join(self.root, fingerprint(key=key) + ext)
+
+    def get(self, key, ext=".png"):
+        """Path of a stored artifact (refreshing its age), or None."""
+        path = self.path(key, ext)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put_file(self, key, write, ext):
+        """Stores the file that write(tmp_path) produces, e.g. an export table."""
+        path = self.path(key, ext)
+        with self._lock:
+            self._ensure()
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=_TEMP_PREFIX)
+        os.close(fd)
+        try:
+            write(tmp)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        size = os.path.getsize(tmp)
+        with self._lock:
+            old = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+            self.nbytes += size - old
+            self.writes += 1
+        self.evict()
+        return path
+
+    def put_bytes(self, key, data, ext=".png"):
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                f.write(data)
+        return self.put_file(key, write, ext)
+
+    def put_figure(self, key, fig, **savefig_kwargs):
+        """Renders a matplotlib figure to PNG in memory and stores it."""
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", **savefig_kwargs)
+        return self.put_bytes(key, buf.getvalue(), ".png")
+
+    def get_or_render(self, key, render):
+        """Stored path for key, calling render() -> Figure only on a miss."""
+        return self.get(key) or self.put_figure(key, render())
+
+    def evict(self):
+        """
+        Drops expired files, then the oldest ones until under max_bytes.
+        The directory is only listed when over budget or once per
+        SWEEP_INTERVAL, not on every write.
+        """
+        now = time.time()
+        with self._lock:
+            if self.nbytes is None:  # nothing written yet: the first put sweeps
+                return
+            if self.nbytes <= self.max_bytes and now < self._next_sweep:
+                return
+            self._next_sweep = now + SWEEP_INTERVAL
+            files = sorted(self._listing(now))
+            self.nbytes = sum(size for _, _, size in files)
+            for mtime, path, size in files:
+                expired = self.max_age and now - mtime > self.max_age
+                if not expired and self.nbytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self.nbytes -= size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            for _, path, _ in self._listing():
+                os.remove(path)
+            if self.nbytes is not None:
+                self.nbytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits, "writes": self.writes, "evictions": self.evictions,
+            "bytes": self.nbytes or 0, "max_bytes": self.max_bytes, "root": self.root,
+        }
@@ -0,0 +1,129 @@
+"""
+Relative synonymous codon usage (RSCU) and codon adaptation index (CAI).
+
+Codons are indexed 0..63 as 16*a + 4*b + c with A=0, C=1, G=2, U=3 (the
+same order PackedSequence.codon_counts uses). A reference codon-usage
+table is turned once into a 64-element log-weight vector, and any number
+of genes is then scored with one gather plus one segment sum over their
+concatenated codon indices.
+
+CAI follows Sharp & Li (1987): w = count / max count among synonymous
+codons; stop codons and the single-codon amino acids (Met, Trp) are
+left out.
+"""
+import json
+
+import numpy as np
+
+from .codons import codon_table, codon_count, dna_to_rna
+from .encoding import UNKNOWN, encode_bases
+
+CODONS = [a + b + c for a in "ACGU" for b in "ACGU" for c in "ACGU"]
+CODON_INDEX = {c: i for i, c in enumerate(CODONS)}
+AMINO_ACIDS = np.array([codon_table[c] for c in CODONS])
+
+
+def synonymous_groups():
+    """{amino acid: [codon indices]} for all non-stop amino acids."""
+    groups = {}
+    for i, aa in enumerate(AMINO_ACIDS):
+        if aa != "Stop":
+            groups.setdefault(aa, []).append(i)
+    return groups
+
+def usage_vector(codon_counter):
+    """64-element count vector from a codon -> count mapping (DNA or RNA)."""
+    v = np.zeros(64)
+    for codon, n in codon_counter.items():
+        v[CODON_INDEX[codon.upper().replace("T", "U")]] += n
+    return v
+
+def rscu(codon_counter):
+    """
+    RSCU of every sense codon: observed count divided by the count
+    expected if all synonymous codons were used equally.
+    """
+    counts = usage_vector(codon_counter)
+    values = {}
+    for aa, idx in synonymous_groups().items():
+        total = counts[idx].sum()
+        for i in idx:
+            values[CODONS[i]] = counts[i] * len(idx) / total if total else 0.0
+    return values
+
+def reference_weights(codon_counter, pseudocount=0.5):
+    """
+    Returns (log_w, informative): the 64 log relative-adaptiveness
+    weights of a reference codon usage, and the mask of codons that
+    count towards CAI. The pseudocount keeps unseen codons finite.
+    """
+    counts = usage_vector(codon_counter) + pseudocount
+    log_w = np.zeros(64)
+    informative = np.zeros(64, dtype=bool)
+
+    for aa, idx in synonymous_groups().items():
+        if len(idx) == 1:
+            continue  # Met, Trp: no choice, no information
+        log_w[idx] = np.log(counts[idx] / counts[idx].max())
+        informative[idx] = True
+
+    return log_w, informative
+
+def load_codon_usage(path):
+    """
+    Reference codon usage from a JSON {codon: count or frequency} table,
+    or counted from the genes of a FASTA file.
+    """
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    from .fasta import read_fasta_records
+
+    total = codon_count("")
+    for _, seq in read_fasta_records(path):
+        total += codon_count(dna_to_rna(seq))
+    return total
+
+def codon_indices(seq):
+    """In-frame codon indices of a gene; -1 for codons containing N."""
+    codes = encode_bases(seq)
+    n = len(codes) // 3
+    triplets = codes[:3 * n].reshape(n, 3).astype(np.int64)
+    index = triplets @ np.array([16, 4, 1])
+    index[(triplets == UNKNOWN).any(axis=1)] = -1
+    return index
+
+def cai_batch(genes, log_w, informative):
+    """
+    CAI of every gene (str or PackedSequence) in one pass. Genes without
+    any informative codon get NaN.
+    """
+    per_gene = [codon_indices(g) for g in genes]
+    lengths = np.array([len(ix) for ix in per_gene], dtype=np.int64)
+    index = np.concatenate(per_gene) if per_gene else np.zeros(0, np.int64)
+    gene_id = np.repeat(np.arange(len(per_gene)), lengths)
+
+    ok = index >= 0
+    ok[ok] = informative[index[ok]]
+    index, gene_id = index[ok], gene_id[ok]
+
+    log_sum = np.bincount(gene_id, weights=log_w[index], minlength=len(per_gene))
+    used = np.bincount(gene_id, minlength=len(per_gene))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.exp(log_sum / used)
+
+def rscu_batch(genes):
+    """(genes x 64) RSCU matrix, NaN where an amino acid is absent from a gene."""
+    per_gene = [codon_indices(g) for g in genes]
+    counts = np.zeros((len(per_gene), 64))
+    for row, index in enumerate(per_gene):
+        counts[row] = np.bincount(index[index >= 0], minlength=64)
+
+    out = np.full_like(counts, np.nan)
+    for aa, idx in synonymous_groups().items():
+        totals = counts[:, idx].sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[:, idx] = counts[:, idx] * len(idx) / totals
+    return out
@@ -0,0 +1,473 @@
+"""
+Command line entry points for batch jobs: python -m bioinfo <command> ...
+
+Each command imports only the modules it needs, so a worker that just
+counts codons never pays for numpy, scipy or any GUI toolkit.
+"""
+import argparse
+import json
+import sys
+
+
+def _read_sequence(args):
+    if args.fasta:
+        from .fasta import read_fasta
+        return read_fasta(args.sequence)
+    return args.sequence.strip().upper()
+
+def _dump(obj, path=None):
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=4)
+    else:
+        json.dump(obj, sys.stdout)
+        sys.stdout.write("\n")
+
+def _pvalue(text):
+    try:
+        p = float(text)
+    except ValueError:
+        p = None
+    if p is None or not 0 < p <= 1:
+        raise argparse.ArgumentTypeError(f"p-value must be in (0, 1], got {text}")
+    return p
+
+
+def cmd_translate(args):
+    from .codons import rna_to_protein
+    print(rna_to_protein(args.rna.strip().upper()))
+
+def cmd_codons(args):
+    from .codons import dna_to_rna, codon_count, amino_acid_count
+    from .packed import read_fasta_packed
+    from .pipeline import prefetch
+
+    # the next files are read and packed while this one is counted
+    for path, seq in prefetch(args.files, read_fasta_packed):
+        codons = codon_count(dna_to_rna(seq))
+        amino_acids = amino_acid_count(codons)
+        _dump({
+            "file": path,
+            "top_codons": codons.most_common(args.top),
+            "top_amino_acids": amino_acids.most_common(3),
+        })
+
+def cmd_aa_index(args):
+    from .aa_index import AminoAcidIndex, build_index
+
+    if args.build:
+        index = build_index(args.build, args.index, records=args.records)
+        print(f"{args.index}: {len(index)} genome(s) indexed", file=sys.stderr)
+    else:
+        index = AminoAcidIndex(args.index)
+
+    if args.with_top:
+        _dump({"with_top": args.with_top, "genomes": index.with_top(args.with_top, args.ordered)})
+    if args.similar:
+        _dump({"genome": args.similar, "similar": index.similar(args.similar, args.n)})
+    if args.foods:
+        _dump({g: {"top": index.top(g, args.k), "foods": f}
+               for g, f in index.foods(args.foods, args.k).items()})
+
+def cmd_compare(args):
+    from .codons import process_genomes
+
+    results = process_genomes(args.covid, args.influenza)
+    keys = [
+        "top10_covid", "top10_influenza", "top10_combined", "top3_covid_aa",
+        "top3_influenza_aa", "ai_prompt", "food_suggestions",
+    ]
+    _dump(dict(zip(keys, results)))
+
+def cmd_rscu(args):
+    from .cai import rscu
+    from .codons import dna_to_rna, codon_count
+    from .packed import read_fasta_packed
+
+    for path in args.files:
+        _dump({"file": path, "rscu": rscu(codon_count(dna_to_rna(read_fasta_packed(path))))})
+
+def cmd_cai(args):
+    from .cai import load_codon_usage, reference_weights, cai_batch
+    from .fasta import read_fasta_records
+
+    log_w, informative = reference_weights(load_codon_usage(args.reference), args.pseudocount)
+    records = list(read_fasta_records(args.genes))
+    headers = [h for h, _ in records]
+    genes = [g for _, g in records]
+    scores = cai_batch(genes, log_w, informative)
+
+    out = sys.stdout
+    out.write("gene\tcodons\tcai\n")
+    for header, gene, score in zip(headers, genes, scores):
+        out.write(f"{header.split()[0]}\t{len(gene) // 3}\t{score:.4f}\n")
+
+def cmd_codon_distance(args):
+    from .codon_distance import usage_frequencies, pairwise_distances, nearest_neighbors, cluster
+    from .fasta import read_fasta_records
+    from .packed import read_fasta_packed
+
+    if args.records:
+        labels, genomes = [], []
+        for path in args.files:
+            for header, seq in read_fasta_records(path):
+                labels.append(header.split()[0] if header else path)
+                genomes.append(seq)
+        F = usage_frequencies(genomes)
+    else:
+        labels = list(args.files)
+        F = usage_frequencies(read_fasta_packed(path) for path in labels)
+
+    D = pairwise_distances(F, args.metric, args.output)
+    out = sys.stdout
+    if args.clusters:
+        out.write("genome\tcluster\n")
+        for label, c in zip(labels, cluster(D, args.clusters)):
+            out.write(f"{label}\t{c}\n")
+        return
+
+    indices, distances = nearest_neighbors(D, args.neighbors)
+    out.write("genome\tneighbor\tdistance\n")
+    for label, row, dist in zip(labels, indices, distances):
+        for j, d in zip(row, dist):
+            out.write(f"{label}\t{labels[j]}\t{d:.6f}\n")
+
+def cmd_kmers(args):
+    from .fasta import read_fasta_records
+    from .kmers import KmerCounts, count_records
+
+    spectra = []
+    for path in args.files:
+        if path.endswith(".npz"):  # counts saved earlier with -o
+            counts = KmerCounts.load(path)
+            if (counts.k, counts.canonical) != (args.k, args.canonical):
+                raise SystemExit(f"{path}: counted with k={counts.k}, canonical={counts.canonical}")
+        else:
+            counts = count_records(read_fasta_records(path), args.k, args.canonical, args.processes)
+        spectra.append((path, counts))
+
+    out = sys.stdout
+    if args.compare:
+        out.write("file_a\tfile_b\tjaccard\tcontainment_a_in_b\n")
+        for a, ca in spectra:
+            for b, cb in spectra:
+                if a != b:
+                    out.write(f"{a}\t{b}\t{ca.jaccard(cb):.6f}\t{ca.containment(cb):.6f}\n")
+        return
+
+    merged = spectra[0][1].merge(*(c for _, c in spectra[1:]))
+    if args.output:
+        merged.save(args.output)
+    out.write("kmer\tcount\n")
+    for kmer, n in merged.most_common(args.top):
+        out.write(f"{kmer}\t{n}\n")
+
+def cmd_bgzip(args):
+    from .bgzf import compress_bgzf
+    from .fasta import write_fai
+
+    out = args.output or args.fasta + ".bgz"
+    compress_bgzf(args.fasta, out, level=args.level, threads=args.threads)
+    write_fai(out)
+    print(out)
+
+def cmd_fetch(args):
+    from .fasta import fetch_region
+
+    name, _, span = args.region.rpartition(":")
+    if not name:
+        raise SystemExit("Region must look like NAME:START-END (1-based, inclusive)")
+    start, _, end = span.partition("-")
+    print(fetch_region(args.fasta, name, int(start) - 1, int(end)))
+
+def cmd_pwm_scan(args):
+    from .pwm import build_pwm, pwm_array, scan_batch, score_cutoff
+
+    _, _, loglik = build_pwm()
+    W = pwm_array(loglik)
+    if args.workers > 1:
+        from .packed import PackedSequence, read_fasta_packed
+        from .shared import parallel_scan
+
+        seq = read_fasta_packed(args.sequence) if args.fasta else PackedSequence.from_string(args.sequence)
+        pvalue_cutoff = score_cutoff(W, args.pvalue) if args.pvalue is not None else None
+        cutoffs = [c for c in (args.threshold, pvalue_cutoff) if c is not None]
+        result, = parallel_scan(seq, [W], max(cutoffs, default=None), args.workers)
+        result = result.filter(top_k=args.top_k)
+    else:
+        result, = scan_batch([_read_sequence(args)], W, args.threshold, args.top_k, args.pvalue)
+    if args.output:
+        result.save(args.output)
+        return
+
+    out = sys.stdout
+    out.write("position\twindow\tscore\n")
+    for i, (p, s) in enumerate(zip(result.positions, result.scores)):
+        out.write(f"{p}\t{result.window(i)}\t{s:.6f}\n")
+
+def cmd_motif_scan(args):
+    from .fasta import read_fasta
+    from .motif_scan import L, scan_genome, bin_scores, bin_scores_array, motif_matrix
+    from .packed import read_fasta_packed
+    from .pipeline import prefetch
+
+    out = sys.stdout
+    out.write("file\tposition\tscore\n")
+    load = read_fasta_packed if args.workers > 1 else read_fasta
+    for path, seq in prefetch(args.files, load):
+        if args.workers > 1:
+            from .shared import parallel_scan
+
+            # -inf (N) windows fall below -L and are dropped, as in scan_genome
+            result, = parallel_scan(seq, [motif_matrix()], -L, args.workers)
+            positions, scores = bin_scores_array(result.positions, result.scores, args.bin_size)
+        else:
+            positions, scores = scan_genome(seq)
+            positions, scores = bin_scores(positions, scores, args.bin_size)
+        for p, s in zip(positions, scores):
+            out.write(f"{path}\t{p}\t{s:.6f}\n")
+
+def cmd_transition_matrix(args):
+    from .markov import compute_transition_matrix
+    _dump(compute_transition_matrix(_read_sequence(args)), args.output)
+
+def cmd_word_model(args):
+    from .markov import tokenize, build_model
+
+    with open(args.text, "r", encoding="utf-8") as f:
+        words = tokenize(f.read())
+    if len(words) < 2:
+        raise SystemExit("Not enough words after filtering")
+
+    word_to_id, id_to_word, matrix = build_model(words)
+    _dump({
+        "word_to_id": word_to_id,
+        "id_to_word": id_to_word,
+        "transition_matrix": matrix
+    }, args.output)
+
+def cmd_predict(args):
+    from .prediction import load_transition_model, start_vector, sparse_trajectory, top_states
+
+    P, word_to_id, id_to_word = load_transition_model(args.model)
+    x = start_vector(word_to_id, args.start.lower())
+
+    for step, x in sparse_trajectory(P, x, args.steps, args.top_k):
+        _dump({"step": step, "top": top_states(x, id_to_word, args.show)})
+
+def cmd_generate(args):
+    import random
+    from .markov import generate_dna, generate_text
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    with open(args.model, "r", encoding="utf-8") as f:
+        model = json.load(f)
+
+    if "transition_matrix" in model:
+        print(generate_text(model, args.length, args.start.lower()))
+    else:
+        print(generate_dna(model, args.length, args.start.upper()))
+
+def cmd_simulate(args):
+    from .simulate import parse_length, write_fasta
+
+    written = write_fasta(args.output, args.model, args.records, parse_length(args.length),
+                          seed=args.seed, start=args.start.upper() or None, prefix=args.prefix)
+    print(f"{args.output}: {args.records} record(s), {written} bases", file=sys.stderr)
+
+def cmd_cpg(args):
+    from .cpg import ALPHABET, train_models, classify
+
+    seq = _read_sequence(args)
+    if not seq or any(c not in ALPHABET for c in seq):
+        raise SystemExit("Sequence must contain only A, C, G, T.")
+
+    beta = train_models()[-1]
+    llr, label = classify(seq, beta)
+    _dump({"llr": llr, "class": label})
+
+def cmd_cpg_islands(args):
+    from .cpg_hmm import build_hmm, segment_records
+    from .fasta import read_fasta_records
+
+    hmm = build_hmm(island_length=args.island_length, background_length=args.background_length)
+    out = sys.stdout
+    out.write("file\trecord\tstart\tend\n")
+    for path in args.files:
+        records = ((h.split()[0] if h else "", s) for h, s in read_fasta_records(path))
+        for name, found in segment_records(records, hmm, args.method, args.processes, args.min_length):
+            for start, end in found:
+                out.write(f"{path}\t{name}\t{start}\t{end}\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m bioinfo")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write a Chrome trace of the run's stages to PATH")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also record tracemalloc peaks per stage (slower)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("translate", help="translate a coding RNA sequence")
+    p.add_argument("rna")
+    p.set_defaults(func=cmd_translate)
+
+    p = sub.add_parser("codons", help="codon / amino acid usage per FASTA file")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--top", type=int, default=10)
+    p.set_defaults(func=cmd_codons)
+
+    p = sub.add_parser("compare", help="COVID-19 vs influenza codon report")
+    p.add_argument("covid")
+    p.add_argument("influenza")
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("aa-index", help="build or query an on-disk amino-acid composition index")
+    p.add_argument("index", help="index directory")
+    p.add_argument("--build", nargs="+", metavar="FASTA", help="(re)build the index from these files")
+    p.add_argument("--records", action="store_true",
+                   help="one genome per FASTA record instead of one per file")
+    p.add_argument("--with-top", nargs="+", metavar="AA", help="genomes whose top amino acids are these")
+    p.add_argument("--ordered", action="store_true", help="--with-top must match in order")
+    p.add_argument("--similar", metavar="GENOME", help="genomes with the closest composition")
+    p.add_argument("-n", type=int, default=5)
+    p.add_argument("--foods", nargs="+", metavar="GENOME", help="food suggestions for these genomes")
+    p.add_argument("-k", type=int, default=3, help="top amino acids used for --foods")
+    p.set_defaults(func=cmd_aa_index)
+
+    p = sub.add_parser("rscu", help="relative synonymous codon usage per FASTA file")
+    p.add_argument("files", nargs="+")
+    p.set_defaults(func=cmd_rscu)
+
+    p = sub.add_parser("cai", help="codon adaptation index of every gene in a FASTA file")
+    p.add_argument("genes", help="FASTA file with one coding sequence per record")
+    p.add_argument("--reference", required=True,
+                   help="codon usage JSON ({codon: count}) or FASTA of reference genes")
+    p.add_argument("--pseudocount", type=float, default=0.5)
+    p.set_defaults(func=cmd_cai)
+
+    p = sub.add_parser("codon-distance",
+                       help="pairwise codon-usage distances, nearest neighbours or clusters, TSV output")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--records", action="store_true",
+                   help="one genome per FASTA record instead of one per file")
+    p.add_argument("--metric", choices=("euclidean", "cosine", "jensenshannon"), default="jensenshannon")
+    p.add_argument("-o", "--output", help="keep the full matrix as a memory-mapped .npy file")
+    p.add_argument("--neighbors", type=int, default=5)
+    p.add_argument("--clusters", type=int, default=None,
+                   help="print hierarchical cluster labels instead of neighbours")
+    p.set_defaults(func=cmd_codon_distance)
+
+    p = sub.add_parser("kmers", help="overlapping k-mer counts of FASTA files or saved counts, TSV output")
+    p.add_argument("files", nargs="+", help="FASTA files and/or .npz counts to merge")
+    p.add_argument("-k", type=int, default=21)
+    p.add_argument("--canonical", action="store_true", help="merge each k-mer with its reverse complement")
+    p.add_argument("--processes", type=int, default=None)
+    p.add_argument("-o", "--output", help="save the merged counts (.npz)")
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--compare", action="store_true",
+                   help="print pairwise Jaccard / containment of the inputs instead")
+    p.set_defaults(func=cmd_kmers)
+
+    p = sub.add_parser("bgzip", help="BGZF-compress a FASTA file and index it (.gzi, .fai)")
+    p.add_argument("fasta")
+    p.add_argument("-o", "--output")
+    p.add_argument("--level", type=int, default=6)
+    p.add_argument("--threads", type=int, default=None)
+    p.set_defaults(func=cmd_bgzip)
+
+    p = sub.add_parser("fetch", help="print a region of a plain or BGZF FASTA file")
+    p.add_argument("fasta")
+    p.add_argument("region", help="NAME:START-END, 1-based inclusive like samtools faidx")
+    p.set_defaults(func=cmd_fetch)
+
+    for name, func, text in (
+        ("pwm-scan", cmd_pwm_scan, "exon-intron PWM scan, TSV output"),
+        ("transition-matrix", cmd_transition_matrix, "nucleotide transition matrix as JSON"),
+        ("cpg", cmd_cpg, "CpG+/- log-likelihood classification"),
+    ):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("sequence", help="DNA sequence, or a FASTA path with --fasta")
+        p.add_argument("--fasta", action="store_true")
+        if name == "transition-matrix":
+            p.add_argument("-o", "--output")
+        if name == "pwm-scan":
+            p.add_argument("--threshold", type=float, default=None,
+                           help="keep windows scoring at least this much")
+            p.add_argument("--pvalue", type=_pvalue, default=None,
+                           help="keep windows at least this significant (exact PWM score distribution)")
+            p.add_argument("--top-k", type=int, default=None, help="keep the K best windows")
+            p.add_argument("-o", "--output",
+                           help="write position/score columns to a .npy or .parquet file")
+            p.add_argument("--workers", type=int, default=1,
+                           help="scan regions in this many processes sharing one sequence buffer")
+        p.set_defaults(func=func)
+
+    p = sub.add_parser("cpg-islands", help="CpG island segments from an 8-state HMM, TSV output")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--method", choices=("viterbi", "posterior"), default="viterbi")
+    p.add_argument("--processes", type=int, default=None)
+    p.add_argument("--min-length", type=int, default=200)
+    p.add_argument("--island-length", type=float, default=1000)
+    p.add_argument("--background-length", type=float, default=100000)
+    p.set_defaults(func=cmd_cpg_islands)
+
+    p = sub.add_parser("motif-scan", help="binned motif signal per FASTA file, TSV output")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--bin-size", type=int, default=100)
+    p.add_argument("--workers", type=int, default=1,
+                   help="scan regions in this many processes sharing one sequence buffer")
+    p.set_defaults(func=cmd_motif_scan)
+
+    p = sub.add_parser("word-model", help="word transition model from a text file")
+    p.add_argument("text")
+    p.add_argument("-o", "--output")
+    p.set_defaults(func=cmd_word_model)
+
+    p = sub.add_parser("predict", help="n-step forecast from a saved word model")
+    p.add_argument("model")
+    p.add_argument("--start", required=True)
+    p.add_argument("--steps", type=int, default=5)
+    p.add_argument("--top-k", type=int, default=None)
+    p.add_argument("--show", type=int, default=5)
+    p.set_defaults(func=cmd_predict)
+
+    p = sub.add_parser("generate", help="sample from a saved DNA or word model")
+    p.add_argument("model")
+    p.add_argument("--length", type=int, default=50)
+    p.add_argument("--start", default="")
+    p.add_argument("--seed", type=int, default=None)
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser("simulate", help="stream a synthetic FASTA genome from a saved DNA model")
+    p.add_argument("model")
+    p.add_argument("-o", "--output", required=True)
+    p.add_argument("--records", type=int, default=1)
+    p.add_argument("--length", default="1M", help="bases per record, k/M/G suffixes allowed")
+    p.add_argument("--start", default="")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--prefix", default="simulated")
+    p.set_defaults(func=cmd_simulate)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if not args.trace:
+        args.func(args)
+        return
+
+    from . import instrument
+
+    instrument.enable(memory=args.trace_memory)
+    try:
+        with instrument.span(args.command):
+            args.func(args)
+    finally:
+        instrument.dump_chrome_trace(args.trace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Pairwise codon-usage distances between many genomes.
+
+Every genome is reduced to its 64-codon frequency vector (reading frame
+0, codons with N skipped, same codon order as cai.CODONS). The n x n
+distance matrix is filled block by block with broadcasted NumPy
+arithmetic and can be written straight into a memory-mapped .npy file,
+so a 20,000-genome panel (1.6 GB of float32 on disk) is computed with a
+few tens of MB of RAM. Nearest-neighbour queries stream over the same
+matrix row block by row block.
+"""
+import numpy as np
+
+from .cai import codon_indices
+
+METRICS = ("euclidean", "cosine", "jensenshannon")
+BLOCK = 1024     # rows / columns per block for the matmul-based metrics
+JS_BLOCK = 128   # Jensen-Shannon broadcasts a (block, block, 64) array
+
+
+def usage_frequencies(genomes):
+    """
+    (genomes x 64) float32 codon frequencies of str / PackedSequence
+    genomes; any iterable works, so records can be streamed in.
+    """
+    rows = []
+    for genome in genomes:
+        index = codon_indices(genome)
+        counts = np.bincount(index[index >= 0], minlength=64)
+        rows.append(counts / max(counts.sum(), 1))
+    return np.array(rows, dtype=np.float32).reshape(len(rows), 64)
+
+def _entropy(P):
+    # 0 log 0 = 0: the log is only taken where P > 0
+    L = np.zeros_like(P)
+    np.log2(P, out=L, where=P > 0)
+    L *= P
+    return -L.sum(axis=-1)
+
+def _block(metric, A, B, norms_a, norms_b):
+    if metric == "euclidean":
+        D = norms_a[:, None] + norms_b[None, :] - 2 * (A @ B.T)
+        return np.sqrt(np.maximum(D, 0))
+    if metric == "cosine":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            D = 1 - (A @ B.T) / (norms_a[:, None] * norms_b[None, :])
+        return np.nan_to_num(np.maximum(D, 0), nan=1.0)
+    # Jensen-Shannon distance: sqrt(H(m) - (H(p) + H(q)) / 2), base 2
+    M = (A[:, None, :] + B[None, :, :]) / 2
+    D = _entropy(M) - (norms_a[:, None] + norms_b[None, :]) / 2
+    return np.sqrt(np.maximum(D, 0))
+
+def pairwise_distances(F, metric="euclidean", path=None, block=None):
+    """
+    Full n x n float32 distance matrix of the rows of F. With `path` the
+    matrix is a memmap of that .npy file; only one block pair is held in
+    memory at a time, and each off-diagonal block is computed once and
+    mirrored.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {', '.join(METRICS)}")
+    F = np.asarray(F, dtype=np.float64)
+    n = len(F)
+    block = block or (JS_BLOCK if metric == "jensenshannon" else BLOCK)
+
+    if path is None:
+        D = np.empty((n, n), dtype=np.float32)
+    else:
+        D = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(n, n))
+
+    if metric == "euclidean":
+        norms = (F * F).sum(axis=1)
+    elif metric == "cosine":
+        norms = np.sqrt((F * F).sum(axis=1))
+    else:
+        norms = _entropy(F)
+
+    for i in range(0, n, block):
+        A = F[i:i + block]
+        for j in range(i, n, block):
+            B = F[j:j + block]
+            values = _block(metric, A, B, norms[i:i + block], norms[j:j + block])
+            D[i:i + block, j:j + block] = values
+            if j != i:
+                D[j:j + block, i:i + block] = values.T
+        # rounding leaves tiny non-zero self distances
+        diag = np.arange(i, min(i + block, n))
+        D[diag, diag] = 0
+
+    if path is not None:
+        D.flush()
+    return D
+
+def nearest_neighbors(D, k=5, block=BLOCK):
+    """
+    The k closest other rows of every row of a distance matrix (array or
+    memmap), read block by block. Returns (indices, distances), both
+    (n, k) and sorted by distance.
+    """
+    n = len(D)
+    k = min(k, n - 1)
+    indices = np.empty((n, k), dtype=np.int64)
+    distances = np.empty((n, k), dtype=np.float32)
+
+    for i in range(0, n, block):
+        rows = np.array(D[i:i + block], dtype=np.float32)
+        rows[np.arange(len(rows)), np.arange(i, i + len(rows))] = np.inf
+        part = np.argpartition(rows, k - 1, axis=1)[:, :k] if k else np.empty((len(rows), 0), int)
+        dist = np.take_along_axis(rows, part, axis=1)
+        order = np.argsort(dist, axis=1, kind="stable")
+        indices[i:i + block] = np.take_along_axis(part, order, axis=1)
+        distances[i:i + block] = np.take_along_axis(dist, order, axis=1)
+    return indices, distances
+
+def cluster(D, n_clusters, method="average"):
+    """
+    Hierarchical clustering labels (1..n_clusters) from a distance
+    matrix, through scipy. Needs the condensed matrix in memory
+    (n * (n - 1) / 2 doubles), so use nearest_neighbors for the largest
+    panels.
+    """
+    from scipy.cluster.hierarchy import fcluster, linkage
+    from scipy.spatial.distance import squareform
+
+    condensed = squareform(np.asarray(D, dtype=np.float64), checks=False)
+    return fcluster(linkage(condensed, method=method), n_clusters, criterion="maxclust")
@@ -0,0 +1,114 @@
+from collections import Counter
+
+from . import instrument
+
+# RNA codon table
+codon_table = {
+    "UUU": "Phe","UUC": "Phe","UUA": "Leu","UUG": "Leu",
+    "UCU": "Ser","UCC": "Ser","UCA": "Ser","UCG": "Ser",
+    "UAU": "Tyr","UAC": "Tyr","UAA": "Stop","UAG": "Stop",
+    "UGU": "Cys","UGC": "Cys","UGA": "Stop","UGG": "Trp",
+    "CUU": "Leu","CUC": "Leu","CUA": "Leu","CUG": "Leu",
+    "CCU": "Pro","CCC": "Pro","CCA": "Pro","CCG": "Pro",
+    "CAU": "His","CAC": "His","CAA": "Gln","CAG": "Gln",
+    "CGU": "Arg","CGC": "Arg","CGA": "Arg","CGG": "Arg",
+    "AUU": "Ile","AUC": "Ile","AUA": "Ile","AUG": "Met",
+    "ACU": "Thr","ACC": "Thr","ACA": "Thr","ACG": "Thr",
+    "AAU": "Asn","AAC": "Asn","AAA": "Lys","AAG": "Lys",
+    "AGU": "Ser","AGC": "Ser","AGA": "Arg","AGG": "Arg",
+    "GUU": "Val","GUC": "Val","GUA": "Val","GUG": "Val",
+    "GCU": "Ala","GCC": "Ala","GCA": "Ala","GCG": "Ala",
+    "GAU": "Asp","GAC": "Asp","GAA": "Glu","GAG": "Glu",
+    "GGU": "Gly","GGC": "Gly","GGA": "Gly","GGG": "Gly",
+}
+
+# Mapping of low-amino-acid foods
+low_amino_foods = {
+    "Leu": ["Apples", "Oranges", "Berries", "Lettuce", "Rice", "White bread"],
+    "Ala": ["Fruits", "Leafy greens", "Rice", "Corn", "Wheat products"],
+    "Gly": ["Fruits", "Vegetables", "Rice", "Refined cereals"],
+    "Ser": ["Fruits", "Vegetables like lettuce, cucumber, zucchini", "Rice", "White bread"],
+    "Thr": ["Fruits", "Rice", "Refined grains", "Certain vegetables like lettuce, cucumber"]
+}
+
+
+def rna_to_protein(rna_sequence):
+    """
+    Converts a coding RNA sequence to an amino acid sequence.
+    Stops translation at a stop codon.
+    """
+    protein_sequence = []
+
+    for i in range(0, len(rna_sequence), 3):
+        codon = rna_sequence[i:i+3]
+        if len(codon) < 3:
+            break
+        amino_acid = codon_table.get(codon.upper(), "")
+        if amino_acid == "Stop":
+            break
+        if amino_acid:
+            protein_sequence.append(amino_acid)
+
+    return "-".join(protein_sequence)
+
+def dna_to_rna(dna_seq):
+    if hasattr(dna_seq, "as_rna"):  # PackedSequence: a view, not a copy
+        return dna_seq.as_rna()
+    return dna_seq.replace("T", "U")
+
+def codon_count(rna_seq):
+    if hasattr(rna_seq, "codon_counts"):  # PackedSequence
+        counts = rna_seq.as_rna().codon_counts()
+        return Counter({c: n for c, n in counts.items() if codon_table[c] != "Stop"})
+    codons = [rna_seq[i:i+3] for i in range(0,len(rna_seq)-2,3)]
+    codons = [c for c in codons if c in codon_table and codon_table[c] != "Stop"]
+    return Counter(codons)
+
+def amino_acid_count(codon_counter):
+    aa_counter = Counter()
+    for codon, count in codon_counter.items():
+        aa = codon_table[codon]
+        aa_counter[aa] += count
+    return aa_counter
+
+def suggest_foods(amino_acids):
+    """{amino acid: foods low in it} for the given amino acids."""
+    return {aa: low_amino_foods.get(aa, ["No data"]) for aa in amino_acids}
+
+def _load_genome(path):
+    from .packed import read_fasta_packed
+
+    with instrument.span("parse", file=path):
+        return read_fasta_packed(path)
+
+def process_genomes(covid_file, influenza_file):
+    from .pipeline import prefetch
+
+    # the influenza file is read while the COVID-19 codons are counted
+    counts = []
+    for _, seq in prefetch([covid_file, influenza_file], _load_genome):
+        instrument.count("bases_processed", len(seq))
+        with instrument.span("transcribe"):
+            seq = dna_to_rna(seq)
+        with instrument.span("count_codons"):
+            counts.append(codon_count(seq))
+    covid_codons, influenza_codons = counts
+    combined_codons = covid_codons + influenza_codons
+
+    with instrument.span("count_amino_acids"):
+        top10_covid = covid_codons.most_common(10)
+        top10_influenza = influenza_codons.most_common(10)
+        top10_combined = combined_codons.most_common(10)
+
+        covid_aa = amino_acid_count(covid_codons)
+        influenza_aa = amino_acid_count(influenza_codons)
+
+        top3_covid_aa = covid_aa.most_common(3)
+        top3_influenza_aa = influenza_aa.most_common(3)
+
+    ai_prompt = f"The top three amino acids most frequently used in the SARS-CoV-2 genome are {', '.join([aa for aa,_ in top3_covid_aa])}. Suggest foods that are low in these amino acids."
+
+    # Generate food suggestions
+    food_suggestions = suggest_foods(aa for aa, _ in top3_covid_aa)
+
+    return (top10_covid, top10_influenza, top10_combined, top3_covid_aa, top3_influenza_aa, ai_prompt, food_suggestions)
@@ -0,0 +1,75 @@
+import math
+
+ALPHABET = ["A", "C", "G", "T"]
+
+
+S1 = "ATCGATTCGATATCATACACGTAT"
+S2 = "CTCGACTAGTATGAAGTCCACGCTTG"
+
+
+def init_matrix():
+    return {a: {b: 0 for b in ALPHABET} for a in ALPHABET}
+
+def count_transitions(seq):
+    m = init_matrix()
+    for x, y in zip(seq[:-1], seq[1:]):
+        m[x][y] += 1
+    return m
+
+def normalize(counts):
+    probs = init_matrix()
+    for a in ALPHABET:
+        total = sum(counts[a].values())
+        for b in ALPHABET:
+            probs[a][b] = counts[a][b] / total if total > 0 else 0.0
+    return probs
+
+def log_likelihood(tr_p, tr_n):
+    beta = init_matrix()
+    for a in ALPHABET:
+        for b in ALPHABET:
+            p = tr_p[a][b]
+            q = tr_n[a][b]
+            if p == 0 and q == 0:
+                beta[a][b] = 0.0
+            elif p == 0:
+                beta[a][b] = float("-inf")
+            else:
+                beta[a][b] = math.log(p / q, 2)
+    return beta
+
+def score_sequence(seq, beta):
+    score = 0.0
+    for x, y in zip(seq[:-1], seq[1:]):
+        score += beta[x][y]
+    return score
+
+def format_matrix(m):
+    lines = []
+    header = "      " + "   ".join(ALPHABET)
+    lines.append(header)
+    for a in ALPHABET:
+        row = [a]
+        for b in ALPHABET:
+            v = m[a][b]
+            if v == float("-inf"):
+                row.append("-inf")
+            else:
+                row.append(f"{v:.3f}")
+        lines.append("{:>3}   ".format(row[0]) + "   ".join(row[1:]))
+    return "\n".join(lines)
+
+def train_models(plus=S1, minus=S2):
+    """Returns (count_p, count_n, tr_p, tr_n, beta) for the two training sets."""
+    count_p = count_transitions(plus)
+    count_n = count_transitions(minus)
+
+    tr_p = normalize(count_p)
+    tr_n = normalize(count_n)
+
+    beta = log_likelihood(tr_p, tr_n)
+    return count_p, count_n, tr_p, tr_n, beta
+
+def classify(seq, beta):
+    llr = score_sequence(seq, beta)
+    return llr, "+" if llr > 0 else "-"
@@ -0,0 +1,203 @@
+"""
+8-state CpG island HMM (A+, C+, G+, T+, A-, C-, G-, T-) built from the
+cpg.py transition tables, decoded in log space with numpy.
+
+Every state emits its own base, so at position t only the two states
+x_t+ and x_t- are possible and the 8x8 recursion reduces to a product of
+2x2 matrices gathered from the 8x8 log transition table. Products are
+associative, so each chunk is propagated block-wise: a short Python loop
+over block offsets runs vectorized across all blocks at once, then the
+block totals are chained. Viterbi and posterior decoding share that code
+and differ only in the semiring (max vs logaddexp).
+
+Long records are processed in CHUNK-position pieces: a forward pass keeps
+only the 2-vector at each chunk start, a backward pass over the chunks
+recomputes the forward vectors of one chunk at a time. Intermediates are
+bounded by the chunk size, only the decoded track is O(n).
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import instrument
+from .cpg import ALPHABET, train_models
+from .encoding import encode_bases, UNKNOWN
+from .pipeline import bounded_map
+
+STATES = [b + "+" for b in ALPHABET] + [b + "-" for b in ALPHABET]
+CHUNK = 1 << 18
+ISLAND_LENGTH = 1000        # expected island length (bp)
+BACKGROUND_LENGTH = 100000  # expected distance between islands (bp)
+
+_IDENTITY = np.array([[0.0, -np.inf], [-np.inf, 0.0]])
+
+
+def _as_array(counts, pseudocount):
+    M = np.array([[counts[a][b] for b in ALPHABET] for a in ALPHABET], dtype=float)
+    M += pseudocount
+    return M / M.sum(axis=1, keepdims=True)
+
+def build_hmm(count_p=None, count_n=None, island_length=ISLAND_LENGTH,
+              background_length=BACKGROUND_LENGTH, pseudocount=1.0):
+    """
+    Returns (log_start, log_trans) for the 8 STATES from the CpG+/- count
+    tables of cpg.train_models(). Leaving an island happens with
+    probability 1/island_length per base, entering one with
+    1/background_length; after a switch the next base follows the other
+    model's table.
+    """
+    if count_p is None or count_n is None:
+        count_p, count_n = train_models()[:2]
+    P = _as_array(count_p, pseudocount)
+    N = _as_array(count_n, pseudocount)
+
+    leave = 1.0 / island_length
+    enter = 1.0 / background_length
+    T = np.empty((8, 8))
+    T[:4, :4] = (1 - leave) * P
+    T[:4, 4:] = leave * N
+    T[4:, 4:] = (1 - enter) * N
+    T[4:, :4] = enter * P
+
+    island = enter / (enter + leave)
+    start = np.r_[np.full(4, island / 4), np.full(4, (1 - island) / 4)]
+    return np.log(start), np.log(T)
+
+# ---------------- Semiring helpers ----------------
+
+def _product(A, B, op):
+    # (A ⊗ B)[i, k] = op_j A[i, j] + B[j, k], over any leading batch axes
+    return op(A[..., :, 0, None] + B[..., None, 0, :], A[..., :, 1, None] + B[..., None, 1, :])
+
+def _apply(v, M, op):
+    # row vector(s) times matrices: (v ⊗ M)[k] = op_i v[i] + M[i, k]
+    return op(v[..., 0, None] + M[..., 0, :], v[..., 1, None] + M[..., 1, :])
+
+def _total(M, op):
+    while len(M) > 1:
+        if len(M) & 1:
+            M = np.concatenate([M, _IDENTITY[None]])
+        M = _product(M[0::2], M[1::2], op)
+    return M[0] if len(M) else _IDENTITY
+
+def _propagate(v, M, op):
+    """Row vectors v, v ⊗ M[0], v ⊗ M[0] ⊗ M[1], ... (len(M) + 1 rows)."""
+    m = len(M)
+    out = np.empty((m + 1, 2))
+    out[0] = v
+    if m == 0:
+        return out
+
+    size = max(1, math.isqrt(m))
+    blocks = -(-m // size)
+    pad = blocks * size - m
+    if pad:
+        M = np.concatenate([M, np.broadcast_to(_IDENTITY, (pad, 2, 2))])
+    Q = M.reshape(blocks, size, 2, 2).copy()
+    for j in range(1, size):
+        Q[:, j] = _product(Q[:, j - 1], Q[:, j], op)
+
+    starts = np.empty((blocks, 2))
+    for k in range(blocks):
+        starts[k] = v
+        v = _apply(v, Q[k, -1], op)
+
+    V = _apply(starts[:, None, :], Q, op)
+    out[1:] = V.reshape(-1, 2)[:m]
+    return out
+
+def _transitions(x, lo, hi, log_trans):
+    # 2x2 log transition blocks into positions lo..hi-1 (lo >= 1)
+    prev = x[lo - 1:hi - 1, None, None] + np.array([0, 4])[None, :, None]
+    cur = x[lo:hi, None, None] + np.array([0, 4])[None, None, :]
+    return log_trans[prev, cur]
+
+# ---------------- Decoding ----------------
+
+def _decode_run(x, hmm, op, chunk, out):
+    log_start, log_trans = hmm
+    n = len(x)
+    starts = range(0, n, chunk)
+
+    checkpoints = []
+    a = log_start[[x[0], x[0] + 4]]
+    for s in starts:
+        checkpoints.append(a)
+        e = min(s + chunk, n)
+        if e < n:
+            a = _apply(a, _total(_transitions(x, s + 1, e + 1, log_trans), op), op)
+
+    b = np.zeros(2)
+    for s, a in zip(reversed(starts), reversed(checkpoints)):
+        e = min(s + chunk, n)
+        fwd = _propagate(a, _transitions(x, s + 1, e, log_trans), op)
+        back = _transitions(x, max(s, 1), e, log_trans)[::-1].transpose(0, 2, 1)
+        bwd = _propagate(b, back, op)
+        b = bwd[e - s] if s else b
+        score = fwd + bwd[:e - s][::-1]
+        if op is np.maximum:
+            out[s:e] = score[:, 0] >= score[:, 1]
+        else:
+            out[s:e] = 1.0 / (1.0 + np.exp(score[:, 1] - score[:, 0]))
+
+def _decode(seq, hmm, op, dtype, chunk):
+    hmm = build_hmm() if hmm is None else hmm
+    codes = encode_bases(seq).astype(np.intp)
+    out = np.zeros(len(codes), dtype=dtype)
+
+    # N runs split the sequence; they are reported as non-island
+    valid = np.r_[False, codes < UNKNOWN, False]
+    edges = np.flatnonzero(np.diff(valid.astype(np.int8)))
+    with instrument.span("cpg_hmm", length=len(codes)):
+        for lo, hi in zip(edges[0::2], edges[1::2]):
+            _decode_run(codes[lo:hi], hmm, op, chunk, out[lo:hi])
+    if instrument.enabled():
+        instrument.count("bases_decoded", int(len(codes)))
+    return out
+
+def viterbi(seq, hmm=None, chunk=CHUNK):
+    """
+    Most probable state path as a uint8 track, 1 inside CpG islands.
+    The path is read off the max-marginals (forward ⊗ backward in the
+    max-plus semiring), which is the backtracked Viterbi path whenever
+    the best path is unique.
+    """
+    return _decode(seq, hmm, np.maximum, np.uint8, chunk)
+
+def posterior(seq, hmm=None, chunk=CHUNK):
+    """Posterior probability of being in a + state, per position (float32)."""
+    return _decode(seq, hmm, np.logaddexp, np.float32, chunk)
+
+def islands(track, threshold=0.5, min_length=1):
+    """Half-open (start, end) runs where track >= threshold."""
+    inside = np.r_[False, np.asarray(track) >= threshold, False]
+    edges = np.flatnonzero(np.diff(inside.astype(np.int8)))
+    return [(int(s), int(e)) for s, e in zip(edges[0::2], edges[1::2]) if e - s >= min_length]
+
+# ---------------- Many records ----------------
+
+def _segment_one(job):
+    header, seq, hmm, method, min_length, chunk = job
+    decode = viterbi if method == "viterbi" else posterior
+    return header, islands(decode(seq, hmm, chunk), min_length=min_length)
+
+def segment_records(records, hmm=None, method="viterbi", processes=None,
+                    min_length=1, chunk=CHUNK):
+    """
+    CpG islands of every (header, sequence) record as a list of
+    (header, [(start, end), ...]). Records are decoded in a process
+    pool, at most 2 * processes at a time; processes=1 decodes them in
+    this process.
+    """
+    if method not in ("viterbi", "posterior"):
+        raise ValueError("method must be 'viterbi' or 'posterior'")
+    hmm = build_hmm() if hmm is None else hmm
+    jobs = ((h, s, hmm, method, min_length, chunk) for h, s in records)
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        return [_segment_one(job) for job in jobs]
+    with ProcessPoolExecutor(processes) as pool:
+        return list(bounded_map(pool, _segment_one, jobs, 2 * processes))
@@ -0,0 +1,45 @@
+"""
+Score-track reduction for plotting.
+
+A line plot cannot show more distinct x positions than it has pixel
+columns, so long tracks are reduced to about the plot's pixel width
+before they reach matplotlib. That keeps render time independent of
+genome length while keeping peaks visible.
+"""
+import numpy as np
+
+
+def figure_width_px(fig):
+    return int(fig.get_figwidth() * fig.dpi)
+
+def minmax_envelope(x, y, n_columns):
+    """
+    Keeps the minimum and maximum point of each of n_columns equal
+    slices, in their original order: at most 2 * n_columns points, and
+    every peak and trough of the track survives.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if n_columns <= 0 or n <= 2 * n_columns:
+        return x, y
+
+    k = n // n_columns
+    body = y[:n_columns * k].reshape(n_columns, k)
+    imin = body.argmin(axis=1)
+    imax = body.argmax(axis=1)
+
+    base = np.arange(n_columns) * k
+    idx = [base + np.minimum(imin, imax), base + np.maximum(imin, imax)]
+
+    tail = y[n_columns * k:]
+    if len(tail):
+        start = n_columns * k
+        idx.append(np.array([start + tail.argmin(), start + tail.argmax()]))
+
+    idx = np.unique(np.concatenate(idx))
+    return x[idx], y[idx]
+
+def reduce_track(x, y, width_px):
+    """Reduces a score track to about width_px columns for plotting."""
+    return minmax_envelope(x, y, width_px)
@@ -0,0 +1,32 @@
+import numpy as np
+
+BASES = "ACGT"
+UNKNOWN = 4  # code for N and any other non-ACGT(U) character
+
+_LOOKUP = np.full(256, UNKNOWN, dtype=np.uint8)
+for _i, _b in enumerate(BASES):
+    _LOOKUP[ord(_b)] = _i
+    _LOOKUP[ord(_b.lower())] = _i
+# RNA: U is the same code as T, so codon tables work on either alphabet
+_LOOKUP[ord("U")] = _LOOKUP[ord("u")] = 3
+
+
+def encode_bases(seq):
+    """Maps a DNA or RNA string to uint8 codes A=0, C=1, G=2, T/U=3, other=4."""
+    if hasattr(seq, "codes"):  # PackedSequence
+        return seq.codes()
+    return _LOOKUP[np.frombuffer(seq.encode("ascii", "replace"), dtype=np.uint8)]
+
+def concat_encoded(seqs):
+    """
+    Encodes several sequences into one array so they can be scanned in
+    a single vectorized pass. Returns (codes, offsets) where sequence i
+    occupies codes[offsets[i]:offsets[i + 1]].
+    """
+    lengths = [len(s) for s in seqs]
+    offsets = np.zeros(len(seqs) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if all(isinstance(s, str) for s in seqs):
+        return encode_bases("".join(seqs)), offsets
+    codes = [encode_bases(s) for s in seqs]
+    return np.concatenate(codes) if codes else np.zeros(0, np.uint8), offsets
@@ -0,0 +1,121 @@
+"""
+FASTA input. Plain, gzip (.gz, streamed) and BGZF (.bgz / bgzip output,
+inflated block-parallel) files are all accepted by every reader; the
+format is detected from the magic bytes, not the file name.
+"""
+import gzip
+
+
+def is_gzip(file_path):
+    with open(file_path, "rb") as f:
+        return f.read(2) == b"\x1f\x8b"
+
+def open_fasta(file_path):
+    """Opens a plain, gzip or BGZF FASTA file for text reading."""
+    if not is_gzip(file_path):
+        return open(file_path, "r")
+
+    from . import bgzf
+    if bgzf.is_bgzf(file_path):
+        return bgzf.open_bgzf_text(file_path)
+    return gzip.open(file_path, "rt", encoding="ascii")
+
+def read_fasta(file_path):
+    """Reads all records of a FASTA file into one upper-case sequence."""
+    with open_fasta(file_path) as f:
+        seq = "".join(line.strip() for line in f if not line.startswith(">"))
+    return seq.upper()
+
+def read_fasta_records(file_path):
+    """Yields (header, upper-case sequence) for every record of a FASTA file."""
+    header, lines = None, []
+    with open_fasta(file_path) as f:
+        for line in f:
+            if line.startswith(">"):
+                if header is not None:
+                    yield header, "".join(lines).upper()
+                header, lines = line[1:].strip(), []
+            else:
+                lines.append(line.strip())
+    if header is not None:
+        yield header, "".join(lines).upper()
+
+
+# ---------------- indexed region fetches ----------------
+
+def build_fai(file_path):
+    """
+    samtools-style index {name: (length, offset, line_bases, line_width)},
+    with offsets into the uncompressed text.
+    """
+    from . import bgzf
+
+    if bgzf.is_bgzf(file_path):
+        f = bgzf.open_bgzf(file_path)
+    elif is_gzip(file_path):
+        raise ValueError("Indexing needs BGZF (bgzip) compression, not plain gzip")
+    else:
+        f = open(file_path, "rb")
+
+    index = {}
+    offset = 0
+    name = None
+    with f:
+        for line in f:
+            if line.startswith(b">"):
+                name = line[1:].split()[0].decode("ascii")
+                index[name] = [0, offset + len(line), 0, 0]
+            elif name is not None:
+                entry = index[name]
+                bases = len(line.rstrip(b"\r\n"))
+                if entry[2] == 0:
+                    entry[2], entry[3] = bases, len(line)
+                entry[0] += bases
+            offset += len(line)
+
+    return {name: tuple(entry) for name, entry in index.items()}
+
+def load_fai(file_path):
+    """Reads file_path + ".fai" when present, otherwise builds the index."""
+    try:
+        with open(file_path + ".fai", "r") as f:
+            index = {}
+            for line in f:
+                name, length, offset, line_bases, line_width = line.split("\t")[:5]
+                index[name] = (int(length), int(offset), int(line_bases), int(line_width))
+            return index
+    except FileNotFoundError:
+        return build_fai(file_path)
+
+def write_fai(file_path, index=None):
+    index = index or build_fai(file_path)
+    with open(file_path + ".fai", "w") as f:
+        for name, (length, offset, line_bases, line_width) in index.items():
+            f.write(f"{name}\t{length}\t{offset}\t{line_bases}\t{line_width}\n")
+
+def fetch_region(file_path, name, start, end, fai=None, block_index=None):
+    """
+    Upper-case bases [start, end) (0-based) of record `name`. BGZF files
+    only inflate the blocks holding the region.
+    """
+    from . import bgzf
+
+    length, offset, line_bases, line_width = (fai or load_fai(file_path))[name]
+    start, end = max(0, start), min(end, length)
+    if start >= end:
+        return ""
+
+    def byte_offset(pos):
+        return offset + (pos // line_bases) * line_width + pos % line_bases
+
+    lo, hi = byte_offset(start), byte_offset(end - 1) + 1
+    if bgzf.is_bgzf(file_path):
+        data = bgzf.read_range(file_path, lo, hi, block_index)
+    elif is_gzip(file_path):
+        raise ValueError("Region fetches need BGZF (bgzip) compression, not plain gzip")
+    else:
+        with open(file_path, "rb") as f:
+            f.seek(lo)
+            data = f.read(hi - lo)
+
+    return data.replace(b"\n", b"").replace(b"\r", b"").decode("ascii").upper()
@@ -0,0 +1,178 @@
+"""
+Lightweight run instrumentation: named spans, counters and tracemalloc
+peaks, off by default.
+
+    from bioinfo import instrument
+
+    instrument.enable(memory=True)
+    with instrument.span("scan"):
+        ...
+        instrument.count("windows_scored", n)
+    instrument.dump_chrome_trace("run.trace.json")
+
+While disabled, span() returns a shared no-op context manager and count()
+returns immediately, so the hooks can stay in production code. Setting
+BIOINFO_TRACE=<path> enables tracing for the whole process and writes a
+Chrome trace (chrome://tracing, Perfetto) to <path> at exit.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+
+_enabled = False
+_memory = False
+_events = []
+_counters = defaultdict(int)
+_lock = threading.Lock()
+_local = threading.local()
+_NULL = nullcontext()
+
+# tracemalloc and json are imported on first use to keep this module cheap
+# to import from the core analysis code
+tracemalloc = None
+
+
+def enable(memory=False):
+    """Starts recording; memory=True also tracks tracemalloc peaks per span."""
+    global _enabled, _memory, tracemalloc
+    _enabled = True
+    _memory = memory
+    if memory and tracemalloc is None:
+        import tracemalloc
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def disable():
+    global _enabled, _memory
+    _enabled = False
+    if _memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _memory = False
+
+def enabled():
+    return _enabled
+
+def reset():
+    with _lock:
+        _events.clear()
+        _counters.clear()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start", "outer_peak", "child_peak")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        if _memory:
+            # tracemalloc has a single (process-wide) peak: remember the
+            # enclosing span's peak so far and measure this span from zero
+            stack = _span_stack()
+            self.outer_peak = tracemalloc.get_traced_memory()[1]
+            self.child_peak = 0
+            tracemalloc.reset_peak()
+            stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        event = {
+            "name": self.name,
+            "start_ns": self.start,
+            "dur_ns": end - self.start,
+            "tid": threading.get_ident(),
+        }
+        if self.args:
+            event["args"] = self.args
+        if _memory:
+            stack = _span_stack()
+            stack.pop()
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            event["peak_bytes"] = peak
+            if stack:
+                parent = stack[-1]
+                parent.child_peak = max(parent.child_peak, self.outer_peak, peak)
+        with _lock:
+            _events.append(event)
+        return False
+
+def _span_stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def span(name, **args):
+    """Context manager timing one named stage of a run."""
+    if not _enabled:
+        return _NULL
+    return _Span(name, args)
+
+def count(name, n=1):
+    """Adds n to a named counter (bases processed, windows scored, ...)."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] += n
+
+
+def summary():
+    """Per-span-name totals plus the counters, as plain dicts."""
+    spans = {}
+    with _lock:
+        events = list(_events)
+        counters = dict(_counters)
+
+    for e in events:
+        s = spans.setdefault(e["name"], {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        ms = e["dur_ns"] / 1e6
+        s["calls"] += 1
+        s["total_ms"] += ms
+        s["max_ms"] = max(s["max_ms"], ms)
+        if "peak_bytes" in e:
+            s["peak_bytes"] = max(s.get("peak_bytes", 0), e["peak_bytes"])
+
+    return {"spans": spans, "counters": counters}
+
+def dump_json(path):
+    import json
+    with open(path, "w") as f:
+        json.dump(summary(), f, indent=4)
+
+def dump_chrome_trace(path):
+    """Writes the spans as Chrome trace-event JSON, counters as metadata."""
+    import json
+
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        counters = dict(_counters)
+
+    trace = []
+    for e in events:
+        args = dict(e.get("args", {}))
+        if "peak_bytes" in e:
+            args["peak_bytes"] = e["peak_bytes"]
+        trace.append({
+            "name": e["name"],
+            "ph": "X",
+            "ts": e["start_ns"] / 1000,
+            "dur": e["dur_ns"] / 1000,
+            "pid": pid,
+            "tid": e["tid"],
+            "args": args,
+        })
+
+    with open(path, "w") as f:
+        json.dump({"traceEvents": trace, "otherData": {"counters": counters}}, f)
+
+
+if os.environ.get("BIOINFO_TRACE"):
+    enable(memory=bool(os.environ.get("BIOINFO_TRACE_MEMORY")))
+    atexit.register(dump_chrome_trace, os.environ["BIOINFO_TRACE"])
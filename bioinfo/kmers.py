@@ -0,0 +1,263 @@
+"""
+Overlapping k-mer counting (k <= 31) on 2-bit integer codes.
+
+Every window is one uint64 (first base in the high bits), built for a
+whole chunk at once by doubling: windows of length 2s are two shifted
+windows of length s, so a k-mer array costs about 2 log2(k) vectorized
+passes instead of k. Canonical (strand-merged) k-mers take the smaller of
+a k-mer and its reverse complement, computed with bit swaps. k <= DENSE_K
+counts into a dense 4**k array with bincount; larger k sorts each chunk
+(np.unique) and merges the sorted runs. Counts of several records or
+files combine with merge() and round-trip through .npz files, so counts
+can be built in parallel or incrementally and merged later.
+k=3, step=3 gives the frame-0 codon counts behind codons.codon_count.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .encoding import BASES, UNKNOWN, encode_bases
+from .pipeline import bounded_map
+
+DENSE_K = 11        # 4**11 int64 counters = 32 MB
+CHUNK = 1 << 22     # bases encoded and counted at a time
+MAX_K = 31
+
+_M1 = np.uint64(0x3333333333333333)
+_M2 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_ALL = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _check_k(k):
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+
+def _dtype(span):
+    # narrowest unsigned type holding 2 * span bits: short windows move less memory
+    return np.uint8 if span <= 4 else np.uint16 if span <= 8 else np.uint32 if span <= 16 else np.uint64
+
+def _combine(a, span_a, b, span_b):
+    # windows of a followed by windows of b, length span_a + span_b
+    dtype = _dtype(span_a + span_b)
+    m = len(b) - span_a
+    out = a[:m].astype(dtype)
+    out <<= dtype(2 * span_b)
+    out |= b[span_a:span_a + m]
+    return out
+
+def kmer_values(codes, k):
+    """
+    Every overlapping k-mer of 0-4 codes as uint64 (len(codes) - k + 1
+    values) and a mask of the windows without an N.
+    """
+    _check_k(k)
+    codes = np.asarray(codes, dtype=np.uint8)
+    n = len(codes) - k + 1
+    if n <= 0:
+        return np.zeros(0, np.uint64), np.zeros(0, bool)
+
+    piece, span = codes & 3, 1
+    out, width = None, 0
+    while True:
+        if k & span:
+            out, width = (piece, span) if out is None else (_combine(out, width, piece, span), width + span)
+        if 2 * span > k:
+            break
+        piece, span = _combine(piece, span, piece, span), 2 * span
+
+    out = out[:n].astype(np.uint64, copy=False)
+    is_n = codes == UNKNOWN
+    if not is_n.any():
+        return out, np.ones(n, dtype=bool)
+    unknown = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(is_n, out=unknown[1:])
+    return out, unknown[k:] == unknown[:n]
+
+def reverse_complement(values, k):
+    """Reverse complements of 2-bit k-mers (complement is x ^ 3 per base)."""
+    # complement, swap bases within nibbles, nibbles within bytes, then bytes
+    x = np.bitwise_xor(values, _ALL, dtype=np.uint64)
+    t = np.empty_like(x)
+    for shift, mask in ((np.uint64(2), _M1), (np.uint64(4), _M2)):
+        np.right_shift(x, shift, out=t)
+        t &= mask
+        x &= mask
+        x <<= shift
+        x |= t
+    x.byteswap(inplace=True)
+    x >>= np.uint64(64 - 2 * k)
+    return x
+
+def canonicalize(values, k):
+    """Smaller of each k-mer and its reverse complement."""
+    rc = reverse_complement(values, k)
+    return np.minimum(values, rc, out=rc)
+
+def decode(value, k):
+    value = int(value)
+    return "".join(BASES[(value >> 2 * (k - 1 - j)) & 3] for j in range(k))
+
+def encode(kmer):
+    value = 0
+    for c in kmer.upper():
+        value = (value << 2) | BASES.index(c)
+    return value
+
+
+class KmerCounts:
+    """Sorted distinct k-mers (uint64) and their int64 counts."""
+
+    def __init__(self, k, kmers=None, counts=None, canonical=False):
+        _check_k(k)
+        self.k = k
+        self.canonical = canonical
+        self.kmers = np.zeros(0, np.uint64) if kmers is None else np.asarray(kmers, dtype=np.uint64)
+        self.counts = np.zeros(0, np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.kmers)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def __getitem__(self, kmer):
+        value = encode(kmer) if isinstance(kmer, str) else kmer
+        if self.canonical:
+            value = int(canonicalize(np.array([value], np.uint64), self.k)[0])
+        i = np.searchsorted(self.kmers, np.uint64(value))
+        return int(self.counts[i]) if i < len(self) and self.kmers[i] == value else 0
+
+    def merge(self, *others):
+        """Counts of this and other KmerCounts with the same k and strand mode."""
+        for other in others:
+            if (other.k, other.canonical) != (self.k, self.canonical):
+                raise ValueError("Cannot merge counts of different k or strand mode")
+        return _merge_sorted(self.k, self.canonical, [self, *others])
+
+    def most_common(self, n=None):
+        """[(k-mer string, count), ...] by decreasing count."""
+        n = len(self) if n is None else min(n, len(self))
+        top = np.argsort(-self.counts, kind="stable")[:n]
+        return [(decode(self.kmers[i], self.k), int(self.counts[i])) for i in top]
+
+    def to_dict(self):
+        return {decode(v, self.k): int(c) for v, c in zip(self.kmers, self.counts)}
+
+    def containment(self, other):
+        """Fraction of this spectrum's distinct k-mers also present in other."""
+        if not len(self):
+            return 0.0
+        shared = np.intersect1d(self.kmers, other.kmers, assume_unique=True)
+        return len(shared) / len(self)
+
+    def jaccard(self, other):
+        shared = len(np.intersect1d(self.kmers, other.kmers, assume_unique=True))
+        union = len(self) + len(other) - shared
+        return shared / union if union else 0.0
+
+    def save(self, path):
+        np.savez(path, k=self.k, canonical=self.canonical, kmers=self.kmers, counts=self.counts)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(int(data["k"]), data["kmers"], data["counts"], bool(data["canonical"]))
+
+
+def _runs(k, canonical, values):
+    # sort-and-run-length: the chunk's distinct k-mers and their counts
+    if not len(values):  # all-N chunk, or a long N gap
+        return KmerCounts(k, canonical=canonical)
+    values = np.sort(values.astype(_dtype(k), copy=False))
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    counts = np.diff(np.r_[starts, len(values)])
+    return KmerCounts(k, values[starts], counts, canonical)
+
+def _merge_sorted(k, canonical, parts):
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return KmerCounts(k, canonical=canonical)
+    if len(parts) == 1:
+        return KmerCounts(k, parts[0].kmers, parts[0].counts, canonical)
+    kmers = np.concatenate([p.kmers for p in parts])
+    counts = np.concatenate([p.counts for p in parts])
+    order = np.argsort(kmers, kind="stable")
+    kmers, counts = kmers[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, kmers[1:] != kmers[:-1]])
+    return KmerCounts(k, kmers[starts], np.add.reduceat(counts, starts), canonical)
+
+def _chunks(seq, k, chunk):
+    # code chunks overlapping by k - 1 bases, so no window is lost or doubled
+    n = len(seq)
+    packed = hasattr(seq, "codes")
+    codes = None if packed else encode_bases(seq)
+    for start in range(0, max(n - k + 1, 0), chunk):
+        stop = min(start + chunk + k - 1, n)
+        yield start, (seq.codes(start, stop) if packed else codes[start:stop])
+
+def count_kmers(seq, k, canonical=False, step=1, frame=0, chunk=CHUNK):
+    """
+    KmerCounts of the overlapping k-mers of a str or PackedSequence,
+    skipping windows with an N. step/frame keep only windows starting at
+    frame, frame + step, ... (k=3, step=3 counts codons).
+    """
+    _check_k(k)
+    dense = np.zeros(4 ** k, dtype=np.int64) if k <= DENSE_K else None
+    parts = []
+    for start, codes in _chunks(seq, k, chunk):
+        values, valid = kmer_values(codes, k)
+        if step > 1:
+            first = (frame - start) % step
+            values, valid = values[first::step], valid[first::step]
+        if not valid.all():
+            values = values[valid]
+        if canonical:
+            values = canonicalize(values, k)
+        if dense is not None:
+            dense += np.bincount(values.astype(np.intp), minlength=len(dense))
+        else:
+            parts.append(_runs(k, canonical, values))
+
+    if dense is not None:
+        kmers = np.flatnonzero(dense)
+        return KmerCounts(k, kmers, dense[kmers], canonical)
+    return _merge_sorted(k, canonical, parts)
+
+def _count_one(job):
+    seq, k, canonical, step, frame, chunk = job
+    return count_kmers(seq, k, canonical, step, frame, chunk)
+
+def count_records(records, k, canonical=False, processes=None, step=1, frame=0, chunk=CHUNK):
+    """
+    Merged KmerCounts of many (header, sequence) records, counted in a
+    process pool; processes=1 counts them in this process. At most
+    2 * processes records are in flight, and partial counts are merged
+    as they come back, so memory does not grow with the number of records.
+    """
+    jobs = ((s, k, canonical, step, frame, chunk) for _, s in records)
+    processes = processes or os.cpu_count() or 1
+    window = 2 * processes
+    if processes == 1:
+        return _merge_batches(k, canonical, map(_count_one, jobs), window)
+    with ProcessPoolExecutor(processes) as pool:
+        return _merge_batches(k, canonical, bounded_map(pool, _count_one, jobs, window), window)
+
+def _merge_batches(k, canonical, parts, batch):
+    merged, pending = KmerCounts(k, canonical=canonical), []
+    for part in parts:
+        pending.append(part)
+        if len(pending) >= batch:
+            merged, pending = _merge_sorted(k, canonical, [merged, *pending]), []
+    return _merge_sorted(k, canonical, [merged, *pending])
+
+def merge_files(paths, out=None):
+    """Merges saved .npz counts; writes them to `out` when given."""
+    parts = [KmerCounts.load(p) for p in paths]
+    if not parts:
+        raise ValueError("No count files to merge")
+    merged = parts[0].merge(*parts[1:])
+    if out is not None:
+        merged.save(out)
+    return merged
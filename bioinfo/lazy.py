@@ -0,0 +1,45 @@
+"""
+Deferred imports for the heavy plotting / table libraries.
+
+matplotlib and pandas each add hundreds of milliseconds to interpreter
+startup, so modules fetch them through these helpers at first use
+instead of importing them at the top.
+"""
+import os
+import sys
+
+
+def is_headless():
+    if os.environ.get("BIOINFO_HEADLESS"):
+        return True
+    if sys.platform.startswith(("win", "darwin")):
+        return False
+    return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+def pyplot(headless=None):
+    """
+    Returns matplotlib.pyplot, switching to the Agg backend first when
+    there is no display (or when headless=True, e.g. for web apps that
+    only save figures). An explicit MPLBACKEND always wins.
+    """
+    if "matplotlib.pyplot" not in sys.modules:
+        import matplotlib
+        if headless is None:
+            headless = is_headless()
+        if headless and not os.environ.get("MPLBACKEND"):
+            matplotlib.use("Agg")
+
+    import matplotlib.pyplot as plt
+    return plt
+
+def pandas():
+    import pandas as pd
+    return pd
+
+def figure(**kwargs):
+    """
+    A standalone matplotlib Figure, not registered with pyplot. Unlike the
+    pyplot state machine these are safe to build in concurrent threads.
+    """
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
@@ -0,0 +1,142 @@
+import random
+import string
+
+NUCLEOTIDES = ["A", "C", "G", "T"]
+
+STOP_WORDS = {
+    "the", "is", "a", "an", "to", "of", "and", "in", "on", "for", "with",
+    "this", "that", "it", "as", "be", "are", "was", "were", "by", "or",
+    "from", "at", "which", "its"
+}
+
+
+def parse_matrix(text):
+    rows = text.strip().split("\n")
+    return [list(map(float, row.split())) for row in rows]
+
+def parse_vector(text):
+    return list(map(float, text.split()))
+
+def transpose(A):
+    return list(map(list, zip(*A)))
+
+def multiply(A, x):
+    return [
+        sum(A[i][j] * x[j] for j in range(len(x)))
+        for i in range(len(A))
+    ]
+
+def compute_transition_matrix(sequence):
+    sequence = sequence.upper()
+
+    counts = {
+        a: {b: 0 for b in NUCLEOTIDES}
+        for a in NUCLEOTIDES
+    }
+
+    for i in range(len(sequence) - 1):
+        a = sequence[i]
+        b = sequence[i + 1]
+        counts[a][b] += 1
+
+    matrix = {}
+    for a in NUCLEOTIDES:
+        total = sum(counts[a].values())
+        if total == 0:
+            matrix[a] = {b: 0.0 for b in NUCLEOTIDES}
+        else:
+            matrix[a] = {
+                b: counts[a][b] / total
+                for b in NUCLEOTIDES
+            }
+
+    return matrix
+
+def tokenize(text):
+    text = text.lower()
+    for ch in string.punctuation:
+        text = text.replace(ch, " ")
+    return [w for w in text.split() if w and w not in STOP_WORDS]
+
+def build_model(words):
+    word_to_id = {}
+    id_to_word = {}
+
+    for w in words:
+        if w not in word_to_id:
+            idx = len(word_to_id)
+            word_to_id[w] = idx
+            id_to_word[idx] = w
+
+    n = len(word_to_id)
+
+    counts = {i: {} for i in range(n)}
+
+    for i in range(len(words) - 1):
+        a = word_to_id[words[i]]
+        b = word_to_id[words[i + 1]]
+        counts[a][b] = counts[a].get(b, 0) + 1
+
+    matrix = {}
+    for i in counts:
+        total = sum(counts[i].values())
+        matrix[i] = {
+            j: counts[i][j] / total
+            for j in counts[i]
+        } if total > 0 else {}
+
+    return word_to_id, id_to_word, matrix
+
+def weighted_choice(prob_map):
+    r = random.random()
+    acc = 0.0
+    for k, p in prob_map.items():
+        acc += p
+        if r <= acc:
+            return k
+    return next(iter(prob_map))
+
+def generate_dna(model, length, start=""):
+    """Walks a nucleotide model ({"A": {"A": p, ...}, ...}) for `length` bases."""
+    states = list(model.keys())
+
+    if start == "":
+        start = random.choice(states)
+    if start not in model:
+        raise ValueError("Invalid start symbol for DNA")
+
+    seq = [start]
+    cur = start
+    for _ in range(length - 1):
+        cur = weighted_choice(model[cur])
+        seq.append(cur)
+
+    return "".join(seq)
+
+def generate_text(model, length, start_word=""):
+    """Walks a word model as saved by ex3_lab13.py for `length` words."""
+    word_to_id = model["word_to_id"]
+    id_to_word = {int(k): v for k, v in model["id_to_word"].items()}
+    transition = {
+        int(k): {int(j): p for j, p in v.items()}
+        for k, v in model["transition_matrix"].items()
+    }
+
+    if start_word:
+        if start_word not in word_to_id:
+            raise ValueError("Start word not in model")
+        cur = int(word_to_id[start_word])
+    else:
+        cur = random.choice([i for i in transition if transition[i]])
+
+    words = [id_to_word[cur]]
+
+    for _ in range(length - 1):
+        row = transition.get(cur, {})
+        if not row:
+            cur = random.choice([i for i in transition if transition[i]])
+        else:
+            cur = weighted_choice(row)
+        words.append(id_to_word[cur])
+
+    return " ".join(words)
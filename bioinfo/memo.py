@@ -0,0 +1,120 @@
+"""
+Bounded LRU memo cache for repeated app requests.
+
+Keys pair a content digest (the sequence or uploaded file bytes) with a
+fingerprint of everything else the result depends on (motif set,
+pseudocount, bin size, window/step, ...), so a changed parameter never
+returns a stale result. Entries are evicted least-recently-used first
+once their estimated size exceeds the byte budget.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from . import instrument
+
+DEFAULT_MAX_BYTES = 256 << 20
+_READ_SIZE = 1 << 20
+
+
+def content_digest(data):
+    """blake2b hex digest of a str or bytes value."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def fingerprint(**params):
+    """Stable digest of the parameters a cached result depends on."""
+    text = json.dumps(params, sort_keys=True, default=repr)
+    return content_digest(text)
+
+def sizeof(value):
+    """Rough size in bytes of a cached value (arrays, frames, str, containers)."""
+    if hasattr(value, "nbytes"):  # numpy arrays, ScanResult columns
+        return int(value.nbytes)
+    if hasattr(value, "memory_usage"):  # pandas DataFrame
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sum(sizeof(v) for v in value.values())
+    if hasattr(value, "positions") and hasattr(value, "scores"):
+        return sizeof(value.positions) + sizeof(value.scores) + sizeof(getattr(value, "sequence", None))
+    return 64
+
+
+class MemoCache:
+    """Thread-safe LRU of (digest, fingerprint) -> value with a byte budget."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, name="memo"):
+        self.max_bytes = max_bytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        instrument.count(f"{self.name}_miss" if entry is None else f"{self.name}_hit")
+        return default if entry is None else entry[0]
+
+    def put(self, key, value, nbytes=None):
+        nbytes = sizeof(value) if nbytes is None else nbytes
+        if nbytes > self.max_bytes:
+            return value
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, size) = self._entries.popitem(last=False)
+                self.nbytes -= size
+                self.evictions += 1
+        return value
+
+    def discard(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.nbytes -= entry[1]
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "entries": len(self._entries), "bytes": self.nbytes, "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,98 @@
+from . import instrument
+
+motif = "AGGTAAAGT"
+L = len(motif)
+bases = ["A", "C", "G", "T"]
+BIN_SIZE = 100  # netezire semnal
+
+
+def score_window(window):
+    return sum(1 if w == m else -1 for w, m in zip(window, motif))
+
+def scan_genome(seq):
+    positions, scores = [], []
+    for i in range(len(seq) - L + 1):
+        window = seq[i:i + L]
+        if any(b not in bases for b in window):
+            continue
+        positions.append(i)
+        scores.append(score_window(window))
+    return positions, scores
+
+def bin_scores(positions, scores, bin_size=BIN_SIZE):
+    """Smooths a score track into per-bin means; returns (positions, means)."""
+    binned_pos = []
+    binned_scores = []
+    for i in range(0, len(scores), bin_size):
+        chunk = scores[i:i + bin_size]
+        if chunk:
+            binned_scores.append(sum(chunk) / len(chunk))
+            binned_pos.append(positions[i])
+    return binned_pos, binned_scores
+
+def scan_genomes(seqs):
+    """
+    Vectorized scan_genome over several sequences at once.
+    Returns one (positions, scores) pair of int arrays per sequence,
+    skipping windows that contain non-ACGT bases like scan_genome.
+    """
+    import numpy as np
+    from .encoding import UNKNOWN, concat_encoded, encode_bases
+
+    codes, offsets = concat_encoded(seqs)
+    target = encode_bases(motif)
+    n = len(codes) - L + 1
+    if n <= 0:
+        return [(np.empty(0, np.int64), np.empty(0, np.int64)) for _ in seqs]
+
+    matches = np.zeros(n, dtype=np.int64)
+    valid = np.ones(n, dtype=bool)
+    for j in range(L):
+        col = codes[j:j + n]
+        matches += col == target[j]
+        valid &= col != UNKNOWN
+    scores = 2 * matches - L
+
+    if instrument.enabled():
+        instrument.count("windows_scored", int(valid.sum()))
+        instrument.count("hits_emitted", int(((scores > 0) & valid).sum()))
+
+    results = []
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        stop = max(start, end - L + 1)
+        keep = np.flatnonzero(valid[start:stop])
+        results.append((keep, scores[start:stop][keep]))
+    return results
+
+def motif_matrix(motif=motif):
+    """
+    score_window as a (5, L) PWM over base codes: +1 match, -1 mismatch,
+    -inf for N, so pwm.score_codes gives the same scores and marks the
+    windows scan_genome skips.
+    """
+    import numpy as np
+    from .encoding import encode_bases
+
+    target = encode_bases(motif)
+    W = np.where(np.arange(4)[:, None] == target[None, :], 1.0, -1.0)
+    return np.vstack([W, np.full(len(motif), -np.inf)])
+
+def scan_genome_results(seqs, threshold=None, top_k=None):
+    """scan_genomes as one filtered, columnar ScanResult per sequence."""
+    from .scan_results import ScanResult
+
+    return [
+        ScanResult(seq, positions, scores, L).filter(threshold, top_k)
+        for seq, (positions, scores) in zip(seqs, scan_genomes(seqs))
+    ]
+
+def bin_scores_array(positions, scores, bin_size=BIN_SIZE):
+    """bin_scores for NumPy arrays."""
+    import numpy as np
+
+    starts = np.arange(0, len(scores), bin_size)
+    if len(starts) == 0:
+        return positions[:0], np.empty(0)
+    sums = np.add.reduceat(scores, starts)
+    counts = np.diff(np.append(starts, len(scores)))
+    return positions[starts], sums / counts
@@ -0,0 +1,228 @@
+"""
+2-bit packed nucleotide sequences.
+
+PackedSequence stores A/C/G/T as 2-bit codes, four bases per byte, with
+runs of N (or any other non-ACGT character) kept in a side list of
+[start, end) intervals. A 3 Gb genome therefore needs ~750 MB plus a few
+bytes per N run, instead of 3 GB or more as a Python str. The DNA/RNA
+distinction is only a flag: as_rna() returns a view over the same
+buffer, not a T->U copy.
+
+Ambiguity codes (R, Y, ...) and soft-masking (lower case) are not
+preserved; they read back as N and upper case.
+"""
+import numpy as np
+
+from .encoding import UNKNOWN, encode_bases
+from .fasta import open_fasta
+
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+_LETTERS = {
+    "DNA": np.frombuffer(b"ACGTN", dtype=np.uint8),
+    "RNA": np.frombuffer(b"ACGUN", dtype=np.uint8),
+}
+FASTA_CHUNK = 1 << 22  # bases read and packed at a time by read_fasta_packed
+
+
+def pack_codes(codes):
+    """Packs 0-3 codes (other values are stored as 0) four per byte."""
+    codes = np.asarray(codes, dtype=np.uint8) & 3
+    pad = (-len(codes)) % 4
+    if pad:
+        codes = np.concatenate([codes, np.zeros(pad, dtype=np.uint8)])
+    return np.bitwise_or.reduce(codes.reshape(-1, 4) << _SHIFTS, axis=1).astype(np.uint8)
+
+def unknown_runs(codes, offset=0):
+    """[start, end) intervals of UNKNOWN codes, shifted by offset."""
+    is_n = np.concatenate([[False], codes == UNKNOWN, [False]])
+    edges = np.flatnonzero(is_n[1:] != is_n[:-1])
+    return edges[0::2] + offset, edges[1::2] + offset
+
+
+class PackedSequence:
+    __slots__ = ("data", "length", "n_starts", "n_ends", "alphabet")
+
+    def __init__(self, data, length, n_starts=None, n_ends=None, alphabet="DNA"):
+        self.data = data
+        self.length = length
+        self.n_starts = np.zeros(0, np.int64) if n_starts is None else np.asarray(n_starts, np.int64)
+        self.n_ends = np.zeros(0, np.int64) if n_ends is None else np.asarray(n_ends, np.int64)
+        self.alphabet = alphabet
+
+    @classmethod
+    def from_codes(cls, codes, alphabet="DNA"):
+        starts, ends = unknown_runs(codes)
+        return cls(pack_codes(codes), len(codes), starts, ends, alphabet)
+
+    @classmethod
+    def from_string(cls, seq):
+        alphabet = "RNA" if "U" in seq or "u" in seq else "DNA"
+        if alphabet == "RNA":
+            seq = seq.replace("U", "T").replace("u", "t")
+        return cls.from_codes(encode_bases(seq), alphabet)
+
+    # ---------------- views ----------------
+
+    def as_rna(self):
+        return PackedSequence(self.data, self.length, self.n_starts, self.n_ends, "RNA")
+
+    def as_dna(self):
+        return PackedSequence(self.data, self.length, self.n_starts, self.n_ends, "DNA")
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.n_starts.nbytes + self.n_ends.nbytes
+
+    def __len__(self):
+        return self.length
+
+    # ---------------- decoding ----------------
+
+    def codes(self, start=0, stop=None):
+        """uint8 codes A=0, C=1, G=2, T/U=3, N=4 for [start, stop)."""
+        stop = self.length if stop is None else min(stop, self.length)
+        if start >= stop:
+            return np.zeros(0, dtype=np.uint8)
+
+        first, last = start // 4, (stop - 1) // 4 + 1
+        block = self.data[first:last]
+        codes = ((block[:, None] >> _SHIFTS) & 3).ravel()
+        codes = codes[start - 4 * first:stop - 4 * first]
+
+        # overwrite the N runs that overlap the range
+        lo = np.searchsorted(self.n_ends, start, side="right")
+        hi = np.searchsorted(self.n_starts, stop, side="left")
+        for s, e in zip(self.n_starts[lo:hi], self.n_ends[lo:hi]):
+            codes[max(s, start) - start:min(e, stop) - start] = UNKNOWN
+        return codes
+
+    def __str__(self):
+        return _LETTERS[self.alphabet][self.codes()].tobytes().decode("ascii")
+
+    def __repr__(self):
+        preview = str(self[:20]) + ("..." if self.length > 20 else "")
+        return f"PackedSequence({self.alphabet}, {self.length} bp, {preview!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedSequence):
+            return NotImplemented
+        return (self.length == other.length and self.alphabet == other.alphabet
+                and np.array_equal(self.codes(), other.codes()))
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += self.length
+            if not 0 <= key < self.length:
+                raise IndexError("PackedSequence index out of range")
+            return chr(_LETTERS[self.alphabet][self.codes(key, key + 1)[0]])
+
+        start, stop, step = key.indices(self.length)
+        if step == 1 and start % 4 == 0 and start < stop:
+            # byte-aligned: share the buffer, only the N runs are re-based
+            lo = np.searchsorted(self.n_ends, start, side="right")
+            hi = np.searchsorted(self.n_starts, stop, side="left")
+            starts = np.maximum(self.n_starts[lo:hi], start) - start
+            ends = np.minimum(self.n_ends[lo:hi], stop) - start
+            data = self.data[start // 4:(stop - 1) // 4 + 1]
+            return PackedSequence(data, stop - start, starts, ends, self.alphabet)
+
+        if step > 0:
+            codes = self.codes(start, stop)[::step] if start < stop else self.codes(0, 0)
+        else:
+            lo = stop + 1
+            codes = self.codes(lo, start + 1)[::-1][::-step] if lo <= start else self.codes(0, 0)
+        return PackedSequence.from_codes(codes, self.alphabet)
+
+    # ---------------- sequence operations ----------------
+
+    def reverse_complement(self):
+        codes = self.codes()[::-1]
+        # A<->T and C<->G are 3 - code; N stays N (the run list is rebuilt)
+        rc = np.where(codes == UNKNOWN, UNKNOWN, 3 - codes).astype(np.uint8)
+        return PackedSequence.from_codes(rc, self.alphabet)
+
+    def kmers(self, k, start=0, stop=None):
+        """
+        Overlapping k-mers (k <= 31) as 2-bit integers, first base in the
+        high bits. Returns (positions, values); windows touching an N
+        are left out.
+        """
+        if not 1 <= k <= 31:
+            raise ValueError("k must be between 1 and 31")
+        codes = self.codes(start, stop)
+        n = len(codes) - k + 1
+        if n <= 0:
+            return np.zeros(0, np.int64), np.zeros(0, np.uint64)
+
+        values = np.zeros(n, dtype=np.uint64)
+        valid = np.ones(n, dtype=bool)
+        for j in range(k):
+            col = codes[j:j + n]
+            values = (values << np.uint64(2)) | (col & 3).astype(np.uint64)
+            valid &= col != UNKNOWN
+
+        positions = np.flatnonzero(valid)
+        return positions + start, values[positions]
+
+    def codon_counts(self, frame=0):
+        """
+        Counts of the complete, N-free codons in reading frame `frame`,
+        as {codon string: count} in this sequence's alphabet.
+        """
+        codes = self.codes(frame)
+        n = len(codes) // 3
+        triplets = codes[:3 * n].reshape(n, 3)
+        ok = (triplets != UNKNOWN).all(axis=1)
+        index = triplets[ok].astype(np.int64) @ np.array([16, 4, 1])
+        counts = np.bincount(index, minlength=64)
+
+        letters = _LETTERS[self.alphabet].tobytes().decode("ascii")
+        return {
+            letters[i >> 4] + letters[(i >> 2) & 3] + letters[i & 3]: int(c)
+            for i, c in enumerate(counts) if c
+        }
+
+
+def read_fasta_packed(file_path):
+    """read_fasta, but streamed straight into a PackedSequence."""
+    parts, starts, ends = [], [], []
+    pending = np.zeros(0, dtype=np.uint8)
+    length = 0
+    buf = []
+    buffered = 0
+
+    def flush(final=False):
+        nonlocal pending, length
+        codes = np.concatenate([pending, encode_bases("".join(buf))])
+        buf.clear()
+        # pack whole bytes only; carry the last <4 codes to the next chunk
+        cut = len(codes) if final else len(codes) - len(codes) % 4
+        s, e = unknown_runs(codes[:cut], length)
+        starts.append(s)
+        ends.append(e)
+        parts.append(pack_codes(codes[:cut]))
+        length += cut
+        pending = codes[cut:]
+
+    with open_fasta(file_path) as f:
+        for line in f:
+            if line.startswith(">"):
+                continue
+            line = line.strip()
+            buf.append(line)
+            buffered += len(line)
+            if buffered >= FASTA_CHUNK:
+                flush()
+                buffered = 0
+    flush(final=True)
+
+    n_starts = np.concatenate(starts)
+    n_ends = np.concatenate(ends)
+    # merge N runs that were split across chunk boundaries
+    if len(n_starts) > 1:
+        keep = np.concatenate([[True], n_starts[1:] != n_ends[:-1]])
+        n_ends = n_ends[np.concatenate([keep[1:], [True]])]
+        n_starts = n_starts[keep]
+
+    return PackedSequence(np.concatenate(parts), length, n_starts, n_ends)
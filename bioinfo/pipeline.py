@@ -0,0 +1,103 @@
+"""
+Read-ahead pipeline for batch runs over many files.
+
+A reader thread loads (reads and parses) the next files while the caller
+computes on the current one, so disk and CPU work overlap and a run takes
+about max(I/O, compute) instead of their sum. At most `read_ahead` loaded
+items wait in memory: the reader stops when they are not consumed
+(backpressure), which caps memory at a few parsed genomes whatever the
+batch size. Results come back in input order.
+
+File reads, gzip/BGZF inflation and the numpy encoding release the GIL,
+which is what the reader thread overlaps with; compute stays in the
+calling thread unless compute_workers > 1.
+"""
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import instrument
+
+READ_AHEAD = 2  # loaded items allowed to wait for compute
+
+_DONE = object()
+
+
+def prefetch(items, load, read_ahead=READ_AHEAD):
+    """
+    Yields (item, load(item)) in order, loading up to read_ahead items
+    ahead in a background thread. An exception raised by load is raised
+    here, at that item.
+    """
+    items = iter(items)
+    pending = deque()
+    with ThreadPoolExecutor(1, thread_name_prefix="read-ahead") as reader:
+        def fill():
+            while len(pending) < max(read_ahead, 1):
+                item = next(items, _DONE)
+                if item is _DONE:
+                    return
+                pending.append((item, reader.submit(load, item)))
+
+        try:
+            fill()
+            while pending:
+                item, future = pending.popleft()
+                with instrument.span("wait_io"):
+                    value = future.result()
+                fill()
+                yield item, value
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+def pipelined(items, load, compute, read_ahead=READ_AHEAD, compute_workers=1):
+    """
+    Yields compute(item, load(item)) for every item, in order, with the
+    loads running ahead of the computations. compute_workers > 1 runs
+    that many computations at once in threads (for numpy-heavy steps that
+    release the GIL); loaded items still wait in a bounded queue.
+    """
+    if compute_workers <= 1:
+        for item, value in prefetch(items, load, read_ahead):
+            yield compute(item, value)
+        return
+
+    running = deque()
+    slots = threading.BoundedSemaphore(compute_workers)
+
+    def task(item, value):
+        try:
+            return compute(item, value)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(compute_workers, thread_name_prefix="compute") as pool:
+        for item, value in prefetch(items, load, read_ahead):
+            slots.acquire()
+            running.append(pool.submit(task, item, value))
+            while running and running[0].done():
+                yield running.popleft().result()
+        while running:
+            yield running.popleft().result()
+
+def bounded_map(pool, fn, items, window):
+    """
+    Yields fn(item) for every item, in order, computed in an executor
+    (e.g. a ProcessPoolExecutor) with at most `window` calls submitted
+    and not yet yielded. Items are drawn from the iterator only as slots
+    free up, so a long record generator is never read (and pickled) ahead
+    of the results.
+    """
+    items = iter(items)
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= max(window, 1):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,205 @@
+import json
+import operator
+
+import numpy as np
+
+# ---------------- Dense chains ----------------
+# Distributions are row vectors: x_{t+1} = x_t A, which is the same as
+# markov.multiply(transpose(A), x) but needs no explicit transpose.
+
+def check_chain(A, x):
+    A = np.asarray(A, dtype=float)
+    x = np.asarray(x, dtype=float)
+
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Matrix must be square")
+    if x.shape[-1] != A.shape[0]:
+        raise ValueError("Vector size must match matrix size")
+
+    return A, x
+
+def check_steps(steps):
+    steps = operator.index(steps)  # np.int64 too; 2.0 is a TypeError
+    if steps < 0:
+        raise ValueError("Number of steps must be non-negative")
+    return steps
+
+def matrix_power(A, k):
+    # repeated squaring: O(n^3 log k) instead of k matrix products
+    result = np.eye(A.shape[0])
+    base = A
+    while k > 0:
+        if k & 1:
+            result = result @ base
+        k >>= 1
+        if k:
+            base = base @ base
+    return result
+
+def predict_steps(A, x, steps):
+    """
+    Returns the distribution(s) after `steps` transitions.
+    x can be one vector or a (batch, n) stack of initial vectors,
+    which are all propagated with a single matrix-matrix product.
+    """
+    A, x = check_chain(A, x)
+    steps = check_steps(steps)
+
+    n = A.shape[0]
+    batch = 1 if x.ndim == 1 else x.shape[0]
+
+    # k matvecs cost k*batch*n^2, squaring costs ~log2(k)*n^3
+    if steps * batch > n * max(1, steps.bit_length()):
+        return x @ matrix_power(A, steps)
+
+    for _ in range(steps):
+        x = x @ A
+    return x
+
+def predict_trajectory(A, x, steps):
+    """Yields (step, distribution) for every step from 1 to `steps`."""
+    A, x = check_chain(A, x)
+    steps = check_steps(steps)
+    for step in range(1, steps + 1):
+        x = x @ A
+        yield step, x
+
+def stationary_distribution(A, tol=1e-12, max_iter=10000):
+    """
+    Stationary distribution pi with pi A = pi and sum(pi) = 1.
+    Dense matrices use a direct linear solve; scipy.sparse matrices
+    use power iteration.
+    """
+    if hasattr(A, "tocsr"):
+        return _stationary_power(A.tocsr(), tol, max_iter)
+
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    if A.ndim != 2 or A.shape[1] != n:
+        raise ValueError("Matrix must be square")
+
+    # (A^T - I) pi = 0, with one equation replaced by sum(pi) = 1
+    M = A.T - np.eye(n)
+    M[-1, :] = 1.0
+    b = np.zeros(n)
+    b[-1] = 1.0
+
+    try:
+        pi = np.linalg.solve(M, b)
+    except np.linalg.LinAlgError:
+        # reducible chain: no unique solution, take the least-squares one
+        pi = np.linalg.lstsq(M, b, rcond=None)[0]
+
+    pi = np.clip(pi, 0.0, None)
+    return pi / pi.sum()
+
+def _stationary_power(A, tol, max_iter):
+    n = A.shape[0]
+    AT = A.T.tocsr()
+    pi = np.full(n, 1.0 / n)
+
+    for _ in range(max_iter):
+        nxt = AT @ pi
+        nxt /= nxt.sum()
+        if np.abs(nxt - pi).sum() < tol:
+            return nxt
+        pi = nxt
+
+    raise ValueError(f"Power iteration did not converge in {max_iter} steps")
+
+# ---------------- Sparse word-level chains ----------------
+# Models saved by ex3_lab13.py have thousands of states but only a few
+# successors per word, so they are kept as CSR matrices.
+
+def load_transition_model(model):
+    """
+    Builds a sparse transition matrix from a word-level model.
+    `model` can be a JSON path, the dict saved by ex3_lab13.py or the
+    (word_to_id, id_to_word, matrix) tuple returned by build_model.
+    Returns (P, word_to_id, id_to_word) with P in CSR format.
+    """
+    from scipy import sparse
+
+    if isinstance(model, str):
+        with open(model, "r", encoding="utf-8") as f:
+            model = json.load(f)
+    if isinstance(model, dict):
+        model = (
+            model["word_to_id"],
+            model["id_to_word"],
+            model["transition_matrix"],
+        )
+
+    word_to_id, id_to_word, matrix = model
+    word_to_id = {w: int(i) for w, i in word_to_id.items()}
+    id_to_word = {int(i): w for i, w in id_to_word.items()}
+
+    rows, cols, probs = [], [], []
+    for i, row in matrix.items():
+        for j, p in row.items():
+            rows.append(int(i))
+            cols.append(int(j))
+            probs.append(p)
+
+    n = len(word_to_id)
+    P = sparse.csr_matrix((probs, (rows, cols)), shape=(n, n), dtype=float)
+    return P, word_to_id, id_to_word
+
+def start_vector(word_to_id, word):
+    if word not in word_to_id:
+        raise ValueError(f"Start word '{word}' not in model")
+    x = np.zeros(len(word_to_id))
+    x[word_to_id[word]] = 1.0
+    return x
+
+def truncate_top_k(x, k):
+    if np.count_nonzero(x) <= k:
+        return x
+    keep = np.argpartition(x, -k)[-k:]
+    out = np.zeros_like(x)
+    out[keep] = x[keep]
+    return out
+
+def sparse_trajectory(P, x, steps, top_k=None):
+    """
+    Yields (step, distribution) for a sparse chain.
+    With top_k set, only the k most likely states are kept after every
+    step, and the next step only touches the rows of those states.
+    Mass lost to words without successors is renormalized away.
+    """
+    P = P.tocsr()
+    x = np.asarray(x, dtype=float)
+    if x.shape != (P.shape[0],):
+        raise ValueError("Vector size must match matrix size")
+    steps = check_steps(steps)
+
+    PT = None
+    for step in range(1, steps + 1):
+        active = np.flatnonzero(x)
+        if top_k is not None and len(active) <= top_k:
+            x = P[active].T @ x[active]
+        else:
+            if PT is None:
+                PT = P.T.tocsr()
+            x = PT @ x
+
+        if top_k is not None:
+            x = truncate_top_k(x, top_k)
+
+        total = x.sum()
+        if total == 0:
+            raise ValueError(f"Chain has no outgoing transitions at step {step}")
+        x /= total
+
+        yield step, x
+
+def sparse_predict(P, x, steps, top_k=None):
+    for _, x in sparse_trajectory(P, x, steps, top_k):
+        pass
+    return x
+
+def top_states(x, id_to_word, k=5):
+    k = min(k, np.count_nonzero(x))
+    best = np.argpartition(x, -k)[-k:] if k else []
+    best = sorted(best, key=lambda i: -x[i])
+    return [(id_to_word[int(i)], float(x[i])) for i in best]
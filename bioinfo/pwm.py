@@ -0,0 +1,229 @@
+from math import log
+
+motifs = [
+    "GAGGTAAAC",
+    "TCCGTAAGT",
+    "CAGGTTGGA",
+    "ACAGTCAGT",
+    "TAGGTCATT",
+    "TAGGTACTG",
+    "ATGGTAACT",
+    "CAGGTATAC",
+    "TGTGTGAGT",
+]
+
+bases = ["A", "C", "G", "T"]
+L = len(motifs[0])
+N = len(motifs)
+PSEUDOCOUNT = 1
+SCORE_TOL = 1e-9  # slack for float rounding between DP atoms and window sums
+SCAN_CHUNK = 1 << 20  # window starts per early-abandon pass
+
+
+def build_pwm(motifs=motifs, pseudocount=PSEUDOCOUNT):
+    """
+    Returns the count, relative frequency and log-likelihood matrices
+    of the motif set, each as {base: [value per column]}.
+    """
+    L = len(motifs[0])
+    N = len(motifs)
+
+    # 1. Count matrix with pseudocounts
+    count = {b: [pseudocount]*L for b in bases}
+    for m in motifs:
+        for i, c in enumerate(m):
+            count[c][i] += 1
+
+    # 2–3. Weight / relative frequency matrix
+    denom = N + 4 * pseudocount
+    freq = {b: [count[b][i]/denom for i in range(L)] for b in bases}
+
+    # 4. Log-likelihood matrix
+    loglik = {b: [log(freq[b][i]/0.25) for i in range(L)] for b in bases}
+
+    return count, freq, loglik
+
+def scan_sequence(S, loglik):
+    """Scores every window of S; returns (positions, windows, scores)."""
+    L = len(loglik[bases[0]])
+    scores = []
+    positions = []
+    windows = []
+
+    for i in range(len(S) - L + 1):
+        window = S[i:i+L]
+        score = sum(loglik[window[j]][j] for j in range(L))
+        scores.append(score)
+        positions.append(i)
+        windows.append(window)
+
+    return positions, windows, scores
+
+def pwm_array(loglik):
+    """
+    The log-likelihood matrix as a (5, L) array indexed by base code;
+    row 4 (N / unknown bases) is -inf so such windows never score.
+    """
+    import numpy as np
+
+    W = np.array([loglik[b] for b in bases], dtype=float)
+    return np.vstack([W, np.full(W.shape[1], -np.inf)])
+
+def score_batch(seqs, W):
+    """
+    Scores every window of every sequence in one vectorized pass over
+    their concatenation. Returns one float array per sequence (empty for
+    sequences shorter than the motif).
+    """
+    import numpy as np
+    from .encoding import concat_encoded
+
+    L = W.shape[1]
+    codes, offsets = concat_encoded(seqs)
+    if len(codes) < L:
+        return [np.empty(0) for _ in seqs]
+    total = score_codes(codes, W)
+
+    # windows crossing a sequence boundary are simply never sliced out
+    return [
+        total[start:max(start, end - L + 1)]
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
+
+def score_codes(codes, W):
+    """Scores of every window of an encoded sequence (see encoding.py)."""
+    import numpy as np
+
+    L = W.shape[1]
+    n = max(len(codes) - L + 1, 0)
+    total = np.zeros(n)
+    for j in range(L):
+        total += W[codes[j:j + n], j]
+    return total
+
+def score_distribution(W, background=None):
+    """
+    Exact distribution of the window score of W under an i.i.d.
+    background (uniform by default), by dynamic programming over the
+    columns. Returns (scores, probabilities) with scores ascending.
+    """
+    import numpy as np
+
+    bg = np.full(4, 0.25) if background is None else np.asarray(background, dtype=float)
+    scores, probs = np.zeros(1), np.ones(1)
+    for j in range(W.shape[1]):
+        scores = (scores[:, None] + W[:4, j]).ravel()
+        probs = (probs[:, None] * bg).ravel()
+        # merge sums equal up to rounding so the support stays small; each
+        # atom keeps the lowest score of its group
+        idx = np.argsort(scores, kind="stable")
+        scores = scores[idx]
+        new = np.r_[True, np.diff(scores) > SCORE_TOL]
+        probs = np.bincount(np.cumsum(new) - 1, weights=probs[idx])
+        scores = scores[new]
+    return scores, probs
+
+def score_cutoff(W, pvalue, background=None):
+    """
+    Lowest score s with P(score >= s) <= pvalue under the background;
+    windows scoring >= s are the hits at that p-value (inf if none).
+    """
+    import numpy as np
+
+    scores, probs = score_distribution(W, background)
+    tail = np.cumsum(probs[::-1])[::-1]
+    ok = np.flatnonzero(tail <= pvalue * (1 + 1e-12))
+    return float(scores[ok[0]]) - SCORE_TOL if len(ok) else float("inf")
+
+def lookahead_bounds(W):
+    """
+    Column visiting order (most selective first) and rest[k], the best
+    score still reachable from the k-th visited column on.
+    """
+    import numpy as np
+
+    A = W[:4]
+    order = np.argsort(A.min(axis=0) - A.max(axis=0), kind="stable")
+    best = A.max(axis=0)[order]
+    rest = np.append(np.cumsum(best[::-1])[::-1], 0.0)
+    return order, rest
+
+def scan_threshold(seqs, W, cutoff, chunk=SCAN_CHUNK):
+    """
+    Windows scoring >= cutoff, as one ScanResult per sequence.
+
+    Columns are added in lookahead order and a window is dropped as soon
+    as its partial score plus the best remaining score cannot reach the
+    cutoff, so most windows are abandoned after one or two columns. The
+    survivors are rescored in column order, which makes hits and scores
+    identical to score_batch followed by a threshold.
+    """
+    from .encoding import concat_encoded
+    from .scan_results import ScanResult
+
+    codes, offsets = concat_encoded(seqs)
+    return [
+        ScanResult(S, *threshold_hits(codes[start:end], W, cutoff, chunk), W.shape[1])
+        for S, start, end in zip(seqs, offsets[:-1], offsets[1:])
+    ]
+
+def threshold_hits(codes, W, cutoff, chunk=SCAN_CHUNK):
+    """(positions, scores) of the windows of an encoded sequence scoring >= cutoff."""
+    import numpy as np
+
+    L = W.shape[1]
+    order, rest = lookahead_bounds(W)
+    columns = [np.ascontiguousarray(W[:, j]) for j in range(L)]
+    bound = cutoff - SCORE_TOL
+
+    stop = max(len(codes) - L + 1, 0)
+    positions, scores = [np.empty(0, np.int64)], [np.empty(0)]
+    for lo in range(0, stop, chunk):
+        hi = min(lo + chunk, stop)
+        # contiguous slices while most windows survive, then gather
+        # only the candidates that are left
+        partial = np.zeros(hi - lo)
+        alive = None
+        for k, j in enumerate(order):
+            if alive is None:
+                partial += columns[j][codes[lo + j:hi + j]]
+                keep = partial + rest[k + 1] >= bound
+                if keep.mean() < 0.5:
+                    cand = np.flatnonzero(keep) + lo
+                    partial, alive = partial[keep], True
+            else:
+                partial += columns[j][codes[cand + j]]
+                keep = partial + rest[k + 1] >= bound
+                cand, partial = cand[keep], partial[keep]
+            if alive and len(cand) == 0:
+                break
+        if alive is None:
+            cand = np.flatnonzero(keep) + lo
+
+        total = np.zeros(len(cand))
+        for j in range(L):
+            total += columns[j][codes[cand + j]]
+        hit = total >= cutoff
+        positions.append(cand[hit])
+        scores.append(total[hit])
+    return np.concatenate(positions), np.concatenate(scores)
+
+def scan_batch(seqs, W, threshold=None, top_k=None, pvalue=None):
+    """
+    score_batch as one columnar ScanResult per sequence, with the
+    threshold / top-k filter applied before any window is materialized.
+    A p-value is turned into a score threshold with score_cutoff(); with
+    a threshold the early-abandon scan_threshold() does the scoring.
+    """
+    from .scan_results import ScanResult
+
+    if pvalue is not None:
+        cutoff = score_cutoff(W, pvalue)
+        threshold = cutoff if threshold is None else max(threshold, cutoff)
+    if threshold is not None:
+        return [r.filter(top_k=top_k) for r in scan_threshold(seqs, W, threshold)]
+
+    return [
+        ScanResult.from_scores(S, scores, W.shape[1]).filter(threshold, top_k)
+        for S, scores in zip(seqs, score_batch(seqs, W))
+    ]
@@ -0,0 +1,134 @@
+"""
+Columnar scan output: int64 positions and float32 scores, with the
+scored windows sliced from the sequence only when they are asked for.
+A genome-scale scan then costs 12 bytes per kept window instead of a
+Python int, float and str per position.
+"""
+import os
+
+import numpy as np
+
+from . import lazy
+
+DTYPE = np.dtype([("position", np.int64), ("score", np.float32)])
+
+
+class ScanResult:
+    """Positions and scores of one sequence's windows of length `width`."""
+
+    def __init__(self, sequence, positions, scores, width):
+        self.sequence = sequence
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self.width = width
+
+    @classmethod
+    def from_scores(cls, sequence, scores, width):
+        """Result of a scan that scored every window, position = index."""
+        return cls(sequence, np.arange(len(scores)), scores, width)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def window(self, i):
+        p = int(self.positions[i])
+        return str(self.sequence[p:p + self.width])
+
+    def windows(self):
+        if isinstance(self.sequence, str) and self.sequence.isascii() and len(self) > 1:
+            # one vectorized gather instead of a str slice per window
+            data = np.frombuffer(self.sequence.encode("ascii"), dtype=np.uint8)
+            index = self.positions[:, None] + np.arange(self.width)
+            rows = data[index].view(f"S{self.width}").ravel()
+            return rows.astype(f"U{self.width}").tolist()
+        return [self.window(i) for i in range(len(self))]
+
+    def best(self):
+        """Index of the highest-scoring window (None when empty)."""
+        return int(self.scores.argmax()) if len(self) else None
+
+    def take(self, index):
+        """Result restricted to an index array or slice."""
+        return ScanResult(self.sequence, self.positions[index], self.scores[index], self.width)
+
+    def ranked(self, start, stop, by="score"):
+        """
+        Rows start..stop-1 in descending score order (ties by position)
+        or in position order. Only the first `stop` scores are sorted, so
+        the top pages of a genome-scale result stay cheap.
+        """
+        stop = min(stop, len(self))
+        if start >= stop:
+            return self.take(slice(0, 0))
+        if by == "position":
+            if self.is_sorted():
+                return self.take(slice(start, stop))
+            return self.take(np.argsort(self.positions, kind="stable")[start:stop])
+        if by != "score":
+            raise ValueError("by must be 'score' or 'position'")
+        keep = np.arange(len(self))
+        if stop < len(self):
+            # the stop-th best score; ties at that score go to the lowest
+            # positions, so consecutive pages never overlap or skip rows
+            kth = -np.partition(-self.scores, stop - 1)[stop - 1]
+            above = np.flatnonzero(self.scores > kth)
+            tied = np.flatnonzero(self.scores == kth)
+            tied = tied[np.argsort(self.positions[tied], kind="stable")][:stop - len(above)]
+            keep = np.concatenate([above, tied])
+        order = np.lexsort((self.positions[keep], -self.scores[keep]))
+        return self.take(keep[order][start:stop])
+
+    def is_sorted(self):
+        return bool(len(self) < 2 or (np.diff(self.positions) >= 0).all())
+
+    def filter(self, threshold=None, top_k=None):
+        """
+        Keeps the windows scoring >= threshold and then the top_k best of
+        those, in position order. Only the index arrays are touched.
+        """
+        keep = np.arange(len(self))
+        if threshold is not None:
+            keep = np.flatnonzero(self.scores >= threshold)
+        if top_k is not None and top_k < len(keep):
+            best = np.argpartition(self.scores[keep], len(keep) - top_k)[len(keep) - top_k:]
+            keep = np.sort(keep[best])
+        return self.take(keep)
+
+    def to_frame(self):
+        pd = lazy.pandas()
+        return pd.DataFrame({
+            "Position": self.positions,
+            "Window": self.windows(),
+            "Score": self.scores,
+        })
+
+    def to_csv(self, path, block=1 << 16):
+        """Writes Position, Window, Score rows block by block."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            for i in range(0, max(len(self), 1), block):
+                self.take(slice(i, i + block)).to_frame().to_csv(f, header=i == 0, index=False)
+
+    def to_records(self):
+        out = np.empty(len(self), dtype=DTYPE)
+        out["position"] = self.positions
+        out["score"] = self.scores
+        return out
+
+    def save(self, path):
+        """
+        Writes the position and score columns: .parquet through pandas
+        (needs pyarrow or fastparquet), anything else as a structured .npy.
+        """
+        if os.path.splitext(path)[1] == ".parquet":
+            pd = lazy.pandas()
+            pd.DataFrame({"position": self.positions, "score": self.scores}).to_parquet(path, index=False)
+        else:
+            np.save(path, self.to_records())
+
+    @classmethod
+    def load(cls, path, sequence=None, width=0):
+        if os.path.splitext(path)[1] == ".parquet":
+            df = lazy.pandas().read_parquet(path)
+            return cls(sequence, df["position"].to_numpy(), df["score"].to_numpy(), width)
+        data = np.load(path)
+        return cls(sequence, data["position"], data["score"], width)
@@ -0,0 +1,111 @@
+"""
+Shared-memory sequence buffers for parallel scans of one large genome.
+
+The 2-bit packed sequence is copied once into multiprocessing.shared_memory;
+worker processes attach to it as a zero-copy NumPy view and only receive
+(offset, length, motif id, cutoff) tasks, decoding just their own region.
+32 workers over a 3 Gb genome then share one ~750 MB buffer instead of
+each unpickling its own copy of the sequence.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .packed import PackedSequence
+from .pwm import score_codes, threshold_hits
+from .scan_results import ScanResult
+
+REGION = 1 << 22  # windows scored per task
+
+
+class SharedSequence:
+    """A PackedSequence whose buffer lives in a shared memory block (owner side)."""
+
+    def __init__(self, seq):
+        if not isinstance(seq, PackedSequence):
+            seq = PackedSequence.from_string(seq)
+        self.length = len(seq)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(seq.data.nbytes, 1))
+        np.ndarray(seq.data.shape, np.uint8, buffer=self._shm.buf)[:] = seq.data
+        self.handle = (self._shm.name, seq.data.nbytes, seq.length,
+                       seq.n_starts, seq.n_ends, seq.alphabet)
+
+    def __len__(self):
+        return self.length
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def attach(handle):
+    """
+    Worker side: returns (PackedSequence view, SharedMemory); keep the
+    second alive as long as the view is used. The owner unlinks the block.
+    """
+    name, nbytes, length, n_starts, n_ends, alphabet = handle
+    # pool workers share the owner's resource tracker, so attaching here
+    # does not schedule a second unlink
+    shm = shared_memory.SharedMemory(name=name)
+    data = np.ndarray((nbytes,), np.uint8, buffer=shm.buf)
+    return PackedSequence(data, length, n_starts, n_ends, alphabet), shm
+
+# ---------------- worker side ----------------
+
+_worker = {}
+
+def _init_worker(handle, matrices):
+    seq, shm = attach(handle)
+    _worker.update(seq=seq, shm=shm, matrices=matrices)
+
+def _scan_task(task):
+    offset, length, motif_id, cutoff = task
+    W = _worker["matrices"][motif_id]
+    codes = _worker["seq"].codes(offset, offset + length + W.shape[1] - 1)
+    if cutoff is None:
+        scores = score_codes(codes, W)
+        positions = np.arange(len(scores))
+    else:
+        positions, scores = threshold_hits(codes, W, cutoff)
+    return motif_id, positions + offset, scores.astype(np.float32)
+
+# ---------------- owner side ----------------
+
+def parallel_scan(seq, matrices, threshold=None, workers=None, region=REGION):
+    """
+    Scans one sequence with several (5, L) PWMs (pwm.pwm_array,
+    motif_scan.motif_matrix) in a process pool. Tasks are regions of
+    `region` windows per matrix. threshold is one cutoff or one per matrix;
+    None keeps every window. Returns one ScanResult per matrix.
+    """
+    thresholds = threshold if isinstance(threshold, (list, tuple)) else [threshold] * len(matrices)
+    shared = seq if isinstance(seq, SharedSequence) else SharedSequence(seq)
+    try:
+        tasks = []
+        for m, (W, cutoff) in enumerate(zip(matrices, thresholds)):
+            windows = max(len(shared) - W.shape[1] + 1, 0)
+            tasks += [(off, min(region, windows - off), m, cutoff) for off in range(0, windows, region)]
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(shared.handle, matrices)) as pool:
+            parts = list(pool.map(_scan_task, tasks))
+    finally:
+        if shared is not seq:
+            shared.close()
+
+    results = []
+    for m, W in enumerate(matrices):
+        mine = [p for p in parts if p[0] == m]
+        positions = np.concatenate([p[1] for p in mine]) if mine else np.empty(0, np.int64)
+        scores = np.concatenate([p[2] for p in mine]) if mine else np.empty(0, np.float32)
+        results.append(ScanResult(seq, positions, scores, W.shape[1]))
+    return results
@@ -0,0 +1,164 @@
+"""
+Headless synthetic-genome simulator for nucleotide Markov models saved
+as JSON ({"A": {"A": p, ...}, ...}, like ex2_json.json).
+
+The chain is exact but vectorized: the transitions are cut into blocks of
+BLOCK steps and every block is walked from all possible start states at
+once, driven by the same uniforms, with one inverse-CDF lookup per step
+into the cumulative transition array. The real start state of each block
+is only known afterwards, when the blocks are chained together, and then
+selects one of the precomputed paths. The Python loop therefore runs over
+the block length, not the sequence length, and covers many sequences and
+blocks per step. Output is generated and written CHUNK bases at a time,
+so memory stays bounded for 100 Mb+ genomes. The same seed and
+parameters give the same sequences.
+"""
+import json
+
+import numpy as np
+
+BLOCK = 2048       # transitions per independently walked block
+CHUNK = 1 << 21    # bases generated per batch
+LINE_WIDTH = 70
+
+_SUFFIXES = {"k": 10**3, "K": 10**3, "M": 10**6, "G": 10**9}
+
+
+def parse_length(text):
+    """'100M' -> 100_000_000."""
+    text = str(text)
+    if text[-1] in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[text[-1]])
+    return int(text)
+
+def load_model(model):
+    """
+    (states, cumulative) from a JSON path or {state: {state: p}} dict.
+    Rows are renormalized; an all-zero row (a state never seen in
+    training) becomes uniform so the chain cannot get stuck.
+    """
+    if isinstance(model, str):
+        with open(model, "r", encoding="utf-8") as f:
+            model = json.load(f)
+
+    states = list(model)
+    P = np.array([[float(model[a].get(b, 0.0)) for b in states] for a in states])
+    if (P < 0).any():
+        raise ValueError("Transition probabilities must be non-negative")
+    totals = P.sum(axis=1, keepdims=True)
+    P = np.where(totals > 0, P / np.where(totals > 0, totals, 1), 1.0 / len(states))
+
+    cumulative = np.cumsum(P, axis=1)
+    cumulative[:, -1] = 1.0  # no rounding gap above the last state
+    return states, cumulative
+
+def _walk(cumulative, u):
+    """
+    Paths of every block from every start state: u is (blocks, steps)
+    and the result (blocks, states, steps) holds state indices.
+    """
+    n = len(cumulative)
+    blocks, steps = u.shape
+    cur = np.broadcast_to(np.arange(n, dtype=np.intp), (blocks, n)).copy()
+    paths = np.empty((blocks, n, steps), dtype=np.uint8)
+    for t in range(steps):
+        cur = (u[:, t, None, None] >= cumulative[cur]).sum(axis=-1)
+        paths[:, :, t] = cur
+    return paths
+
+def _transitions(cumulative, prev, counts, rng, block=BLOCK):
+    """
+    Continues len(prev) independent chains, chain k from state prev[k]
+    for counts[k] steps. Returns one array of state indices per chain.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    steps = int(min(block, max(counts.max(initial=0), 1)))
+    n_blocks = -(-counts // steps)
+    first = np.concatenate([[0], np.cumsum(n_blocks)[:-1]])
+
+    paths = _walk(cumulative, rng.random((int(n_blocks.sum()), steps)))
+
+    prev = np.asarray(prev, dtype=np.intp).copy()
+    chosen = np.empty((len(paths), steps), dtype=np.uint8)
+    for j in range(int(n_blocks.max(initial=0))):
+        live = np.flatnonzero(n_blocks > j)
+        b = first[live] + j
+        chosen[b] = paths[b, prev[live]]
+        prev[live] = chosen[b, -1]
+
+    return [
+        chosen[f:f + nb].ravel()[:c]
+        for f, nb, c in zip(first, n_blocks, counts)
+    ]
+
+def _check_sizes(n_sequences, length):
+    if length < 1:
+        raise ValueError("Sequence length must be at least 1")
+    if n_sequences < 0:
+        raise ValueError("Number of sequences must be non-negative")
+
+def simulate(model, n_sequences, length, seed=None, start=None, chunk=CHUNK):
+    """
+    Yields (record index, state-index array) pieces of n_sequences
+    independent chains of `length` states, record by record in order.
+    Short records are generated together in one batch; long ones
+    continue piece by piece from their last state. The first state is
+    `start` or drawn uniformly like markov.generate_dna.
+    """
+    _check_sizes(n_sequences, length)
+    states, cumulative = load_model(model)
+    rng = np.random.default_rng(seed)
+    if start and start not in states:
+        raise ValueError("Invalid start symbol for DNA")
+
+    record = 0
+    while record < n_sequences:
+        if length <= chunk:
+            batch = range(record, min(n_sequences, record + max(1, chunk // max(length, 1))))
+            first = (np.full(len(batch), states.index(start)) if start
+                     else rng.integers(0, len(states), len(batch)))
+            rest = _transitions(cumulative, first, [length - 1] * len(batch), rng)
+            for r, x0, tail in zip(batch, first, rest):
+                yield r, np.concatenate([[x0], tail]).astype(np.uint8)
+            record = batch.stop
+            continue
+
+        x0 = states.index(start) if start else int(rng.integers(0, len(states)))
+        done, prev = 1, x0
+        yield record, np.array([x0], dtype=np.uint8)
+        while done < length:
+            size = min(chunk, length - done)
+            piece, = _transitions(cumulative, [prev], [size], rng)
+            prev = int(piece[-1])
+            done += size
+            yield record, piece
+        record += 1
+
+def write_fasta(path, model, n_sequences, length, seed=None, start=None,
+                prefix="simulated", line_width=LINE_WIDTH, chunk=CHUNK):
+    """Streams simulated records into a FASTA file; returns the number of bases written."""
+    _check_sizes(n_sequences, length)  # before the file is created
+    states, _ = load_model(model)
+    letters = np.frombuffer("".join(states).encode("ascii"), dtype=np.uint8)
+    if len(letters) != len(states):
+        raise ValueError("FASTA output needs single-character states")
+
+    written = 0
+    current, carry = None, b""
+    with open(path, "wb") as f:
+        for record, piece in simulate(model, n_sequences, length, seed, start, chunk):
+            if record != current:
+                if carry:
+                    f.write(carry + b"\n")
+                f.write(f">{prefix}_{record} length={length} seed={seed}\n".encode("ascii"))
+                current, carry = record, b""
+
+            block = carry + letters[piece].tobytes()
+            full = len(block) - len(block) % line_width
+            lines = np.frombuffer(block[:full], dtype=np.uint8).reshape(-1, line_width)
+            f.write(np.hstack([lines, np.full((len(lines), 1), ord("\n"), np.uint8)]).tobytes())
+            carry = block[full:]
+            written += len(piece)
+        if carry:
+            f.write(carry + b"\n")
+    return written
@@ -0,0 +1,209 @@
+import math
+import re
+
+# ---------------- Text processing ----------------
+
+def clean_text(text):
+    text = text.lower()
+    text = re.sub(r"[^a-zăâîșşțţ \n]", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+def build_alphabet(t1, t2):
+    return sorted(set(t1 + t2))
+
+# ---------------- Markov model ----------------
+
+def count_transitions(text, alphabet):
+    idx = {c: i for i, c in enumerate(alphabet)}
+    n = len(alphabet)
+    M = [[0]*n for _ in range(n)]
+    for a, b in zip(text[:-1], text[1:]):
+        M[idx[a]][idx[b]] += 1
+    return M
+
+def normalize_matrix(M, alpha=1.0):
+    n = len(M)
+    P = [[0.0]*n for _ in range(n)]
+    for i in range(n):
+        row_sum = sum(M[i]) + alpha*n
+        for j in range(n):
+            P[i][j] = (M[i][j] + alpha) / row_sum
+    return P
+
+def log_likelihood_matrix(P, Q):
+    n = len(P)
+    B = [[0.0]*n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            B[i][j] = math.log(P[i][j] / Q[i][j], 2)
+    return B
+
+def score_text(text, B, alphabet):
+    idx = {c: i for i, c in enumerate(alphabet)}
+    score = 0.0
+    for a, b in zip(text[:-1], text[1:]):
+        score += B[idx[a]][idx[b]]
+    return score
+
+def sliding_window(text, B, alphabet, win, step):
+    scores, pos = [], []
+    for i in range(0, len(text) - win + 1, step):
+        w = text[i:i+win]
+        scores.append(score_text(w, B, alphabet))
+        pos.append(i + win//2)
+    return pos, scores
+
+# ---------------- Incremental models ----------------
+
+class StyleModels:
+    """
+    Persistent transition counts for several labelled styles over one
+    shared, growing alphabet.
+
+    add_text() costs time proportional to the new text only; the log2
+    probability matrix of every label is cached and, when asked for
+    again, only the rows whose counts changed are recomputed (all rows if
+    the alphabet grew). beta() and attribute() both read these cached
+    matrices. Each label keeps all of its training text: the rows of every
+    model are normalized separately, so a longer corpus for one label
+    needs no truncation of the other.
+    """
+
+    def __init__(self, labels=("A", "B"), alpha=1.0):
+        self.labels = list(labels)
+        self.alpha = alpha
+        self.alphabet = []
+        self.index = {}
+        self.counts = {label: [] for label in self.labels}
+        self.lengths = {label: 0 for label in self.labels}
+        self._log_p = {}  # label -> [log2 matrix, rows still to refresh or None for all]
+
+    def _add_symbol(self, c):
+        self.index[c] = len(self.alphabet)
+        self.alphabet.append(c)
+        n = len(self.alphabet)
+        for M in self.counts.values():
+            for row in M:
+                row.append(0)
+            M.append([0] * n)
+        for cached in self._log_p.values():
+            cached[1] = None
+
+    def add_text(self, label, text):
+        """Adds the transitions of an already cleaned text to `label`."""
+        if label not in self.counts:
+            self.labels.append(label)
+            n = len(self.alphabet)
+            self.counts[label] = [[0] * n for _ in range(n)]
+            self.lengths[label] = 0
+
+        for c in sorted(set(text) - self.index.keys()):
+            self._add_symbol(c)
+
+        idx = self.index
+        M = self.counts[label]
+        touched = set()
+        for a, b in zip(text[:-1], text[1:]):
+            i = idx[a]
+            M[i][idx[b]] += 1
+            touched.add(i)
+
+        self.lengths[label] += len(text)
+        cached = self._log_p.get(label)
+        if cached is not None and cached[1] is not None:
+            cached[1] |= touched
+
+    def probabilities(self, label):
+        return normalize_matrix(self.counts[label], self.alpha)
+
+    def _probability_row(self, label, i):
+        row = self.counts[label][i]
+        row_sum = sum(row) + self.alpha * len(row)
+        return [(c + self.alpha) / row_sum for c in row]
+
+    def log_probabilities(self, label):
+        """|Σ| x |Σ| log2 transition probabilities, refreshing only the rows that changed."""
+        import numpy as np
+
+        cached = self._log_p.get(label)
+        if cached is None or cached[1] is None:
+            M = np.array(self.counts[label], dtype=float).reshape(len(self.alphabet), -1)
+            M += self.alpha
+            L = np.log2(M / M.sum(axis=1, keepdims=True))
+        else:
+            L, rows = cached
+            for i in rows:
+                L[i] = np.log2(self._probability_row(label, i))
+
+        self._log_p[label] = [L, set()]
+        return L
+
+    def beta(self, a=None, b=None):
+        """log2 P_a / P_b matrix, from the cached log-probabilities."""
+        a = self.labels[0] if a is None else a
+        b = self.labels[1] if b is None else b
+        return (self.log_probabilities(a) - self.log_probabilities(b)).tolist()
+
+    def log_prob_tensor(self, labels=None):
+        """K x |Σ| x |Σ| stack of log2 transition probabilities."""
+        import numpy as np
+
+        labels = self.labels if labels is None else labels
+        n = len(self.alphabet)
+        return np.array([self.log_probabilities(label) for label in labels]).reshape(len(labels), n, n)
+
+    def attribute(self, text, win, step, labels=None):
+        """
+        Scores every window (same windows as sliding_window) under all
+        labels at once: one gather from the log-probability tensor and a
+        prefix sum give the K log-likelihoods of every window.
+        Returns (positions, winners, margins, scores), where margins is
+        the gap in bits between the best and second-best label and
+        scores has shape (K, windows). Positions are indices into text;
+        transitions to or from a symbol outside the alphabet score 0.
+        """
+        import numpy as np
+
+        labels = self.labels if labels is None else labels
+        T = self.log_prob_tensor(labels)
+        x = np.array([self.index.get(c, -1) for c in text], dtype=np.intp)
+
+        known = (x[:-1] >= 0) & (x[1:] >= 0)
+        C = np.zeros((len(labels), max(len(x), 1)))
+        if len(self.alphabet):
+            a, b = np.maximum(x[:-1], 0), np.maximum(x[1:], 0)
+            np.cumsum(np.where(known, T[:, a, b], 0.0), axis=1, out=C[:, 1:])
+
+        starts = np.arange(0, len(x) - win + 1, step)
+        scores = C[:, starts + win - 1] - C[:, starts]
+        order = np.sort(scores, axis=0)
+        margins = order[-1] - order[-2] if len(labels) > 1 else np.zeros(len(starts))
+        winners = [labels[i] for i in scores.argmax(axis=0)]
+        return starts + win // 2, winners, margins, scores
+
+    def save(self, path):
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "labels": self.labels,
+                "alpha": self.alpha,
+                "alphabet": self.alphabet,
+                "counts": self.counts,
+                "lengths": self.lengths,
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        import json
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        models = cls(data["labels"], data["alpha"])
+        models.alphabet = data["alphabet"]
+        models.index = {c: i for i, c in enumerate(models.alphabet)}
+        models.counts = data["counts"]
+        models.lengths = data["lengths"]
+        return models
@@ -1,118 +1,254 @@
-import gradio as gr
-from math import log
-import matplotlib.pyplot as plt
-import pandas as pd
-
-
-motifs = [
-    "GAGGTAAAC",
-    "TCCGTAAGT",
-    "CAGGTTGGA",
-    "ACAGTCAGT",
-    "TAGGTCATT",
-    "TAGGTACTG",
-    "ATGGTAACT",
-    "CAGGTATAC",
-    "TGTGTGAGT",
-]
-
-bases = ["A", "C", "G", "T"]
-L = len(motifs[0])
-N = len(motifs)
-PSEUDOCOUNT = 1
-
-
-def analyze_sequence(S):
-    # 1. Count matrix with pseudocounts
-    count = {b: [PSEUDOCOUNT]*L for b in bases}
-    for m in motifs:
-        for i, c in enumerate(m):
-            count[c][i] += 1
-
-    count_df = pd.DataFrame(count, index=range(1, L+1)).T
-
-    # 2–3. Weight / relative frequency matrix
-    denom = N + 4 * PSEUDOCOUNT
-    freq = {b: [count[b][i]/denom for i in range(L)] for b in bases}
-    freq_df = pd.DataFrame(freq, index=range(1, L+1)).T
-
-    # 4. Log-likelihood matrix
-    loglik = {b: [log(freq[b][i]/0.25) for i in range(L)] for b in bases}
-    loglik_df = pd.DataFrame(loglik, index=range(1, L+1)).T
-
-    # 5. Sliding window scan
-    scores = []
-    positions = []
-    windows = []
-
-    for i in range(len(S) - L + 1):
-        window = S[i:i+L]
-        score = sum(loglik[window[j]][j] for j in range(L))
-        scores.append(score)
-        positions.append(i)
-        windows.append(window)
-
-    scan_df = pd.DataFrame({
-        "Position": positions,
-        "Window": windows,
-        "Score": scores
-    })
-
-    best_idx = scan_df["Score"].idxmax()
-    best_row = scan_df.loc[best_idx]
-
-    # Plot
-    plt.figure()
-    plt.plot(scan_df["Position"], scan_df["Score"])
-    plt.axhline(0)
-    plt.xlabel("Sliding window position")
-    plt.ylabel("Log-likelihood score")
-    plt.title("Exon–Intron Boundary Scan (with pseudocounts)")
-
-    conclusion = (
-        f"Best candidate at position {int(best_row['Position'])}, "
-        f"window {best_row['Window']}, score = {best_row['Score']:.3f}.\n"
-        "A positive log-likelihood peak indicates a likely exon–intron boundary."
+from bioinfo import lazy
+from bioinfo.artifacts import ArtifactStore
+from bioinfo.memo import MemoCache, content_digest, fingerprint
+from bioinfo.pwm import motifs, L, PSEUDOCOUNT, build_pwm, pwm_array, scan_batch, score_cutoff
+
+MAX_BATCH_SIZE = 16  # requests Gradio may merge into one analyze_batch call
+CONCURRENCY_LIMIT = 4  # batches processed at the same time
+QUEUE_SIZE = 256
+CACHE_BYTES = 128 << 20
+PAGE_SIZE = 50  # table rows sent per response, whatever the sequence length
+SORT_ORDERS = ("score", "position")
+
+# columnar scan result + conclusion per (sequence, PWM parameters); table pages
+# and figures are built from the cached columns on every response
+CACHE = MemoCache(CACHE_BYTES, name="pwm_cache")
+# full-table CSV exports, written on demand
+EXPORTS = ArtifactStore("pwm_exports", max_bytes=1 << 30)
+
+
+def plot_scan(positions, scores, hits_only=False):
+    from bioinfo.downsample import figure_width_px, reduce_track
+
+    # a standalone Figure per request: pyplot's global state is not thread-safe
+    fig = lazy.figure()
+    ax = fig.add_subplot()
+    # no more points than pixel columns, whatever the sequence length
+    if hits_only:
+        ax.plot(positions, scores, "o")
+    else:
+        ax.plot(*reduce_track(positions, scores, figure_width_px(fig)))
+    ax.axhline(0)
+    ax.set_xlabel("Sliding window position")
+    ax.set_ylabel("Log-likelihood score")
+    ax.set_title("Exon–Intron Boundary Scan (with pseudocounts)")
+    return fig
+
+
+def _key(S, pvalue):
+    return content_digest(S), fingerprint(motifs=motifs, pseudocount=PSEUDOCOUNT, pvalue=pvalue)
+
+
+def scan_results(seqs, pvalues):
+    """
+    (ScanResult, conclusion) per normalized sequence, from the memo cache
+    or from one batched scan per distinct p-value.
+    """
+    _, _, loglik = build_pwm(motifs, PSEUDOCOUNT)
+
+    # 5. Sliding window scan (windows with non-ACGT bases score -inf)
+    W = pwm_array(loglik)
+    keys = [_key(S, p) for S, p in zip(seqs, pvalues)]
+    cached = [CACHE.get(key) for key in keys]
+
+    # one scan per distinct p-value among the sequences not cached yet
+    for pvalue in set(p for p, hit in zip(pvalues, cached) if hit is None):
+        missing = [i for i, hit in enumerate(cached) if hit is None and pvalues[i] == pvalue]
+        if pvalue is not None:
+            cutoff = score_cutoff(W, pvalue)
+            passing = f"p <= {pvalue:g} (score >= {cutoff:.3f})"
+            if cutoff == float("inf"):
+                passing = f"p <= {pvalue:g} (below the smallest possible p-value of this motif)"
+        for i, result in zip(missing, scan_batch([seqs[i] for i in missing], W, pvalue=pvalue)):
+            best = result.best()
+            if len(seqs[i]) < L:
+                conclusion = f"Sequence is shorter than the motif length ({L})."
+            elif best is None:
+                conclusion = f"No window reaches {passing}."
+            else:
+                conclusion = (
+                    f"Best candidate at position {result.positions[best]}, "
+                    f"window {result.window(best)}, score = {result.scores[best]:.3f}.\n"
+                    "A positive log-likelihood peak indicates a likely exon–intron boundary."
+                )
+                if pvalue is not None:
+                    conclusion += f"\n{len(result)} windows reach {passing}."
+            cached[i] = CACHE.put(keys[i], (result, conclusion))
+    return cached
+
+
+def _normalize(seqs, pvalues):
+    seqs = [S.strip().upper() for S in seqs]
+    pvalues = [p if p and p > 0 else None for p in (pvalues or [None] * len(seqs))]
+    return seqs, pvalues
+
+
+def result_page(result, page=1, sort="score", page_size=PAGE_SIZE):
+    """
+    One page of the scan table plus a "rows a–b of n" caption. Windows
+    are sliced from the sequence only for the rows on the page.
+    """
+    pages = max(1, -(-len(result) // page_size))
+    page = min(max(1, int(page or 1)), pages)
+    start = (page - 1) * page_size
+    rows = result.ranked(start, start + page_size, by=sort)
+    if len(result) == 0:
+        return rows.to_frame(), "No windows."
+    caption = (
+        f"Rows {start + 1}–{start + len(rows)} of {len(result)} "
+        f"(page {page} of {pages}, by {sort})"
     )
-
-    return count_df, freq_df, loglik_df, scan_df, conclusion, plt
+    return rows.to_frame(), caption
 
 
-with gr.Blocks(title="Exon–Intron Boundary Detection") as demo:
-    gr.Markdown("# Exon–Intron Boundary Detection")
-    gr.Markdown("PWM-based motif scanning using log-likelihood scores")
-
-    gr.Markdown("## Input")
-    seq_input = gr.Textbox(
-        value="CAGGTTGGAAACGTAATCAGCGATTACGCATGACGTAA",
-        label="DNA sequence S",
-        lines=2
-    )
+def analyze_batch(seqs, pvalues=None):
+    """
+    Gradio batch handler: takes a list of sequences (and p-values) and
+    returns one list per output component. All sequences are scored in
+    one vectorized pass. A p-value > 0 switches that sequence to threshold
+    mode: only windows at least as significant are scored to the end and
+    listed, using the early-abandon scan. The table holds the first page
+    of windows by score; show_page and export_table serve the rest from
+    the returned (sequence, p-value) key, and page/sort are reset to 1
+    and "score" in the same response.
+    """
+    pd = lazy.pandas()
 
-    run_btn = gr.Button("Run analysis")
+    # 1–4. Count, relative frequency and log-likelihood matrices
+    count, freq, loglik = build_pwm(motifs, PSEUDOCOUNT)
 
-    gr.Markdown("## 1. Count Matrix")
-    count_out = gr.Dataframe(interactive=False)
-
-    gr.Markdown("## 2. Weight / Relative Frequency Matrix")
-    freq_out = gr.Dataframe(interactive=False)
-
-    gr.Markdown("## 3. Log-Likelihood Matrix")
-    loglik_out = gr.Dataframe(interactive=False)
-
-    gr.Markdown("## 4. Sliding Window Scores")
-    scan_out = gr.Dataframe(interactive=False)
-
-    gr.Markdown("## 5. Log-Likelihood Plot")
-    plot_out = gr.Plot()
-
-    gr.Markdown("## Conclusion")
-    conclusion_out = gr.Textbox(lines=4, interactive=False)
+    count_df = pd.DataFrame(count, index=range(1, L+1)).T
+    freq_df = pd.DataFrame(freq, index=range(1, L+1)).T
+    loglik_df = pd.DataFrame(loglik, index=range(1, L+1)).T
 
-    run_btn.click(
-        fn=analyze_sequence,
-        inputs=seq_input,
-        outputs=[count_out, freq_out, loglik_out, scan_out, conclusion_out, plot_out]
-    )
+    seqs, pvalues = _normalize(seqs, pvalues)
 
-demo.launch()
\ No newline at end of file
+    outputs = ([], [], [], [], [], [], [], [], [], [])
+    for (result, conclusion), S, pvalue in zip(scan_results(seqs, pvalues), seqs, pvalues):
+        fig = plot_scan(result.positions, result.scores, pvalue is not None) if len(result) else None
+        scan_df, caption = result_page(result)
+
+        values = (count_df, freq_df, loglik_df, scan_df, caption, conclusion, fig,
+                  (S, pvalue), 1, "score")
+        for out, value in zip(outputs, values):
+            out.append(value)
+
+    return outputs
+
+
+async def analyze_batch_async(seqs, pvalues):
+    # scoring and rendering run in a worker thread, off the event loop
+    import asyncio
+    return await asyncio.to_thread(analyze_batch, seqs, pvalues)
+
+
+def analyze_sequence(S, pvalue=None):
+    return tuple(out[0] for out in analyze_batch([S], [pvalue]))
+
+
+def show_page(analyzed, page, sort):
+    # pages the last analyzed (sequence, p-value), not the current textbox;
+    # served from the memo cache, rescans only if the result was evicted
+    if analyzed is None:
+        return None, "Run the analysis first."
+    S, pvalue = analyzed
+    result, _ = scan_results([S], [pvalue])[0]
+    return result_page(result, page, sort)
+
+
+def export_table(analyzed):
+    """CSV of every listed window, written once per (sequence, parameters)."""
+    if analyzed is None:
+        return None
+    S, pvalue = analyzed
+    key = _key(S, pvalue)
+    path = EXPORTS.get(key, ".csv")
+    if path is None:
+        result, _ = scan_results([S], [pvalue])[0]
+        path = EXPORTS.put_file(key, result.to_csv, ".csv")
+    return path
+
+
+def build_demo():
+    import gradio as gr
+
+    with gr.Blocks(title="Exon–Intron Boundary Detection") as demo:
+        gr.Markdown("# Exon–Intron Boundary Detection")
+        gr.Markdown("PWM-based motif scanning using log-likelihood scores")
+
+        gr.Markdown("## Input")
+        seq_input = gr.Textbox(
+            value="CAGGTTGGAAACGTAATCAGCGATTACGCATGACGTAA",
+            label="DNA sequence S",
+            lines=2
+        )
+
+        pvalue_input = gr.Number(
+            value=0,
+            label="p-value threshold (0 = score and list every window)"
+        )
+
+        run_btn = gr.Button("Run analysis")
+        analyzed = gr.State()  # normalized (sequence, p-value) shown in the outputs
+
+        gr.Markdown("## 1. Count Matrix")
+        count_out = gr.Dataframe(interactive=False)
+
+        gr.Markdown("## 2. Weight / Relative Frequency Matrix")
+        freq_out = gr.Dataframe(interactive=False)
+
+        gr.Markdown("## 3. Log-Likelihood Matrix")
+        loglik_out = gr.Dataframe(interactive=False)
+
+        gr.Markdown("## 4. Sliding Window Scores")
+        with gr.Row():
+            page_input = gr.Number(value=1, precision=0, minimum=1, label="Page")
+            sort_input = gr.Radio(list(SORT_ORDERS), value="score", label="Sort by")
+        scan_info = gr.Markdown()
+        scan_out = gr.Dataframe(interactive=False)
+        with gr.Row():
+            export_btn = gr.Button("Export full table (CSV)")
+            export_out = gr.File(label="Full table", interactive=False)
+
+        gr.Markdown("## 5. Log-Likelihood Plot")
+        plot_out = gr.Plot()
+
+        gr.Markdown("## Conclusion")
+        conclusion_out = gr.Textbox(lines=4, interactive=False)
+
+        run_btn.click(
+            fn=analyze_batch_async,
+            inputs=[seq_input, pvalue_input],
+            outputs=[count_out, freq_out, loglik_out, scan_out, scan_info, conclusion_out, plot_out,
+                     analyzed, page_input, sort_input],
+            batch=True,
+            max_batch_size=MAX_BATCH_SIZE,
+            concurrency_limit=CONCURRENCY_LIMIT,
+            api_name="analyze"
+        )
+
+        # only PAGE_SIZE rows travel per response; sorting happens server-side.
+        # .input, not .change: the reset by analyze must not trigger a page
+        gr.on(
+            triggers=[page_input.submit, sort_input.input],
+            fn=show_page,
+            inputs=[analyzed, page_input, sort_input],
+            outputs=[scan_out, scan_info],
+            concurrency_limit=CONCURRENCY_LIMIT,
+            api_name="page"
+        )
+
+        export_btn.click(
+            fn=export_table,
+            inputs=[analyzed],
+            outputs=export_out,
+            concurrency_limit=CONCURRENCY_LIMIT,
+            api_name="export"
+        )
+
+    demo.queue(max_size=QUEUE_SIZE)
+    return demo
+
+
+if __name__ == "__main__":
+    build_demo().launch()
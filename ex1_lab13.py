@@ -1,93 +1,118 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 
+from bioinfo.markov import parse_matrix, parse_vector
+from bioinfo.prediction import (
+    predict_trajectory, load_transition_model, start_vector, sparse_trajectory, top_states,
+)
 
-def parse_matrix(text):
-    rows = text.strip().split("\n")
-    return [list(map(float, row.split())) for row in rows]
-
-def parse_vector(text):
-    return list(map(float, text.split()))
-
-def transpose(A):
-    return list(map(list, zip(*A)))
-
-def multiply(A, x):
-    return [
-        sum(A[i][j] * x[j] for j in range(len(x)))
-        for i in range(len(A))
-    ]
-
-def predict():
-    try:
-        A = parse_matrix(matrix_input.get("1.0", tk.END))
-        x = parse_vector(vector_input.get())
 
-        n = len(A)
-        if any(len(row) != n for row in A):
-            raise ValueError("Matrix must be square")
-        if len(x) != n:
-            raise ValueError("Vector size must match matrix size")
+def main():
+    def load_word_model():
+        path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+        if not path:
+            return
 
-        AT = transpose(A)
+        try:
+            output.model = load_transition_model(path)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
 
+        vector_input.delete(0, tk.END)
+        vector_input.insert(0, next(iter(output.model[1])))
         output.delete("1.0", tk.END)
+        output.insert(
+            tk.END,
+            f"Loaded word model: {len(output.model[1])} states\n"
+            "Enter a start word as x₀.\n"
+        )
 
-        for step in range(1, 6):
-            x = multiply(AT, x)
-            vector_str = "[" + ", ".join(f"{v:.6f}" for v in x) + "]"
-            output.insert(tk.END, f"Step {step}: {vector_str}\n")
-
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
-
-
-root = tk.Tk()
-root.title("Markov Prediction (5 Steps)")
-root.resizable(False, False)
+    def predict_words():
+        P, word_to_id, id_to_word = output.model
+        x = start_vector(word_to_id, vector_input.get().strip().lower())
 
-main = tk.Frame(root, padx=12, pady=12)
-main.pack()
-
-# Matrix input
-tk.Label(main, text="Matrix A (rows sum to 1):").grid(row=0, column=0, sticky="w")
-matrix_input = tk.Text(main, height=6, width=40)
-matrix_input.grid(row=1, column=0, padx=(0, 20))
-
-matrix_input.insert(
-    "1.0",
-    "0.3 0.35 0.35\n"
-    "0 0 1\n"
-    "0.9 0 0.1"
-)
-
-# Vector input
-right = tk.Frame(main)
-right.grid(row=1, column=1, sticky="n")
-
-tk.Label(right, text="Initial vector x₀:").pack(anchor="w")
-vector_input = tk.Entry(right, width=25)
-vector_input.pack(pady=(0, 12))
-vector_input.insert(0, "1 0 0")
-
-tk.Button(
-    right,
-    text="Predict 5 Steps",
-    command=predict,
-    width=20
-).pack()
-
-# Output
-tk.Label(main, text="Prediction output:").grid(
-    row=2, column=0, columnspan=2, sticky="w", pady=(12, 0)
-)
-
-output = tk.Text(
-    main,
-    height=8,
-    width=70,
-    font=("Courier", 10)
-)
-output.grid(row=3, column=0, columnspan=2)
+        output.delete("1.0", tk.END)
 
-root.mainloop()
+        for step, x in sparse_trajectory(P, x, 5, top_k=1000):
+            words = ", ".join(f"{w}:{p:.3f}" for w, p in top_states(x, id_to_word))
+            output.insert(tk.END, f"Step {step}: {words}\n")
+
+    def predict():
+        try:
+            if hasattr(output, "model"):
+                predict_words()
+                return
+
+            A = parse_matrix(matrix_input.get("1.0", tk.END))
+            x = parse_vector(vector_input.get())
+
+            output.delete("1.0", tk.END)
+
+            for step, x in predict_trajectory(A, x, 5):
+                vector_str = "[" + ", ".join(f"{v:.6f}" for v in x) + "]"
+                output.insert(tk.END, f"Step {step}: {vector_str}\n")
+
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    root = tk.Tk()
+    root.title("Markov Prediction (5 Steps)")
+    root.resizable(False, False)
+
+    frame = tk.Frame(root, padx=12, pady=12)
+    frame.pack()
+
+    # Matrix input
+    tk.Label(frame, text="Matrix A (rows sum to 1):").grid(row=0, column=0, sticky="w")
+    matrix_input = tk.Text(frame, height=6, width=40)
+    matrix_input.grid(row=1, column=0, padx=(0, 20))
+
+    matrix_input.insert(
+        "1.0",
+        "0.3 0.35 0.35\n"
+        "0 0 1\n"
+        "0.9 0 0.1"
+    )
+
+    # Vector input
+    right = tk.Frame(frame)
+    right.grid(row=1, column=1, sticky="n")
+
+    tk.Label(right, text="Initial vector x₀:").pack(anchor="w")
+    vector_input = tk.Entry(right, width=25)
+    vector_input.pack(pady=(0, 12))
+    vector_input.insert(0, "1 0 0")
+
+    tk.Button(
+        right,
+        text="Predict 5 Steps",
+        command=predict,
+        width=20
+    ).pack()
+
+    tk.Button(
+        right,
+        text="Load word model",
+        command=load_word_model,
+        width=20
+    ).pack(pady=(6, 0))
+
+    # Output
+    tk.Label(frame, text="Prediction output:").grid(
+        row=2, column=0, columnspan=2, sticky="w", pady=(12, 0)
+    )
+
+    output = tk.Text(
+        frame,
+        height=8,
+        width=70,
+        font=("Courier", 10)
+    )
+    output.grid(row=3, column=0, columnspan=2)
+
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,12 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import math
-import re
-import matplotlib.pyplot as plt
-
-# ---------------- Text processing ----------------
-
-def clean_text(text):
-    text = text.lower()
-    text = re.sub(r"[^a-zăâîșşțţ \n]", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
-
-def build_alphabet(t1, t2):
-    return sorted(set(t1 + t2))
-
-# ---------------- Markov model ----------------
-
-def count_transitions(text, alphabet):
-    idx = {c: i for i, c in enumerate(alphabet)}
-    n = len(alphabet)
-    M = [[0]*n for _ in range(n)]
-    for a, b in zip(text[:-1], text[1:]):
-        M[idx[a]][idx[b]] += 1
-    return M
-
-def normalize_matrix(M, alpha=1.0):
-    n = len(M)
-    P = [[0.0]*n for _ in range(n)]
-    for i in range(n):
-        row_sum = sum(M[i]) + alpha*n
-        for j in range(n):
-            P[i][j] = (M[i][j] + alpha) / row_sum
-    return P
-
-def log_likelihood_matrix(P, Q):
-    n = len(P)
-    B = [[0.0]*n for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            B[i][j] = math.log(P[i][j] / Q[i][j], 2)
-    return B
-
-def score_text(text, B, alphabet):
-    idx = {c: i for i, c in enumerate(alphabet)}
-    score = 0.0
-    for a, b in zip(text[:-1], text[1:]):
-        score += B[idx[a]][idx[b]]
-    return score
-
-def sliding_window(text, B, alphabet, win, step):
-    scores, pos = [], []
-    for i in range(0, len(text) - win + 1, step):
-        w = text[i:i+win]
-        scores.append(score_text(w, B, alphabet))
-        pos.append(i + win//2)
-    return pos, scores
+from tkinter import ttk, messagebox, filedialog, simpledialog
+
+from bioinfo import lazy
+from bioinfo.style import clean_text, StyleModels
+
+MODEL_FILETYPES = [("Style models", "*.json"), ("All files", "*.*")]
+TEXT_FILETYPES = [("Text files", "*.txt"), ("All files", "*.*")]
+AUTHOR_A, AUTHOR_B = "Eminescu", "Stănescu"
 
 # ---------------- GUI ----------------
 
@@ -64,14 +15,18 @@ class App(tk.Tk):
         super().__init__()
         self.title("Poetry Style Scanner")
         self.geometry("1200x800")
+        self.models = None
+        self.trained = {}  # text box -> cleaned text already added to its label
         self.create_widgets()
 
     def create_widgets(self):
         top = ttk.Frame(self)
         top.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        ttk.Label(top, text="Eminescu (training)").grid(row=0, column=0)
-        ttk.Label(top, text="Stănescu (training)").grid(row=0, column=1)
+        self.lbl_A = ttk.Label(top, text=f"{AUTHOR_A} (training)")
+        self.lbl_B = ttk.Label(top, text=f"{AUTHOR_B} (training)")
+        self.lbl_A.grid(row=0, column=0)
+        self.lbl_B.grid(row=0, column=1)
         ttk.Label(top, text="Test (mixture)").grid(row=0, column=2)
 
         self.txt_A = tk.Text(top, height=15)
@@ -100,7 +55,11 @@ class App(tk.Tk):
         self.step.pack(side=tk.LEFT, padx=5)
 
         ttk.Button(controls, text="Build models", command=self.build_models).pack(side=tk.LEFT, padx=10)
-        ttk.Button(controls, text="Scan + chart", command=self.scan).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Add training text", command=self.add_training).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Add source file", command=self.add_source).pack(side=tk.LEFT, padx=10)
+        ttk.Button(controls, text="Scan + chart", command=self.scan).pack(side=tk.LEFT, padx=10)
+        ttk.Button(controls, text="Save models", command=self.save_models).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Load models", command=self.load_models).pack(side=tk.LEFT, padx=10)
 
         self.output = tk.Text(self, font=("Courier", 10))
         self.output.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -113,40 +72,127 @@ class App(tk.Tk):
             messagebox.showerror("Error", "Training texts too short")
             return
 
-        L = min(len(A), len(B))
-        A, B = A[:L], B[:L]
+        self.models = StyleModels((AUTHOR_A, AUTHOR_B))
+        self.models.add_text(AUTHOR_A, A)
+        self.models.add_text(AUTHOR_B, B)
+        self.trained = {self.txt_A: A, self.txt_B: B}
+
+        self.output.delete("1.0", tk.END)
+        self.output.insert(tk.END, "Models built successfully\n")
+        self.report()
 
-        self.alphabet = build_alphabet(A, B)
-        self.MA = count_transitions(A, self.alphabet)
-        self.MB = count_transitions(B, self.alphabet)
+    def add_training(self):
+        # adauga la primele doua surse doar textul nou din casete, fara reconstruire;
+        # casetele raman neschimbate
+        if self.models is None:
+            self.build_models()
+            return
 
-        self.PA = normalize_matrix(self.MA)
-        self.PB = normalize_matrix(self.MB)
+        added = 0
+        for box, label in zip((self.txt_A, self.txt_B), self.models.labels):
+            text = clean_text(box.get("1.0", tk.END))
+            old = self.trained.get(box, "")
+            new = text[len(old):].strip() if old and text.startswith(old) else text
+            if new and text != old:
+                self.models.add_text(label, new)
+                self.trained[box] = text
+                added += 1
+        if not added:
+            messagebox.showerror("Error", "No new training text to add")
+            return
 
-        self.BETA = log_likelihood_matrix(self.PA, self.PB)
+        self.output.insert(tk.END, "Training text added\n")
+        self.report()
 
+    def add_source(self):
+        # o sursa noua (alt autor) din fisier text; clasele existente raman neschimbate
+        if self.models is None:
+            messagebox.showerror("Error", "Build the models first")
+            return
+        path = filedialog.askopenfilename(filetypes=TEXT_FILETYPES)
+        if not path:
+            return
+        name = simpledialog.askstring("Source name", "Author / source name:", parent=self)
+        if not name:
+            return
+
+        with open(path, "r", encoding="utf-8") as f:
+            text = clean_text(f.read())
+        if len(text) < 200:
+            messagebox.showerror("Error", "Training text too short")
+            return
+
+        self.models.add_text(name, text)
+        self.output.insert(tk.END, f"Source '{name}' added\n")
+        self.report()
+
+    def report(self):
+        m = self.models
+        for lbl, label in zip((self.lbl_A, self.lbl_B), m.labels):
+            lbl.config(text=f"{label} (training)")
+        lengths = ", ".join(f"{label} {m.lengths[label]}" for label in m.labels)
+        self.output.insert(tk.END, f"Alphabet size: {len(m.alphabet)}\n")
+        self.output.insert(tk.END, f"Training length: {lengths}\n\n")
+
+    def save_models(self):
+        if self.models is None:
+            messagebox.showerror("Error", "Build the models first")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=MODEL_FILETYPES)
+        if path:
+            self.models.save(path)
+            self.output.insert(tk.END, f"Models saved to {path}\n")
+
+    def load_models(self):
+        path = filedialog.askopenfilename(filetypes=MODEL_FILETYPES)
+        if not path:
+            return
+        self.models = StyleModels.load(path)
+        self.trained = {}  # the boxes' text is not part of the loaded counts
         self.output.delete("1.0", tk.END)
-        self.output.insert(tk.END, "Models built successfully\n")
-        self.output.insert(tk.END, f"Alphabet size: {len(self.alphabet)}\n")
-        self.output.insert(tk.END, f"Training length: {L}\n\n")
+        self.output.insert(tk.END, f"Models loaded from {path}\n")
+        self.report()
 
     def scan(self):
+        if self.models is None:
+            messagebox.showerror("Error", "Build the models first")
+            return
+
         T = clean_text(self.txt_T.get("1.0", tk.END))
-        if len(T) < 200:
+        if sum(c in self.models.index for c in T) < 200:
             messagebox.showerror("Error", "Test text too short")
             return
 
         win = int(self.win.get())
         step = int(self.step.get())
 
-        x, y = sliding_window(T, self.BETA, self.alphabet, win, step)
+        labels = self.models.labels
+        x, winners, margins, scores = self.models.attribute(T, win, step)
+
+        self.output.insert(tk.END, "Window attribution (start-end: source, mean margin in bits)\n")
+        run = 0
+        for i in range(1, len(winners) + 1):
+            if i == len(winners) or winners[i] != winners[run]:
+                self.output.insert(tk.END, f"{x[run]}-{x[i - 1]}: {winners[run]}, "
+                                           f"{margins[run:i].mean():.2f}\n")
+                run = i
+        self.output.insert(tk.END, "\n")
 
+        plt = lazy.pyplot()
         plt.figure()
-        plt.plot(x, y)
-        plt.axhline(0)
+        if len(labels) == 2:
+            plt.plot(x, scores[0] - scores[1])
+            plt.axhline(0)
+            plt.ylabel("Log-likelihood ratio")
+            plt.title(f"{labels[0]} (above 0) vs {labels[1]} (below 0)")
+        else:
+            for label, row in zip(labels, scores - scores.mean(axis=0)):
+                plt.plot(x, row, label=label)
+            plt.axhline(0, color="gray")
+            plt.ylabel("Log-likelihood vs. mean of sources")
+            plt.title("Most likely source per window")
+            plt.legend()
         plt.xlabel("Text position (chars)")
-        plt.ylabel("Log-likelihood ratio")
-        plt.title("Eminescu (above 0) vs Stănescu (below 0)")
         plt.show()
 
 
@@ -1,120 +1,187 @@
-import gradio as gr
-import matplotlib.pyplot as plt
 import os
-import tempfile
 
+from bioinfo import fasta, instrument, lazy
+from bioinfo.artifacts import ArtifactStore
+from bioinfo.memo import MemoCache, file_digest, fingerprint
+from bioinfo.motif_scan import motif, BIN_SIZE, bin_scores_array, scan_genome_results
 
-motif = "AGGTAAAGT"
-L = len(motif)
-bases = ["A", "C", "G", "T"]
+MAX_FILES = 10
+MAX_BATCH_SIZE = 8  # requests Gradio may merge into one analyze_genomes_batch call
+CONCURRENCY_LIMIT = 4  # batches processed at the same time
+QUEUE_SIZE = 64
+CACHE_BYTES = 256 << 20
+ARTIFACT_BYTES = 512 << 20
 
-def score_window(window):
-    return sum(1 if w == m else -1 for w, m in zip(window, motif))
+# binned signal per (file contents, name, motif, bin size); the rendered
+# PNGs live on disk in STORE under the same key, with their own budget
+CACHE = MemoCache(CACHE_BYTES, name="genome_cache")
+STORE = ArtifactStore("genome_plots", max_bytes=ARTIFACT_BYTES)
 
 
 def read_fasta(file):
-    seq = ""
-    with open(file.name, "r") as f:
-        for line in f:
-            if not line.startswith(">"):
-                seq += line.strip().upper()
-    return seq
-
-
-def scan_genome(seq):
-    positions, scores = [], []
-    for i in range(len(seq) - L + 1):
-        window = seq[i:i + L]
-        if any(b not in bases for b in window):
+    # Gradio hands over uploaded files as objects with a .name path
+    return fasta.read_fasta(file.name)
+
+
+def plot_signal(binned_pos, binned_scores, filename):
+    from bioinfo.downsample import figure_width_px, reduce_track
+
+    # a standalone Figure per genome: pyplot's global state is not thread-safe
+    fig = lazy.figure(figsize=(12, 4), dpi=150)
+    ax = fig.add_subplot()
+    # min/max per pixel column: render cost no longer grows with genome size
+    binned_pos, binned_scores = reduce_track(binned_pos, binned_scores, figure_width_px(fig))
+    ax.plot(binned_pos, binned_scores)
+    ax.axhline(0, linestyle="--", linewidth=1)
+
+    ax.set_xlabel("Genome position")
+    ax.set_ylabel("Signal score")
+    ax.set_title(f"Motif signal – {filename}")
+
+    y_min = binned_scores.min()
+    y_max = binned_scores.max()
+    ax.set_ylim(y_min - 0.5, y_max + 0.5)
+
+    fig.tight_layout()
+    return fig
+
+
+def analyze_genomes_batch(files_batch):
+    """
+    Gradio batch handler: takes one list of uploaded files per request and
+    returns one list per image output. Files already rendered or cached
+    are served as they are; the remaining distinct genomes of all requests
+    are scanned one at a time, while the next ones are read ahead in the
+    background (pipeline.pipelined), so only a few parsed genomes are in
+    memory at once.
+    """
+    from bioinfo.packed import read_fasta_packed
+    from bioinfo.pipeline import pipelined
+
+    requests = [list(files or [])[:MAX_FILES] for files in files_batch]
+    uploads = [f for files in requests for f in files]
+
+    # resubmitted files (same bytes, name and parameters) skip parse, scan and render;
+    # the name is part of the key because it is drawn in the plot title
+    params = fingerprint(motif=motif, bin_size=BIN_SIZE)
+    keys = [(file_digest(f.name), os.path.basename(f.name), params) for f in uploads]
+    cached, binned, todo = {}, {}, {}
+    for f, key in zip(uploads, keys):
+        if key in cached or key in binned:
             continue
-        positions.append(i)
-        scores.append(score_window(window))
-    return positions, scores
+        path = STORE.get(key)
+        hit = CACHE.get(key) if path is None else None
+        if path is not None:
+            cached[key] = path
+        elif hit is not None and hit[0] is None:
+            cached[key] = None  # no window scored
+        elif hit is not None:
+            binned[key] = hit  # PNG was evicted: only re-render
+        else:
+            todo.setdefault(key, f)
+
+    def load(f):
+        # 2-bit packed: a quarter of the memory of the str read_fasta returns
+        with instrument.span("parse", file=os.path.basename(f.name)):
+            return read_fasta_packed(f.name)
+
+    def scan(f, seq):
+        instrument.count("bases_processed", len(seq))
+        with instrument.span("scan"):
+            return scan_genome_results([seq])[0]
+
+    # the next genomes are read while the current one is scanned; only a
+    # few parsed genomes are held at once however many files were uploaded
+    scans = dict(zip(todo, pipelined(todo.values(), load, scan)))
+
+    images = [[None] * MAX_FILES for _ in requests]
+    keys = iter(keys)
+
+    for r, files in enumerate(requests):
+        for idx, f in enumerate(files):
+            key = next(keys)
+            if key in cached:
+                images[r][idx] = cached[key]
+                continue
+
+            if key in binned:
+                binned_pos, binned_scores = binned.pop(key)
+            else:
+                result = scans.pop(key)
+                if len(result) == 0:
+                    CACHE.put(key, (None, None), 0)
+                    cached[key] = None
+                    continue
+
+                # ---- binning (smoothing) ----
+                with instrument.span("bin"):
+                    binned_pos, binned_scores = bin_scores_array(result.positions, result.scores, BIN_SIZE)
+                CACHE.put(key, (binned_pos, binned_scores))
+
+            # ---- plot ----
+            # rendered to an in-memory PNG and written once under the key's digest
+            filename = os.path.basename(f.name)
+            with instrument.span("render", file=filename):
+                fig = plot_signal(binned_pos, binned_scores, filename)
+                cached[key] = images[r][idx] = STORE.put_figure(key, fig)
+
+    # Gradio batch functions return one list per output component
+    return [list(column) for column in zip(*images)]
+
+
+async def analyze_genomes_async(files_batch):
+    # scanning and rendering run in a worker thread, off the event loop
+    import asyncio
+    return await asyncio.to_thread(analyze_genomes_batch, files_batch)
 
 
 def analyze_genomes(files):
     if files is None:
-        return [None] * 10
-
-    images = []
-    tmpdir = tempfile.mkdtemp()
-    BIN_SIZE = 100  # netezire semnal
-
-    for idx, f in enumerate(files[:10]):
-        seq = read_fasta(f)
-        if len(seq) < L:
-            images.append(None)
-            continue
-
-        positions, scores = scan_genome(seq)
-
-        # ---- binning (smoothing) ----
-        binned_pos = []
-        binned_scores = []
-        for i in range(0, len(scores), BIN_SIZE):
-            chunk = scores[i:i + BIN_SIZE]
-            if chunk:
-                binned_scores.append(sum(chunk) / len(chunk))
-                binned_pos.append(positions[i])
-
-        # ---- plot ----
-        filename = os.path.basename(f.name)
-
-        plt.figure(figsize=(12, 4), dpi=150)
-        plt.plot(binned_pos, binned_scores)
-        plt.axhline(0, linestyle="--", linewidth=1)
-
-        plt.xlabel("Genome position")
-        plt.ylabel("Signal score")
-        plt.title(f"Motif signal – {filename}")
-
-        y_min = min(binned_scores)
-        y_max = max(binned_scores)
-        plt.ylim(y_min - 0.5, y_max + 0.5)
-
-        plt.tight_layout()
-
-        out_path = os.path.join(tmpdir, f"genome_{idx}.png")
-        plt.savefig(out_path)
-        plt.close()
-
-        images.append(out_path)
-
-    # completăm până la 10 outputs (cerință Gradio)
-    while len(images) < 10:
-        images.append(None)
-
-    return images
-
-
-
-with gr.Blocks(title="Exercise 2 – Influenza Genome Motif Scan") as demo:
-    gr.Markdown("# Exercise 2 – Influenza Genome Motif Scan")
-    gr.Markdown(
-        "Upload up to 10 genome FASTA files. Each genome is scanned independently. "
-        "For each genome, a separate signal plot is generated showing the most likely "
-        "locations of functional motifs."
-    )
-
-    genome_files = gr.File(
-        label="Upload genome FASTA files (max 10)",
-        file_types=[".fa", ".fasta", ".txt"],
-        file_count="multiple"
-    )
-
-    run_btn = gr.Button("Run scan")
-
-    gr.Markdown("## Signal plots (one per genome)")
-
-    img_outputs = [
-        gr.Image(label=f"Genome {i+1}", interactive=False)
-        for i in range(10)
-    ]
-
-    run_btn.click(
-        fn=analyze_genomes,
-        inputs=genome_files,
-        outputs=img_outputs
-    )
-
-demo.launch()
+        return [None] * MAX_FILES
+    return [column[0] for column in analyze_genomes_batch([files])]
+
+
+def build_demo():
+    import gradio as gr
+
+    # Gradio keeps its own copy of every returned file; expire those too
+    with gr.Blocks(title="Exercise 2 – Influenza Genome Motif Scan",
+                   delete_cache=(3600, STORE.max_age)) as demo:
+        gr.Markdown("# Exercise 2 – Influenza Genome Motif Scan")
+        gr.Markdown(
+            "Upload up to 10 genome FASTA files. Each genome is scanned independently. "
+            "For each genome, a separate signal plot is generated showing the most likely "
+            "locations of functional motifs."
+        )
+
+        genome_files = gr.File(
+            label="Upload genome FASTA files (max 10)",
+            file_types=[".fa", ".fasta", ".txt", ".gz", ".bgz"],
+            file_count="multiple"
+        )
+
+        run_btn = gr.Button("Run scan")
+
+        gr.Markdown("## Signal plots (one per genome)")
+
+        img_outputs = [
+            gr.Image(label=f"Genome {i+1}", interactive=False)
+            for i in range(MAX_FILES)
+        ]
+
+        run_btn.click(
+            fn=analyze_genomes_async,
+            inputs=genome_files,
+            outputs=img_outputs,
+            batch=True,
+            max_batch_size=MAX_BATCH_SIZE,
+            concurrency_limit=CONCURRENCY_LIMIT,
+            api_name="scan"
+        )
+
+    demo.queue(max_size=QUEUE_SIZE)
+    return demo
+
+
+if __name__ == "__main__":
+    build_demo().launch()
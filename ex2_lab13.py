@@ -3,130 +3,106 @@ import tkinter as tk
 from tkinter import messagebox, filedialog
 import json
 
-NUCLEOTIDES = ["A", "C", "G", "T"]
+from bioinfo.markov import NUCLEOTIDES, compute_transition_matrix
 
 
+def main():
+    def calculate():
+        seq = seq_input.get().strip().upper()
 
-def compute_transition_matrix(sequence):
-    sequence = sequence.upper()
+        if not seq:
+            messagebox.showerror("Error", "DNA sequence is empty")
+            return
 
-    counts = {
-        a: {b: 0 for b in NUCLEOTIDES}
-        for a in NUCLEOTIDES
-    }
+        if any(c not in NUCLEOTIDES for c in seq):
+            messagebox.showerror(
+                "Error",
+                "Sequence must contain only A, C, G, T"
+            )
+            return
 
-    for i in range(len(sequence) - 1):
-        a = sequence[i]
-        b = sequence[i + 1]
-        counts[a][b] += 1
+        if len(seq) < 2:
+            messagebox.showerror(
+                "Error",
+                "Sequence must contain at least 2 letters"
+            )
+            return
 
-    matrix = {}
-    for a in NUCLEOTIDES:
-        total = sum(counts[a].values())
-        if total == 0:
-            matrix[a] = {b: 0.0 for b in NUCLEOTIDES}
-        else:
-            matrix[a] = {
-                b: counts[a][b] / total
-                for b in NUCLEOTIDES
-            }
+        matrix = compute_transition_matrix(seq)
 
-    return matrix
+        output.delete("1.0", tk.END)
+        for a in NUCLEOTIDES:
+            row = "  ".join(f"{matrix[a][b]:.4f}" for b in NUCLEOTIDES)
+            output.insert(tk.END, f"{a} → {row}\n")
 
+        output.matrix = matrix  # stash for saving
 
-def calculate():
-    seq = seq_input.get().strip().upper()
+    def save_json():
+        if not hasattr(output, "matrix"):
+            messagebox.showerror("Error", "Nothing to save")
+            return
 
-    if not seq:
-        messagebox.showerror("Error", "DNA sequence is empty")
-        return
-
-    if any(c not in NUCLEOTIDES for c in seq):
-        messagebox.showerror(
-            "Error",
-            "Sequence must contain only A, C, G, T"
-        )
-        return
-
-    if len(seq) < 2:
-        messagebox.showerror(
-            "Error",
-            "Sequence must contain at least 2 letters"
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json")]
         )
-        return
-
-    matrix = compute_transition_matrix(seq)
 
-    output.delete("1.0", tk.END)
-    for a in NUCLEOTIDES:
-        row = "  ".join(f"{matrix[a][b]:.4f}" for b in NUCLEOTIDES)
-        output.insert(tk.END, f"{a} → {row}\n")
+        if not path:
+            return
 
-    output.matrix = matrix  # stash for saving
-
-def save_json():
-    if not hasattr(output, "matrix"):
-        messagebox.showerror("Error", "Nothing to save")
-        return
-
-    path = filedialog.asksaveasfilename(
-        defaultextension=".json",
-        filetypes=[("JSON files", "*.json")]
-    )
+        with open(path, "w") as f:
+            json.dump(output.matrix, f, indent=4)
 
-    if not path:
-        return
+        messagebox.showinfo("Saved", "Transition matrix saved successfully")
 
-    with open(path, "w") as f:
-        json.dump(output.matrix, f, indent=4)
+    root = tk.Tk()
+    root.title("DNA Transition Matrix")
+    root.resizable(False, False)
 
-    messagebox.showinfo("Saved", "Transition matrix saved successfully")
+    frame = tk.Frame(root, padx=12, pady=12)
+    frame.pack()
 
+    tk.Label(
+        frame,
+        text="DNA sequence (A, C, G, T):"
+    ).grid(row=0, column=0, sticky="w")
 
-root = tk.Tk()
-root.title("DNA Transition Matrix")
-root.resizable(False, False)
+    seq_input = tk.Entry(frame, width=60)
+    seq_input.grid(row=1, column=0, columnspan=2, pady=(0, 8))
 
-main = tk.Frame(root, padx=12, pady=12)
-main.pack()
-
-tk.Label(
-    main,
-    text="DNA sequence (A, C, G, T):"
-).grid(row=0, column=0, sticky="w")
-
-seq_input = tk.Entry(main, width=60)
-seq_input.grid(row=1, column=0, columnspan=2, pady=(0, 8))
-
-seq_input.insert(
-    0,
-    "ACGTGCTAGCTAGCTAGCGTACGTAGCTAGCTAGCGTAGCTAGCTAGC"
-)
+    seq_input.insert(
+        0,
+        "ACGTGCTAGCTAGCTAGCGTACGTAGCTAGCTAGCGTAGCTAGCTAGC"
+    )
 
-tk.Button(
-    main,
-    text="Calculate transition matrix",
-    command=calculate,
-    width=30
-).grid(row=2, column=0, pady=6, sticky="w")
+    tk.Button(
+        frame,
+        text="Calculate transition matrix",
+        command=calculate,
+        width=30
+    ).grid(row=2, column=0, pady=6, sticky="w")
+
+    tk.Button(
+        frame,
+        text="Save as JSON",
+        command=save_json,
+        width=20
+    ).grid(row=2, column=1, pady=6, sticky="e")
+
+    tk.Label(frame, text="Transition matrix:").grid(
+        row=3, column=0, columnspan=2, sticky="w", pady=(8, 0)
+    )
 
-tk.Button(
-    main,
-    text="Save as JSON",
-    command=save_json,
-    width=20
-).grid(row=2, column=1, pady=6, sticky="e")
+    output = tk.Text(
+        frame,
+        height=8,
+        width=60,
+        font=("Courier", 10)
+    )
+    output.grid(row=4, column=0, columnspan=2)
 
-tk.Label(main, text="Transition matrix:").grid(
-    row=3, column=0, columnspan=2, sticky="w", pady=(8, 0)
-)
+    root.mainloop()
 
-output = tk.Text(
-    main,
-    height=8,
-    width=60,
-    font=("Courier", 10)
-)
-output.grid(row=4, column=0, columnspan=2)
 
-root.mainloop()
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,9 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import json
-import random
 
+from bioinfo.markov import generate_dna, generate_text
 
-def weighted_choice(prob_map):
-    r = random.random()
-    acc = 0.0
-    for k, p in prob_map.items():
-        acc += p
-        if r <= acc:
-            return k
-    return next(iter(prob_map))
 
 class MarkovGeneratorApp:
     def __init__(self, root):
@@ -99,56 +91,35 @@ class MarkovGeneratorApp:
 
     def generate_dna(self, length):
         start = self.start_entry.get().strip().upper()
-        states = list(self.model.keys())
 
-        if start == "":
-            start = random.choice(states)
-        if start not in self.model:
-            messagebox.showerror("Error", "Invalid start symbol for DNA")
+        try:
+            seq = generate_dna(self.model, length, start)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
 
-        seq = [start]
-        cur = start
-        for _ in range(length - 1):
-            cur = weighted_choice(self.model[cur])
-            seq.append(cur)
-
         self.output.delete("1.0", tk.END)
-        self.output.insert(tk.END, "".join(seq))
+        self.output.insert(tk.END, seq)
 
 
     def generate_text(self, length):
-        word_to_id = self.model["word_to_id"]
-        id_to_word = {int(k): v for k, v in self.model["id_to_word"].items()}
-        transition = {
-            int(k): {int(j): p for j, p in v.items()}
-            for k, v in self.model["transition_matrix"].items()
-        }
-
         start_word = self.start_entry.get().strip().lower()
 
-        if start_word:
-            if start_word not in word_to_id:
-                messagebox.showerror("Error", "Start word not in model")
-                return
-            cur = int(word_to_id[start_word])
-        else:
-            cur = random.choice([i for i in transition if transition[i]])
+        try:
+            text = generate_text(self.model, length, start_word)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
 
-        words = [id_to_word[cur]]
+        self.output.delete("1.0", tk.END)
+        self.output.insert(tk.END, text)
 
-        for _ in range(length - 1):
-            row = transition.get(cur, {})
-            if not row:
-                cur = random.choice([i for i in transition if transition[i]])
-            else:
-                cur = weighted_choice(row)
-            words.append(id_to_word[cur])
 
-        self.output.delete("1.0", tk.END)
-        self.output.insert(tk.END, " ".join(words))
+def main():
+    root = tk.Tk()
+    app = MarkovGeneratorApp(root)
+    root.mainloop()
 
 
-root = tk.Tk()
-app = MarkovGeneratorApp(root)
-root.mainloop()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import numpy as np
+
+from bioinfo.aa_index import AMINO_ACIDS, AminoAcidIndex, composition, write_index
+
+NAMES = [f"g{i}" for i in range(40)]
+
+
+def _index(tmp_path):
+    rng = np.random.default_rng(0)
+    counts = rng.integers(0, 1000, (len(NAMES), len(AMINO_ACIDS)))
+    counts[3] = 0  # empty genome
+    return write_index(str(tmp_path), NAMES, counts), counts
+
+
+def test_reopened_index_is_memory_mapped(tmp_path):
+    index, counts = _index(tmp_path)
+    again = AminoAcidIndex(str(tmp_path))
+    assert isinstance(again.freqs, np.memmap)
+    assert np.array_equal(again.counts, counts)
+
+
+def test_top_and_with_top(tmp_path):
+    index, counts = _index(tmp_path)
+    for i, name in enumerate(NAMES):
+        ranked = sorted(range(len(AMINO_ACIDS)), key=lambda j: (-counts[i, j], j))[:3]
+        assert index.top(name) == [(AMINO_ACIDS[j], counts[i, j]) for j in ranked]
+    wanted = [aa for aa, _ in index.top("g7")]
+    assert "g7" in index.with_top(wanted, ordered=True)
+    assert "g7" in index.with_top(wanted[::-1])
+    assert set(index.with_top(wanted, ordered=True)) <= set(index.with_top(wanted))
+
+
+def test_similar_matches_brute_force(tmp_path):
+    index, counts = _index(tmp_path)
+    norms = np.linalg.norm(counts, axis=1, keepdims=True)
+    unit = counts / np.where(norms > 0, norms, 1)
+    sims = unit @ unit[5]
+    sims[5] = -np.inf
+    expected = [NAMES[i] for i in np.argsort(-sims, kind="stable")[:6]]
+    result = index.similar("g5", n=6, block=7)
+    assert [name for name, _ in result] == expected
+    assert np.allclose([s for _, s in result], np.sort(sims)[::-1][:6], atol=1e-5)
+    assert len(index.similar(counts[5], n=100)) == len(NAMES)
+
+
+def test_composition():
+    counts = composition("ATGGCTGCATAA")  # Met Ala Ala Stop
+    assert counts.sum() == 3
+    assert counts[AMINO_ACIDS.index("Ala")] == 2
@@ -0,0 +1,63 @@
+import os
+import time
+
+import pytest
+
+from bioinfo import artifacts
+from bioinfo.artifacts import ArtifactStore
+
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOINFO_ARTIFACTS", str(tmp_path))
+    return tmp_path
+
+
+def test_directory_created_on_first_write(base):
+    store = ArtifactStore("plots")
+    assert store.root == os.path.join(str(base), "plots")
+    assert not os.path.exists(store.root)
+    assert store.get("key") is None
+    path = store.put_bytes("key", b"png")
+    assert os.path.dirname(path) == store.root
+    assert store.get("key") == path
+    assert store.stats()["bytes"] == 3
+
+
+def test_stores_do_not_evict_each_other(base):
+    small = ArtifactStore("small", max_bytes=10)
+    other = ArtifactStore("other")
+    kept = other.put_bytes("keep", b"x" * 8)
+    for i in range(5):
+        small.put_bytes(i, b"y" * 4)
+    assert os.path.exists(kept)
+    assert small.nbytes <= 10
+    assert len(os.listdir(small.root)) == 2
+
+
+def test_expired_files_and_stale_temp_files_are_swept(base):
+    store = ArtifactStore("plots", max_age=60)
+    old = store.put_bytes("old", b"1")
+    stale = os.path.join(store.root, ".tmp-dead")
+    fresh = os.path.join(store.root, ".tmp-live")
+    for path in (stale, fresh):
+        open(path, "wb").close()
+    past = time.time() - artifacts.TEMP_MAX_AGE - 10
+    os.utime(old, (past, past))
+    os.utime(stale, (past, past))
+
+    store._next_sweep = 0
+    store.put_bytes("new", b"2")
+    assert not os.path.exists(old)
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+
+
+def test_failed_write_leaves_no_temp_file(base):
+    store = ArtifactStore("exports")
+
+    def write(tmp):
+        raise RuntimeError("disk full")
+    with pytest.raises(RuntimeError):
+        store.put_file("key", write, ".csv")
+    assert os.listdir(store.root) == []
@@ -0,0 +1,83 @@
+import gzip
+import os
+
+import numpy as np
+import pytest
+
+from bioinfo.bgzf import block_index, compress_bgzf, iter_decompressed, read_range
+from bioinfo.fasta import build_fai, fetch_region, read_fasta, read_fasta_records
+
+RECORDS = {
+    "chr1": 150_000,
+    "chr2": 7,
+    "chr3": 90_001,
+}
+
+
+def _write_fasta(path, width=60):
+    rng = np.random.default_rng(0)
+    seqs = {}
+    with open(path, "w") as f:
+        for name, n in RECORDS.items():
+            seq = "".join(rng.choice(list("ACGTNacgt"), n))
+            seqs[name] = seq
+            f.write(f">{name} test record\n")
+            for i in range(0, n, width):
+                f.write(seq[i:i + width] + "\n")
+    return seqs
+
+
+@pytest.fixture(scope="module")
+def files(tmp_path_factory):
+    root = tmp_path_factory.mktemp("bgzf")
+    plain = str(root / "genome.fa")
+    seqs = _write_fasta(plain)
+    bgz = plain + ".bgz"
+    compress_bgzf(plain, bgz, threads=2)
+    no_gzi = str(root / "copy.fa.bgz")
+    with open(bgz, "rb") as src, open(no_gzi, "wb") as dst:
+        dst.write(src.read())
+    return plain, bgz, no_gzi, seqs
+
+
+def test_bgzf_is_valid_gzip(files):
+    plain, bgz, _, _ = files
+    with open(plain, "rb") as f, gzip.open(bgz, "rb") as g:
+        assert g.read() == f.read()
+    with open(plain, "rb") as f:
+        assert b"".join(iter_decompressed(bgz, threads=2)) == f.read()
+
+
+def test_block_index_from_headers_matches_gzi(files):
+    plain, bgz, no_gzi, _ = files
+    assert not os.path.exists(no_gzi + ".gzi")
+    coffsets, uoffsets = block_index(bgz)
+    c, u = block_index(no_gzi)
+    assert (c[:len(coffsets)], u[:len(uoffsets)]) == (coffsets, uoffsets)
+    # the header walk also lists the empty EOF block, which .gzi leaves out
+    assert u[len(uoffsets):] == [os.path.getsize(plain)]
+
+
+def test_read_range(files):
+    plain, bgz, _, _ = files
+    with open(plain, "rb") as f:
+        data = f.read()
+    for start, end in [(0, 10), (65270, 65290), (1000, 200_000), (len(data) - 5, len(data) + 10)]:
+        assert read_range(bgz, start, end) == data[start:end]
+
+
+def test_fetch_region_matches_slicing(files):
+    plain, bgz, _, seqs = files
+    assert build_fai(bgz) == build_fai(plain)
+    for name, seq in seqs.items():
+        seq = seq.upper()
+        for start, end in [(0, 1), (0, len(seq)), (59, 61), (65_000, 140_000), (len(seq) - 3, len(seq) + 5)]:
+            expected = seq[max(start, 0):end]
+            assert fetch_region(plain, name, start, end) == expected
+            assert fetch_region(bgz, name, start, end) == expected
+
+
+def test_readers_accept_bgzf(files):
+    plain, bgz, _, seqs = files
+    assert read_fasta(bgz) == read_fasta(plain)
+    assert [(h.split()[0], s) for h, s in read_fasta_records(bgz)] == [(n, s.upper()) for n, s in seqs.items()]
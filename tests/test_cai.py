@@ -0,0 +1,31 @@
+import numpy as np
+
+from bioinfo.cai import cai_batch, codon_indices, reference_weights, rscu_batch
+from bioinfo.codon_distance import usage_frequencies
+from bioinfo.codons import codon_count, dna_to_rna
+from bioinfo.fasta import read_fasta
+
+DNA = "ATGGCTGCAAAGTTTCTGCTCAGCTAA"
+RNA = DNA.replace("T", "U")
+
+
+def _weights():
+    return reference_weights(codon_count(dna_to_rna(read_fasta("covid19.fasta"))))
+
+
+def test_codon_indices_rna_matches_dna():
+    assert (codon_indices(RNA) == codon_indices(DNA)).all()
+    assert (codon_indices(RNA.lower()) >= 0).all()
+
+
+def test_cai_of_rna_gene():
+    log_w, informative = _weights()
+    dna, rna = cai_batch([DNA, RNA], log_w, informative)
+    assert not np.isnan(rna)
+    assert rna == dna
+    assert not np.isnan(cai_batch(["AUGGCU"], log_w, informative)[0])
+
+
+def test_rscu_and_usage_of_rna_gene():
+    assert np.array_equal(rscu_batch([RNA]), rscu_batch([DNA]), equal_nan=True)
+    assert np.array_equal(usage_frequencies([RNA]), usage_frequencies([DNA]))
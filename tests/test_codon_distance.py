@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from scipy.spatial.distance import cdist, jensenshannon
+
+from bioinfo.codon_distance import nearest_neighbors, pairwise_distances, usage_frequencies
+
+
+def _frequencies(n, seed):
+    rng = np.random.default_rng(seed)
+    F = rng.random((n, 64)) ** 3
+    F[0] = 0  # a genome without a complete codon
+    return F / np.maximum(F.sum(axis=1, keepdims=True), 1e-300)
+
+
+def test_usage_frequencies():
+    F = usage_frequencies(["AAAAAATTT", "NNNAAA", ""])
+    assert F.shape == (3, 64)
+    assert np.allclose(F.sum(axis=1), [1, 1, 0])
+
+
+@pytest.mark.parametrize("metric, reference", [
+    ("euclidean", lambda F: cdist(F, F)),
+    ("cosine", None),
+    ("jensenshannon", lambda F: cdist(F, F, lambda p, q: jensenshannon(p, q, base=2) if p.any() and q.any() else np.nan)),
+])
+def test_blocked_distances_match_reference(metric, reference, tmp_path):
+    F = _frequencies(37, 0)
+    if reference is None:
+        norms = np.linalg.norm(F, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            expected = np.nan_to_num(1 - (F @ F.T) / np.outer(norms, norms), nan=1.0)
+        np.fill_diagonal(expected, 0)
+    else:
+        expected = reference(F)
+    in_memory = pairwise_distances(F, metric, block=8)
+    on_disk = pairwise_distances(F, metric, path=str(tmp_path / "d.npy"), block=5)
+    # scipy leaves Jensen-Shannon undefined for the empty genome
+    known = ~np.isnan(expected)
+    assert np.allclose(in_memory[known], expected[known], atol=1e-5)
+    assert np.array_equal(np.load(str(tmp_path / "d.npy")), in_memory)
+    assert np.array_equal(in_memory, in_memory.T)
+    assert np.array_equal(on_disk, in_memory)
+
+
+def test_nearest_neighbors_match_full_sort():
+    D = pairwise_distances(_frequencies(50, 1)[1:])
+    indices, distances = nearest_neighbors(D, k=4, block=7)
+    masked = D + np.diag(np.full(len(D), np.inf))
+    assert np.allclose(distances, np.sort(masked, axis=1)[:, :4])
+    assert np.allclose(np.take_along_axis(masked, indices, axis=1), distances)
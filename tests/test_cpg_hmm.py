@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from bioinfo.cpg_hmm import build_hmm, islands, posterior, segment_records, viterbi
+from bioinfo.cpg import count_transitions
+from bioinfo.encoding import encode_bases
+
+
+def _random(alphabet, n, rng):
+    return "".join(rng.choice(list(alphabet), n))
+
+_rng = np.random.default_rng(42)
+# + model trained on C/G-rich text, - model on A/T-rich text
+HMM = build_hmm(count_transitions(_random("CCGGA", 5000, _rng)), count_transitions(_random("AATTCG", 5000, _rng)),
+                island_length=100, background_length=300)
+
+
+def _emissions(seq):
+    # every state emits its own base: state s (A+..T+, A-..T-) needs base s % 4
+    x = encode_bases(seq).astype(int)
+    return np.where(np.arange(8)[None, :] % 4 == x[:, None], 0.0, -np.inf)
+
+def naive_viterbi(seq, hmm):
+    log_start, log_trans = hmm
+    E = _emissions(seq)
+    v = log_start + E[0]
+    back = []
+    for e in E[1:]:
+        scores = v[:, None] + log_trans
+        back.append(scores.argmax(axis=0))
+        v = scores.max(axis=0) + e
+    path = [int(v.argmax())]
+    for b in reversed(back):
+        path.append(int(b[path[-1]]))
+    return (np.array(path[::-1]) < 4).astype(np.uint8)
+
+def naive_posterior(seq, hmm):
+    log_start, log_trans = hmm
+    E = _emissions(seq)
+    n = len(E)
+    F, B = np.empty((n, 8)), np.zeros((n, 8))
+    F[0] = log_start + E[0]
+    for t in range(1, n):
+        F[t] = np.logaddexp.reduce(F[t - 1][:, None] + log_trans, axis=0) + E[t]
+    for t in range(n - 2, -1, -1):
+        B[t] = np.logaddexp.reduce(log_trans + (E[t + 1] + B[t + 1])[None, :], axis=1)
+    post = F + B
+    post -= np.logaddexp.reduce(post, axis=1, keepdims=True)
+    return np.exp(post[:, :4]).sum(axis=1)
+
+
+def _sequence(n, seed):
+    # mixed stretches, so both kinds of state are visited
+    rng = np.random.default_rng(seed)
+    parts = []
+    while sum(map(len, parts)) < n:
+        alphabet = "CCGGA" if rng.random() < 0.4 else "AATTCG"
+        parts.append(_random(alphabet, rng.integers(20, 150), rng))
+    return "".join(parts)[:n]
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 7, 64, 1 << 18])
+def test_viterbi_matches_naive(chunk):
+    seq = _sequence(600, 0)
+    expected = naive_viterbi(seq, HMM)
+    assert expected.any() and not expected.all()
+    assert np.array_equal(viterbi(seq, HMM, chunk=chunk), expected)
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 50, 1 << 18])
+def test_posterior_matches_naive(chunk):
+    seq = _sequence(600, 1)
+    assert np.allclose(posterior(seq, HMM, chunk=chunk), naive_posterior(seq, HMM), atol=1e-5)
+
+
+def test_n_runs_split_the_sequence():
+    a, b = _sequence(300, 2), _sequence(200, 3)
+    seq = a + "N" * 10 + b
+    track = posterior(seq, HMM, chunk=32)
+    assert np.allclose(track[:300], naive_posterior(a, HMM), atol=1e-5)
+    assert (track[300:310] == 0).all()
+    assert np.allclose(track[310:], naive_posterior(b, HMM), atol=1e-5)
+
+
+def test_segment_records_matches_islands():
+    records = [(f"r{i}", _sequence(400, 10 + i)) for i in range(5)]
+    expected = [(h, islands(naive_viterbi(s, HMM))) for h, s in records]
+    assert segment_records(records, HMM, processes=1) == expected
+    assert segment_records(iter(records), HMM, processes=2) == expected
@@ -0,0 +1,23 @@
+import numpy as np
+
+from bioinfo.downsample import minmax_envelope, reduce_track
+
+
+def test_envelope_keeps_every_extreme():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=10_007)
+    y[1234], y[9000] = 50, -50
+    x = np.arange(len(y)) * 3
+    rx, ry = reduce_track(x, y, 100)
+    assert len(ry) <= 2 * 100 + 2
+    assert np.all(np.diff(rx) > 0)
+    assert ry.max() == 50 and ry.min() == -50
+    # each column's min and max survive
+    for column in np.array_split(y[:100 * (len(y) // 100)], 100):
+        assert column.max() in ry and column.min() in ry
+
+
+def test_short_tracks_are_unchanged():
+    x, y = np.arange(10), np.arange(10.0)
+    rx, ry = minmax_envelope(x, y, 5)
+    assert np.array_equal(rx, x) and np.array_equal(ry, y)
@@ -0,0 +1,39 @@
+import random
+
+from bioinfo.kmers import count_kmers, count_records
+
+
+def _records(n, seed=0):
+    rng = random.Random(seed)
+    return [(f"r{i}", "".join(rng.choice("ACGTN") for _ in range(rng.randint(0, 300)))) for i in range(n)]
+
+
+def test_all_n_record_has_no_kmers():
+    counts = count_kmers("N" * 100, 21)
+    assert len(counts) == 0
+    assert counts.total == 0
+
+
+def test_n_gap_longer_than_chunk():
+    seq = "N" * 100 + "ACGT" * 10
+    counts = count_kmers(seq, 21, chunk=50)
+    assert counts.to_dict() == count_kmers("ACGT" * 10, 21).to_dict()
+    assert counts.total == 40 - 21 + 1
+
+
+def test_n_gap_canonical():
+    seq = "ACGTTGCA" * 5 + "N" * 200 + "TTGACCA" * 6
+    counts = count_kmers(seq, 15, canonical=True, chunk=64)
+    expected = count_kmers("ACGTTGCA" * 5, 15, canonical=True).merge(
+        count_kmers("TTGACCA" * 6, 15, canonical=True))
+    assert counts.to_dict() == expected.to_dict()
+
+
+def test_count_records_matches_single_counts():
+    records = _records(25)
+    expected = count_kmers("", 13)
+    for _, seq in records:
+        expected = expected.merge(count_kmers(seq, 13))
+    for processes in (1, 2):
+        assert count_records(records, 13, processes=processes).to_dict() == expected.to_dict()
+
@@ -0,0 +1,42 @@
+import numpy as np
+
+from bioinfo.memo import MemoCache, content_digest, file_digest, fingerprint
+
+
+def test_fingerprint_is_order_independent():
+    assert fingerprint(a=1, b=[1, 2]) == fingerprint(b=[1, 2], a=1)
+    assert fingerprint(a=1) != fingerprint(a=2)
+
+
+def test_digests(tmp_path):
+    path = tmp_path / "x.txt"
+    path.write_bytes(b"ACGT")
+    assert file_digest(str(path)) == content_digest(b"ACGT") == content_digest("ACGT")
+
+
+def test_lru_eviction_by_bytes():
+    cache = MemoCache(max_bytes=3000)
+    for key in "abc":
+        cache.put(key, np.zeros(100))  # 800 bytes each
+    assert cache.get("a") is not None  # a becomes the most recently used
+    cache.put("d", np.zeros(100))
+    assert cache.get("b") is None
+    assert all(cache.get(k) is not None for k in "acd")
+    assert cache.nbytes == 2400 and cache.evictions == 1
+
+
+def test_oversized_values_are_not_cached():
+    cache = MemoCache(max_bytes=100)
+    value = cache.put("big", np.zeros(100))
+    assert value is not None and len(cache) == 0
+
+
+def test_get_or_compute_and_discard():
+    cache = MemoCache()
+    calls = []
+    compute = lambda: calls.append(1) or "value"
+    assert cache.get_or_compute("k", compute) == "value"
+    assert cache.get_or_compute("k", compute) == "value"
+    assert len(calls) == 1
+    cache.discard("k")
+    assert len(cache) == 0 and cache.nbytes == 0
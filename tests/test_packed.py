@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from bioinfo.packed import PackedSequence, read_fasta_packed
+
+COMPLEMENT = str.maketrans("ACGTN", "TGCAN")
+
+
+def _random_dna(n, seed):
+    rng = np.random.default_rng(seed)
+    seq = rng.choice(list("ACGT"), n)
+    # N runs of several lengths, including at the ends
+    for start in rng.integers(0, max(n, 1), 5):
+        seq[start:start + rng.integers(1, 40)] = "N"
+    return "".join(seq)
+
+
+@pytest.mark.parametrize("n", [0, 1, 3, 4, 5, 1001])
+def test_round_trip(n):
+    seq = _random_dna(n, n)
+    packed = PackedSequence.from_string(seq)
+    assert len(packed) == n
+    assert str(packed) == seq
+    assert packed.nbytes < max(n, 64)
+
+
+def test_rna_round_trip():
+    packed = PackedSequence.from_string("ACGUUNNAGU")
+    assert str(packed) == "ACGUUNNAGU"
+    assert str(packed.as_dna()) == "ACGTTNNAGT"
+
+
+def test_reverse_complement_matches_string():
+    seq = _random_dna(777, 1)
+    packed = PackedSequence.from_string(seq)
+    assert str(packed.reverse_complement()) == seq.translate(COMPLEMENT)[::-1]
+
+
+def test_slicing_matches_string():
+    seq = _random_dna(500, 2)
+    packed = PackedSequence.from_string(seq)
+    for key in [slice(0, 100), slice(4, 404), slice(3, 250), slice(None, None, 3), slice(300, 10, -7), slice(-20, None)]:
+        assert str(packed[key]) == seq[key]
+    assert packed[7] == seq[7] and packed[-1] == seq[-1]
+
+
+def test_kmers_and_codons_skip_n():
+    seq = "ACGTNACGTACG"
+    packed = PackedSequence.from_string(seq)
+    positions, _ = packed.kmers(3)
+    assert list(positions) == [i for i in range(len(seq) - 2) if "N" not in seq[i:i + 3]]
+    assert packed.codon_counts() == {"ACG": 2, "CGT": 1}
+
+
+def test_read_fasta_packed(tmp_path, monkeypatch):
+    import bioinfo.packed as packed_module
+    monkeypatch.setattr(packed_module, "FASTA_CHUNK", 37)  # N runs across chunk edges
+    seq = _random_dna(2000, 3)
+    path = tmp_path / "x.fa"
+    path.write_text(">x\n" + "\n".join(seq[i:i + 60] for i in range(0, len(seq), 60)) + "\n")
+    packed = read_fasta_packed(str(path))
+    assert str(packed) == seq
+    assert packed == PackedSequence.from_string(seq)
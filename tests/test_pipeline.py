@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from bioinfo.pipeline import bounded_map, pipelined
+
+
+def test_bounded_map_keeps_order_and_window():
+    drawn = []
+
+    def items():
+        for i in range(50):
+            drawn.append(i)
+            yield i
+
+    out = []
+    with ThreadPoolExecutor(4) as pool:
+        for value in bounded_map(pool, lambda i: i * i, items(), window=3):
+            assert len(drawn) - len(out) <= 3
+            out.append(value)
+    assert out == [i * i for i in range(50)]
+
+
+def test_pipelined_order():
+    out = list(pipelined(range(20), lambda i: i + 1, lambda i, v: (i, v), compute_workers=3))
+    assert out == [(i, i + 1) for i in range(20)]
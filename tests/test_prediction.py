@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from bioinfo.prediction import predict_steps, predict_trajectory, sparse_trajectory
+
+A = np.array([[0.9, 0.1], [0.5, 0.5]])
+X = np.array([1.0, 0.0])
+
+
+def test_numpy_integer_steps():
+    expected = X @ np.linalg.matrix_power(A, 40)
+    assert np.allclose(predict_steps(A, X, np.int64(40)), expected)
+    assert np.allclose(predict_steps(A, np.stack([X] * 3), np.int32(40)), [expected] * 3)
+
+
+def test_invalid_steps():
+    with pytest.raises(ValueError):
+        predict_steps(A, X, -1)
+    with pytest.raises(TypeError):
+        predict_steps(A, X, 2.0)
+
+
+def test_trajectories_check_steps():
+    from scipy.sparse import csr_matrix
+
+    assert [step for step, _ in predict_trajectory(A, X, np.int64(3))] == [1, 2, 3]
+    for trajectory in (lambda s: predict_trajectory(A, X, s), lambda s: sparse_trajectory(csr_matrix(A), X, s)):
+        with pytest.raises(ValueError):
+            list(trajectory(-1))
+        with pytest.raises(TypeError):
+            list(trajectory(1.5))
@@ -0,0 +1,55 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from bioinfo.pwm import (
+    build_pwm, pwm_array, scan_batch, scan_sequence, scan_threshold, score_batch, score_cutoff,
+)
+
+W = pwm_array(build_pwm()[2])
+
+
+def _random_dna(n, seed, n_fraction=0.0):
+    rng = np.random.default_rng(seed)
+    seq = rng.choice(list("ACGT"), n)
+    seq[rng.random(n) < n_fraction] = "N"
+    return "".join(seq)
+
+
+def test_score_batch_matches_scan_sequence():
+    seq = _random_dna(500, 0)
+    _, _, expected = scan_sequence(seq, build_pwm()[2])
+    assert np.allclose(score_batch([seq], W)[0], expected)
+
+
+@pytest.mark.parametrize("cutoff", [-5.0, 0.0, 3.0, 6.0])
+def test_threshold_scan_matches_filtered_full_scan(cutoff):
+    seqs = [_random_dna(n, seed, 0.02) for seed, n in enumerate([0, 5, 9, 2000, 30000])]
+    for seq, scores, result in zip(seqs, score_batch(seqs, W), scan_threshold(seqs, W, cutoff, chunk=4096)):
+        hits = np.flatnonzero(scores >= cutoff)
+        assert list(result.positions) == list(hits)
+        assert np.allclose(result.scores, scores[hits])
+
+
+def test_score_cutoff_matches_enumeration():
+    # every 9-mer is equally likely under the uniform background
+    kmers = np.array(list(itertools.product(range(4), repeat=W.shape[1])))
+    scores = W[kmers, np.arange(W.shape[1])].sum(axis=1)
+    for pvalue in (1e-4, 1e-3, 0.05):
+        cutoff = score_cutoff(W, pvalue)
+        assert (scores >= cutoff).mean() <= pvalue
+        # the next lower score would already exceed the p-value
+        assert (scores >= scores[scores < cutoff].max() - 1e-9).mean() > pvalue
+    assert score_cutoff(W, 1e-9) == float("inf")
+
+
+def test_scan_batch_pvalue_and_top_k():
+    seq = _random_dna(20000, 3)
+    full = score_batch([seq], W)[0]
+    cutoff = score_cutoff(W, 1e-3)
+    result, = scan_batch([seq], W, pvalue=1e-3)
+    assert sorted(result.positions) == list(np.flatnonzero(full >= cutoff))
+
+    top, = scan_batch([seq], W, top_k=5)
+    assert np.allclose(sorted(top.scores, reverse=True), np.sort(full)[::-1][:5], atol=1e-5)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from bioinfo.motif_scan import motif_matrix
+from bioinfo.packed import PackedSequence
+from bioinfo.pwm import build_pwm, pwm_array, score_batch
+from bioinfo.shared import SharedSequence, parallel_scan
+
+PWM = pwm_array(build_pwm()[2])
+MOTIF = motif_matrix()
+
+
+def _random_dna(n, seed):
+    rng = np.random.default_rng(seed)
+    seq = rng.choice(list("ACGT"), n)
+    seq[rng.random(n) < 0.01] = "N"
+    return "".join(seq)
+
+
+def _serial(seq, W, cutoff=None):
+    scores = score_batch([seq], W)[0]
+    positions = np.arange(len(scores)) if cutoff is None else np.flatnonzero(scores >= cutoff)
+    return positions, scores[positions]
+
+
+def test_parallel_scan_matches_serial():
+    seq = _random_dna(20_011, 0)
+    pwm, motif = parallel_scan(seq, [PWM, MOTIF], workers=2, region=3000)
+    for result, W in [(pwm, PWM), (motif, MOTIF)]:
+        positions, scores = _serial(seq, W)
+        order = np.argsort(result.positions)
+        assert np.array_equal(result.positions[order], positions)
+        assert np.allclose(result.scores[order], scores.astype(np.float32), equal_nan=True)
+
+
+def test_parallel_threshold_scan_matches_serial():
+    packed = PackedSequence.from_string(_random_dna(50_000, 1))
+    cutoffs = [3.0, 2.0]
+    with SharedSequence(packed) as shared:
+        results = parallel_scan(shared, [PWM, MOTIF], cutoffs, workers=2, region=7000)
+    for result, W, cutoff in zip(results, [PWM, MOTIF], cutoffs):
+        positions, scores = _serial(str(packed), W, cutoff)
+        assert len(positions)
+        order = np.argsort(result.positions)
+        assert np.array_equal(result.positions[order], positions)
+        assert np.allclose(result.scores[order], scores, atol=1e-5)
+
+
+def test_sequence_shorter_than_motif():
+    result, = parallel_scan("ACGT", [PWM], workers=1)
+    assert len(result) == 0
@@ -0,0 +1,22 @@
+import pytest
+
+from bioinfo.simulate import simulate, write_fasta
+
+MODEL = {b: {c: 0.25 for c in "ACGT"} for b in "ACGT"}
+
+
+@pytest.mark.parametrize("n_sequences, length", [(1, 0), (1, -5), (-1, 10)])
+def test_invalid_sizes(tmp_path, n_sequences, length):
+    with pytest.raises(ValueError):
+        list(simulate(MODEL, n_sequences, length))
+    path = tmp_path / "out.fa"
+    with pytest.raises(ValueError):
+        write_fasta(str(path), MODEL, n_sequences, length)
+    assert not path.exists()
+
+
+def test_sizes_and_no_sequences():
+    assert list(simulate(MODEL, 0, 10)) == []
+    pieces = list(simulate(MODEL, 3, 1, seed=1))
+    assert [r for r, _ in pieces] == [0, 1, 2]
+    assert all(len(piece) == 1 for _, piece in pieces)
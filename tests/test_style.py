@@ -0,0 +1,48 @@
+import numpy as np
+
+from bioinfo.style import StyleModels, sliding_window
+
+A = "the quick brown fox jumps over the lazy dog " * 20
+B = "pack my box with five dozen liquor jugs " * 20
+
+
+def _models():
+    models = StyleModels()
+    models.add_text("A", A)
+    models.add_text("B", B)
+    return models
+
+
+def test_attribute_matches_sliding_window():
+    models = _models()
+    text = A[:300] + B[:300]
+    x, _, _, scores = models.attribute(text, 50, 10)
+    pos, ref = sliding_window(text, models.beta(), models.alphabet, 50, 10)
+    assert list(x) == pos
+    assert np.allclose(scores[0] - scores[1], ref)
+
+
+def test_unknown_symbols_keep_positions():
+    models = _models()
+    text = A[:200] + "#" * 37 + B[:200]
+    x, _, _, scores = models.attribute(text, 50, 10)
+    assert list(x) == list(range(25, len(text) - 24, 10))
+    # windows before the unknown run score as if it were absent
+    clean, _, _, ref = models.attribute(A[:200], 50, 10)
+    assert np.allclose(scores[:, :len(clean)], ref)
+
+
+def test_cached_log_probabilities_follow_new_text():
+    models = _models()
+    models.attribute(A[:100], 20, 5)
+    models.add_text("A", "zebra xylophone")
+    models.attribute(A[:100], 20, 5)
+    models.add_text("B", B[:50])
+    fresh = StyleModels()
+    fresh.add_text("A", A)
+    fresh.add_text("B", B)
+    fresh.add_text("A", "zebra xylophone")
+    fresh.add_text("B", B[:50])
+    assert models.alphabet == fresh.alphabet
+    assert np.allclose(models.log_prob_tensor(), fresh.log_prob_tensor())
+    assert np.allclose(models.beta(), fresh.beta())